@@ -6,10 +6,35 @@ class APITestConfig:
     """Centralized configuration for API testing"""
     
     # API Configuration
-    BASE_URL = "https://jsonplaceholder.typicode.com"
+    BASE_URL = os.getenv("API_BASE_URL", "https://jsonplaceholder.typicode.com")
     TIMEOUT = 30
     MAX_RETRIES = 3
+
+    # HTTP transport: 'requests' (HTTP/1.1, pooled) or 'http2' (httpx,
+    # multiplexed); pool size is connections per host
+    TRANSPORT = os.getenv('API_TRANSPORT', 'requests')
+    TRANSPORT_POOL_SIZE = int(os.getenv('API_TRANSPORT_POOL_SIZE', '10'))
+    # Requests APITestClient.batch() keeps in flight; beyond the pool size
+    # HTTP/1.1 requests would only queue for a connection
+    BATCH_MAX_CONCURRENCY = TRANSPORT_POOL_SIZE
+    
+    # Coalesce concurrent identical GETs into one network call (off by
+    # default; load generation always sends every request)
+    SINGLE_FLIGHT = os.getenv('API_SINGLE_FLIGHT', '').lower() in ('1', 'true', 'yes')
+    
+    # APITestClient.paginate(): items per page, how pages are requested
+    # ('page' for _page/_limit, 'range' for _start/_end, 'link' to follow
+    # Link headers) and whether the next page is fetched ahead
+    PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', '100'))
+    PAGINATION_STYLE = os.getenv('API_PAGINATION_STYLE', 'page')
+    PAGINATION_PREFETCH = True
     
+    # APITestClient.warm_up(): connections opened up front, extra requests
+    # thrown away before timing starts, and the endpoint used for both
+    WARM_UP_CONNECTIONS = int(os.getenv('WARM_UP_CONNECTIONS', '4'))
+    WARM_UP_DISCARD = int(os.getenv('WARM_UP_DISCARD', '3'))
+    WARM_UP_ENDPOINT = '/posts/1'
+
     # Environment
     ENVIRONMENT = os.getenv('TEST_ENV', 'test')
     
@@ -17,11 +42,125 @@ class APITestConfig:
     REPORTS_DIR = "reports"
     HTML_REPORTS_DIR = os.path.join(REPORTS_DIR, "html")
     JSON_REPORTS_DIR = os.path.join(REPORTS_DIR, "json")
+    RESULTS_STORE_DIR = os.path.join(REPORTS_DIR, "results")
+    
+    # Compressed, deduplicated report archive and its retention policy: runs
+    # beyond the newest ARTIFACT_KEEP_RUNS or older than ARTIFACT_MAX_AGE_DAYS
+    # are compacted into one summary row each, and their loose report files
+    # are deleted when ARTIFACT_PRUNE_ORIGINALS is set (shared assets are kept)
+    ARTIFACTS_DIR = os.path.join(REPORTS_DIR, "artifacts")
+    ARTIFACT_COMPRESSION = os.getenv('ARTIFACT_COMPRESSION', 'auto')  # auto, zstd or gzip
+    ARTIFACT_KEEP_RUNS = int(os.getenv('ARTIFACT_KEEP_RUNS', '20'))
+    ARTIFACT_MAX_AGE_DAYS = float(os.getenv('ARTIFACT_MAX_AGE_DAYS', '30'))
+    ARTIFACT_PRUNE_ORIGINALS = True
+    
+    # Payload budgets: largest response allowed on the wire, and whether
+    # responses must be compressed
+    MAX_RESPONSE_BYTES = int(os.getenv('MAX_RESPONSE_BYTES', str(2 * 1024 * 1024)))
+    REQUIRE_COMPRESSION = os.getenv('REQUIRE_COMPRESSION', '').lower() in ('1', 'true', 'yes')
+    
+    # Request/response capture for failure diagnostics: full payloads of
+    # failed requests, requests above the slow percentile (once enough have
+    # been seen) and the last requests of failing tests are gzipped to disk;
+    # the rest leave a fixed-size sample of headers-only records
+    CAPTURE_REQUESTS = os.getenv('API_CAPTURE', '1').lower() not in ('0', 'false', 'no')
+    CAPTURE_DIR = os.path.join(REPORTS_DIR, "captures")
+    CAPTURE_SLOW_PERCENTILE = 99
+    CAPTURE_MIN_SAMPLES = 50
+    CAPTURE_SAMPLE_SIZE = 200
+    CAPTURE_MAX_BODY_BYTES = 256 * 1024
+    CAPTURE_MAX_SPILLED = 500
+    CAPTURE_PENDING_PER_TEST = 5
+    
+    # Sharded CI runs: partial results per shard, and the per-test duration
+    # history shards are balanced on (tests without history count as the
+    # median, or SHARD_DEFAULT_DURATION seconds when there is none)
+    SHARDS_DIR = os.path.join(REPORTS_DIR, "shards")
+    SHARD_DURATIONS_FILE = os.path.join(SHARDS_DIR, "durations.json")
+    SHARD_DEFAULT_DURATION = 1.0
+    
+    # Flaky test detection: failed tests are rerun FLAKY_RERUNS times, rounds
+    # in parallel, and count as flaky if any rerun passes. The score is an
+    # exponentially weighted share of flaky runs; a test is quarantined (its
+    # failures stop failing the run) at FLAKY_QUARANTINE_SCORE after
+    # FLAKY_MIN_RUNS runs, and released once it falls under FLAKY_RELEASE_SCORE
+    FLAKY_RERUNS = int(os.getenv('FLAKY_RERUNS', '3'))
+    FLAKY_RERUN_WORKERS = int(os.getenv('FLAKY_RERUN_WORKERS', '3'))
+    FLAKY_HISTORY_FILE = os.path.join(RESULTS_STORE_DIR, "flakiness.json")
+    FLAKY_HISTORY_LENGTH = 20
+    FLAKY_SCORE_ALPHA = 0.2
+    FLAKY_QUARANTINE_SCORE = 0.3
+    FLAKY_RELEASE_SCORE = 0.1
+    FLAKY_MIN_RUNS = 3
     
     # Test Configuration
     INCLUDE_PERFORMANCE_TESTS = True
     INCLUDE_NEGATIVE_TESTS = True
     
+    # Load Scenario Configuration
+    PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    SCENARIOS_DIR = os.path.join(PROJECT_ROOT, "tests", "fixtures", "scenarios")
+    
+    # Seeded stand-in dataset: JSONPlaceholder's sizes times DATASET_SCALE,
+    # children per parent drawn log-normally with DATASET_FANOUT_SKEW as sigma.
+    # Tests expect collections of these sizes, so keep the scale at 1 against
+    # the public API
+    DATASET_BASE_COUNTS = {'users': 10, 'posts': 100, 'comments': 500,
+                           'albums': 100, 'photos': 5000, 'todos': 200}
+    DATASET_SCALE = int(os.getenv('DATASET_SCALE', '1'))
+    DATASET_SEED = int(os.getenv('DATASET_SEED', '1'))
+    DATASET_FANOUT_SKEW = float(os.getenv('DATASET_FANOUT_SKEW', '0.75'))
+    DATASET_DIR = os.path.join(REPORTS_DIR, "datasets")
+    
+    # Beautiful report templates; hashed CSS/JS go to <report dir>/assets
+    REPORT_TEMPLATES_DIR = os.path.join(PROJECT_ROOT, "report_templates")
+    REPORT_ASSETS_SUBDIR = "assets"
+    REPORT_SELF_CONTAINED = os.getenv('REPORT_SELF_CONTAINED', '').lower() in ('1', 'true', 'yes')
+    
+    # Saturation (knee) detection for ramped load runs
+    LOAD_KNEE_PERCENTILE = 95
+    LOAD_KNEE_TOLERANCE = 0.05
+    
+    # Adaptive (AIMD) concurrency defaults: grow while the window's p95 stays
+    # under the target, multiply by the backoff when latency or errors cross it
+    ADAPTIVE_TARGET_LATENCY = float(os.getenv('ADAPTIVE_TARGET_LATENCY', '1.0'))
+    ADAPTIVE_PERCENTILE = 95
+    ADAPTIVE_MAX_ERROR_RATE = 0.01
+    ADAPTIVE_MAX_CONCURRENCY = 64
+    ADAPTIVE_WINDOW = 20
+    ADAPTIVE_BACKOFF = 0.7
+    
+    # Distributed load generation. Workers exchange pickles with the coordinator,
+    # so without LOAD_WORKER_AUTHKEY the coordinator makes a random key per run
+    LOAD_WORKER_AUTHKEY = os.getenv('LOAD_WORKER_AUTHKEY', '').encode() or None
+    LOAD_WORKER_FLUSH_INTERVAL = 1.0
+    LOAD_WORKER_CONNECT_TIMEOUT = 60
+    
+    # Columnar per-request result store: rows buffered before each append to disk
+    RESULTS_STORE_FLUSH_ROWS = 10000
+    
+    # Live metrics (terminal dashboard and Prometheus endpoint)
+    LIVE_METRICS_INTERVAL = 1.0
+    LIVE_METRICS_WINDOW = 5.0
+    METRICS_PORT = int(os.getenv('METRICS_PORT', '9464'))
+    
+    # Entry-point startup budget, in ms on top of a bare interpreter start
+    STARTUP_BUDGET_MS = 50
+
+    # Framework overhead benchmarks: results directory, and the relative
+    # increase per metric that `benchmark_framework.py compare` fails on
+    BENCHMARKS_DIR = os.path.join(REPORTS_DIR, "benchmarks")
+    BENCHMARK_REGRESSION_THRESHOLD = float(os.getenv('BENCHMARK_REGRESSION_THRESHOLD', '0.25'))
+    
+    # Opt-in profiling (--profile): phase tables and folded stacks
+    PROFILE_DIR = os.path.join(REPORTS_DIR, "profile")
+    PROFILE_SAMPLE_INTERVAL = 0.005
+    
+    @classmethod
+    def expected_count(cls, resource: str) -> int:
+        """Size of a collection in the configured dataset"""
+        return cls.DATASET_BASE_COUNTS[resource] * cls.DATASET_SCALE
+    
     @classmethod
     def ensure_directories(cls):
         """Create necessary directories"""
@@ -1,5 +1,3 @@
-import subprocess
-import sys
 import os
 from datetime import datetime
 
@@ -15,7 +13,6 @@ def generate_quick_report():
     print("🚀 Generating Quick Test Report...")
     
     cmd = [
-        sys.executable, "-m", "pytest",
         "tests/",
         "-v",
         "--html", report_path,
@@ -24,9 +21,18 @@ def generate_quick_report():
         f"--html-title=Quick API Test Report - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
     ]
     
-    result = subprocess.run(cmd)
+    # Run pytest in-process rather than paying for a second interpreter
+    from tests.utilities.pytest_runner import run_pytest
+    result = run_pytest(cmd)
+    returncode = result.exit_code
+    report_path = result.report_paths.get('html', report_path)
     
-    if result.returncode == 0:
+    print(f"🧪 {result.passed} passed, {result.failed} failed, {result.skipped} skipped "
+          f"in {result.duration:.2f}s")
+    for record in sorted(result.records, key=lambda record: record.duration, reverse=True)[:3]:
+        print(f"   🐢 {record.name}: {record.duration:.3f}s ({record.method or '-'} {record.endpoint or '-'})")
+    
+    if returncode == 0:
         print(f"✅ Quick report generated: {report_path}")
         
         # Try to open in browser
@@ -39,7 +45,7 @@ def generate_quick_report():
     else:
         print(f"❌ Report generation failed")
     
-    return result.returncode
+    return returncode
 
 if __name__ == "__main__":
     generate_quick_report()
\ No newline at end of file
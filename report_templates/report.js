@@ -0,0 +1,65 @@
+function toggleDetails(index) {
+    const details = document.getElementById('details-' + index);
+    const header = details.previousElementSibling;
+
+    if (details.classList.contains('show')) {
+        details.classList.remove('show');
+        header.classList.remove('expanded');
+    } else {
+        details.classList.add('show');
+        header.classList.add('expanded');
+    }
+}
+
+// Auto-expand failed tests on load
+document.addEventListener('DOMContentLoaded', function() {
+    // Add smooth animations
+    setTimeout(() => {
+        document.querySelectorAll('.stat-card').forEach((card, index) => {
+            setTimeout(() => {
+                card.style.opacity = '0';
+                card.style.transform = 'translateY(20px)';
+                card.style.transition = 'all 0.6s ease';
+
+                setTimeout(() => {
+                    card.style.opacity = '1';
+                    card.style.transform = 'translateY(0)';
+                }, 100);
+            }, index * 100);
+        });
+    }, 100);
+
+    // Auto-expand failed tests
+    const failedTests = document.querySelectorAll('.status-failed');
+    failedTests.forEach((statusElement) => {
+        const testItem = statusElement.closest('.test-item');
+        const header = testItem.querySelector('.test-header');
+        const details = testItem.querySelector('.test-details');
+
+        if (details && header) {
+            details.classList.add('show');
+            header.classList.add('expanded');
+        }
+    });
+
+    // Add click animations
+    document.querySelectorAll('.test-header').forEach(header => {
+        header.addEventListener('click', function() {
+            this.style.transform = 'scale(0.99)';
+            setTimeout(() => {
+                this.style.transform = 'scale(1)';
+            }, 100);
+        });
+    });
+});
+
+// Add some interactive effects
+document.querySelectorAll('.stat-card').forEach(card => {
+    card.addEventListener('mouseenter', function() {
+        this.style.transform = 'translateY(-8px) scale(1.02)';
+    });
+
+    card.addEventListener('mouseleave', function() {
+        this.style.transform = 'translateY(0) scale(1)';
+    });
+});
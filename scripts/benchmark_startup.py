@@ -0,0 +1,78 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.test_config import APITestConfig
+
+# Commands that should return almost immediately, without importing
+# requests, pytest or the report generator
+COMMANDS = [
+    ("run_tests.py --help", ["scripts/run_tests.py", "--help"]),
+    ("run_load.py --help", ["scripts/run_load.py", "--help"]),
+    ("generate_beautiful_report.py --help", ["scripts/generate_beautiful_report.py", "--help"]),
+    ("generate_beautiful_report.py list", ["scripts/generate_beautiful_report.py", "list"]),
+]
+
+
+def time_command(args, runs):
+    """Median wall time in ms of running the interpreter with args"""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=project_root,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def slowest_imports(args, limit):
+    """Modules with the highest cumulative import time for a command"""
+    result = subprocess.run([sys.executable, "-X", "importtime"] + args, cwd=project_root,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, module = line[len("import time:"):].split("|")
+        # Only top-level imports: nested ones are already part of their parent's cumulative time
+        if module[1:].startswith(" "):
+            continue
+        imports.append((int(cumulative_us) / 1000, module.strip()))
+    return sorted(imports, reverse=True)[:limit]
+
+
+def main(argv=None):
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Measure entry-point startup time against a budget")
+    parser.add_argument('--runs', type=int, default=10, help="Runs per command (median is reported)")
+    parser.add_argument('--budget-ms', type=float, default=APITestConfig.STARTUP_BUDGET_MS,
+                        help="Allowed startup overhead over a bare interpreter")
+    parser.add_argument('--importtime', action='store_true', help="Show the slowest imports per command")
+    args = parser.parse_args(argv)
+
+    baseline = time_command(["-c", "pass"], args.runs)
+    print(f"🐍 Bare interpreter: {baseline:.1f}ms (median of {args.runs})")
+    print(f"🎯 Budget: +{args.budget_ms:.0f}ms per command\n")
+
+    over_budget = 0
+    for name, command in COMMANDS:
+        overhead = time_command(command, args.runs) - baseline
+        ok = overhead <= args.budget_ms
+        over_budget += not ok
+        print(f"{'✅' if ok else '❌'} {name:<40} +{overhead:6.1f}ms")
+        if args.importtime:
+            for cumulative_ms, module in slowest_imports(command, 5):
+                print(f"      {cumulative_ms:6.1f}ms  {module}")
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
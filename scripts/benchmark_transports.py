@@ -0,0 +1,104 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.test_config import APITestConfig
+
+
+def benchmark(transport_name, endpoints, requests_per_endpoint, concurrency):
+    """Throughput, latency and connections used by one transport against a fresh stand-in server"""
+    from tests.utilities.api_client import APITestClient
+    from tests.utilities.stand_in_server import StandInServer
+    from tests.utilities.transports import create_transport
+
+    with StandInServer() as server:
+        transport = create_transport(transport_name, base_url=server.url, pool_size=concurrency)
+        # A retry would reconnect and hide a dropped connection; every failure must count
+        client = APITestClient(transport=transport, base_url=server.url, retries=1)
+        work = [endpoint for endpoint in endpoints for _ in range(requests_per_endpoint)]
+
+        def timed(endpoint):
+            started = time.perf_counter()
+            try:
+                response = client.get(endpoint)
+                response.content
+                status = response.status_code
+            except transport.errors:
+                status = 0
+            return time.perf_counter() - started, status
+
+        # One untimed request so both transports start with an open connection
+        client.get(endpoints[0])
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(executor.map(timed, work))
+        elapsed = time.perf_counter() - started
+        client.close()
+
+    latencies = sorted(latency for latency, _ in samples)
+    return {
+        'transport': transport_name,
+        'http_version': transport.http_version,
+        'requests': len(samples),
+        'errors': sum(status == 0 or status >= 400 for _, status in samples),
+        'concurrency': concurrency,
+        'elapsed': elapsed,
+        'throughput': len(samples) / elapsed,
+        'p50': statistics.median(latencies),
+        'p95': latencies[max(0, int(len(latencies) * 0.95) - 1)],
+        'connections': server.connections,
+    }
+
+
+def main(argv=None):
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description="Compare HTTP/1.1 pooled and HTTP/2 multiplexed throughput against the local stand-in server")
+    parser.add_argument('--transports', nargs='+', default=['requests', 'http2'],
+                        help="Transports to compare (see tests.utilities.transports)")
+    parser.add_argument('--endpoints', nargs='+', default=['/posts/1', '/users', '/posts/1/comments'])
+    parser.add_argument('--requests', type=int, default=200, help="Requests per endpoint")
+    parser.add_argument('--concurrency', type=int, default=APITestConfig.TRANSPORT_POOL_SIZE)
+    parser.add_argument('--output', help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"🚀 {args.requests * len(args.endpoints)} requests per transport, {args.concurrency} in flight\n")
+    print(f"{'Transport':<10} {'Protocol':<9} {'Req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'Conns':>6} {'Errors':>7}")
+    for name in args.transports:
+        try:
+            result = benchmark(name, args.endpoints, args.requests, args.concurrency)
+        except (RuntimeError, ValueError) as e:
+            print(f"{name:<10} ⚠️  skipped: {e}")
+            continue
+        results.append(result)
+        print(f"{name:<10} {result['http_version']:<9} {result['throughput']:9.1f} "
+              f"{result['p50'] * 1000:8.2f} {result['p95'] * 1000:8.2f} "
+              f"{result['connections']:6d} {result['errors']:7d}")
+
+    # HTTP/2 multiplexes everything over one connection; more means it was dropped and reopened
+    reconnected = [result for result in results
+                   if result['http_version'] == 'HTTP/2' and result['connections'] != 1]
+    for result in reconnected:
+        print(f"❌ {result['transport']} used {result['connections']} connections, expected 1")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📄 Results written to {args.output}")
+
+    return 1 if reconnected or any(result['errors'] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
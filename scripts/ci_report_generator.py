@@ -1,8 +1,17 @@
-import subprocess
+import argparse
 import sys
 import os
 import json
+import importlib.util
+import subprocess
 from datetime import datetime
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.test_config import APITestConfig
 
 def generate_ci_reports():
     """Generate reports suitable for CI/CD pipelines"""
@@ -17,50 +26,46 @@ def generate_ci_reports():
     
     print("🔧 Generating CI/CD Reports...")
     
-    # Generate JUnit XML for CI systems
+    # A single in-process pytest run writes every report format, instead of
+    # one interpreter and one full test run per format
     xml_path = f"reports/xml/junit_results_{timestamp}.xml"
-    cmd_xml = [
-        sys.executable, "-m", "pytest",
-        "tests/",
-        f"--junitxml={xml_path}",
-        "--tb=short"
-    ]
-    
-    print("📊 Generating JUnit XML...")
-    result_xml = subprocess.run(cmd_xml)
-    reports['junit_xml'] = xml_path if result_xml.returncode == 0 else None
-    
-    # Generate HTML report
     html_path = f"reports/html/ci_report_{timestamp}.html"
-    cmd_html = [
-        sys.executable, "-m", "pytest",
+    json_path = f"reports/json/test_results_{timestamp}.json"
+    
+    pytest_args = [
         "tests/",
+        f"--junitxml={xml_path}",
         "--html", html_path,
         "--self-contained-html",
         "--tb=short"
     ]
     
-    print("📊 Generating HTML report...")
-    result_html = subprocess.run(cmd_html)
-    reports['html'] = html_path if result_html.returncode == 0 else None
+    if importlib.util.find_spec("pytest_jsonreport") is not None:
+        pytest_args.extend(["--json-report", f"--json-report-file={json_path}"])
+    else:
+        print("⚠️  JSON report skipped (pytest-json-report not installed)")
     
-    # Generate JSON report (if pytest-json-report is available)
-    json_path = f"reports/json/test_results_{timestamp}.json"
-    cmd_json = [
-        sys.executable, "-m", "pytest",
-        "tests/",
-        "--json-report",
-        f"--json-report-file={json_path}",
-        "--tb=short"
-    ]
+    print("📊 Generating JUnit XML, HTML and JSON reports...")
+    from tests.utilities.flaky import apply_reruns
+    from tests.utilities.pytest_runner import run_pytest
+    result = run_pytest(pytest_args)
+    # Failures are rerun; flaky or quarantined ones no longer fail the run
+    apply_reruns(result)
+    exit_code = result.exit_code
     
-    print("📊 Generating JSON report...")
-    try:
-        result_json = subprocess.run(cmd_json)
-        reports['json'] = json_path if result_json.returncode == 0 else None
-    except:
-        print("⚠️  JSON report skipped (pytest-json-report not installed)")
-        reports['json'] = None
+    reports['junit_xml'] = result.report_paths.get('junit_xml')
+    reports['html'] = result.report_paths.get('html')
+    reports['json'] = result.report_paths.get('json')
+    
+    # Per-test outcomes and request timings straight from the run, no report parsing
+    results_path = f"reports/json/ci_results_{timestamp}.json"
+    with open(results_path, 'w', encoding='utf-8') as f:
+        json.dump(result.to_dict(), f, indent=2)
+    reports['results'] = results_path
+    
+    # Compressed, deduplicated copies; older runs are pruned and compacted
+    from tests.utilities.artifacts import archive_run, run_summary
+    store = archive_run(timestamp, reports, run_summary(result))
     
     # Summary
     print("\n" + "=" * 40)
@@ -72,11 +77,142 @@ def generate_ci_reports():
             print(f"✅ {report_type.upper()}: {path} ({size:,} bytes)")
         else:
             print(f"❌ {report_type.upper()}: Failed to generate")
+    print(f"🗜️  Archived to {store.root} ({len(store.runs())} runs kept, "
+          f"{len(store.summaries())} compacted)")
     
     # Return overall exit code
-    exit_codes = [result_xml.returncode, result_html.returncode]
-    return max(exit_codes)
+    return exit_code
+
+def _parse_shard(value):
+    """'2/4' -> (1, 4): 0-based index and shard count"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected INDEX/COUNT such as 2/4, got '{value}'")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard {index} is outside 1..{count}")
+    return index - 1, count
+
+
+def run_shard(index, count, test_path="tests/", output_dir=None, durations=None):
+    """Run one shard of the suite and write its partial result file"""
+    from tests.utilities.flaky import apply_reruns
+    from tests.utilities.pytest_runner import run_pytest
+    from tests.utilities.sharding import ShardPlugin, load_durations, write_partial
+    
+    output_dir = output_dir or APITestConfig.SHARDS_DIR
+    name = f"shard_{index + 1}_of_{count}"
+    plugin = ShardPlugin(index, count, load_durations(durations))
+    print(f"🧩 Running shard {index + 1}/{count} of {test_path}...")
+    result = run_pytest([test_path, f"--junitxml={os.path.join(output_dir, name + '.xml')}", "--tb=short"],
+                        plugins=[plugin])
+    # Failures are rerun here; flakiness history is updated once, by the merge
+    apply_reruns(result, update_history=False)
+    path = write_partial(result, plugin, os.path.join(output_dir, f"{name}.json"))
+    print(f"📄 Shard {index + 1}/{count}: {len(plugin.selected)} tests, {result.passed} passed, "
+          f"{result.failed} failed, {result.flaky} flaky in {result.duration:.2f}s → {path}")
+    return result.exit_code
+
+
+def run_local_shards(count, test_path="tests/", durations=None):
+    """Run every shard as a local process, then merge their partial results"""
+    output_dir = os.path.join(APITestConfig.SHARDS_DIR, datetime.now().strftime('%Y%m%d_%H%M%S'))
+    print(f"🧩 Running {count} shards as local processes...")
+    processes = []
+    for index in range(count):
+        command = [sys.executable, __file__, "--shard", f"{index + 1}/{count}",
+                   "--test-path", test_path, "--output-dir", output_dir]
+        if durations:
+            command += ["--durations", durations]
+        processes.append(subprocess.Popen(command))
+    for process in processes:
+        process.wait()
+    return merge_reports([output_dir], durations)
+
+
+def merge_reports(partial_paths, durations=None):
+    """Combine shard partials into single JUnit XML, JSON, HTML and beautiful reports"""
+    from beautiful_api_report import BeautifulAPITestReport
+    from tests.utilities.artifacts import archive_run, asset_paths, run_summary
+    from tests.utilities.flaky import blocking, quarantined, record_history
+    from tests.utilities.sharding import (
+        load_partials, merge_junit, merge_results, merged_summary, save_durations
+    )
+    
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    try:
+        partials = load_partials(partial_paths)
+    except ValueError as e:
+        print(f"❌ Cannot merge: {e}")
+        return 2
+    result = merge_results(partials)
+    record_history(result.records)
+    # Shards judged quarantine on the history before this run; judge again on the updated one
+    if result.exit_code == 1 and not blocking(result.records):
+        result.exit_code = 0
+    print(f"🔗 Merging {len(partials)} shards: {len(result.records)} tests, {result.passed} passed, "
+          f"{result.failed} failed, {result.flaky} flaky")
+    
+    reports = {
+        'junit_xml': merge_junit(partials, f"reports/xml/junit_results_{timestamp}.xml", result.duration),
+        'results': f"reports/json/ci_results_{timestamp}.json",
+    }
+    os.makedirs(os.path.dirname(reports['results']), exist_ok=True)
+    with open(reports['results'], 'w', encoding='utf-8') as f:
+        json.dump(merged_summary(partials, result), f, indent=2)
+    
+    # pytest-html output cannot be combined, so the merged HTML report is rendered from the records
+    report = BeautifulAPITestReport.from_run(result)
+    reports['html'] = report.generate_beautiful_html_report(
+        f"reports/html/ci_report_{timestamp}.html", self_contained=True)
+    reports['beautiful'] = report.generate_beautiful_html_report()
+    
+    save_durations(result.records, durations)
+    artifacts = list(reports.items())
+    artifacts += asset_paths(os.path.join(os.path.dirname(reports['beautiful']), 'assets'))
+    store = archive_run(timestamp, artifacts, run_summary(result))
+    
+    shard_time = sum(partial['duration'] for partial in partials)
+    print("\n" + "=" * 40)
+    print("📊 Merged CI Report Summary:")
+    for report_type, path in reports.items():
+        if path and os.path.exists(path):
+            print(f"✅ {report_type.upper()}: {path} ({os.path.getsize(path):,} bytes)")
+        else:
+            print(f"❌ {report_type.upper()}: Failed to generate")
+    print(f"⏱️  Wall clock {result.duration:.2f}s for {shard_time:.2f}s of shard time")
+    for partial in partials:
+        print(f"   shard {partial['shard']['index'] + 1}: {len(partial['shard']['tests'])} tests "
+              f"in {partial['duration']:.2f}s (exit {partial['exit_code']})")
+    for record in quarantined(result.records):
+        print(f"🚧 Quarantined: {record.nodeid} (flakiness {record.flakiness['score']:.2f})")
+    print(f"🗜️  Archived to {store.root}")
+    return result.exit_code
+
+
+def main(argv=None):
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description="Generate CI reports, optionally split across shards and merged afterwards")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--shard', type=_parse_shard, metavar='INDEX/COUNT',
+                      help="Run only this shard (1-based) and write a partial result file")
+    mode.add_argument('--local', type=int, metavar='COUNT',
+                      help="Run COUNT shards as local processes and merge them")
+    mode.add_argument('--merge', nargs='+', metavar='PARTIAL',
+                      help="Merge shard partial results (files or directories)")
+    parser.add_argument('--test-path', default="tests/")
+    parser.add_argument('--output-dir', help="Where --shard writes its partial result (default: reports/shards)")
+    parser.add_argument('--durations', help="Per-test duration history (default: reports/shards/durations.json)")
+    args = parser.parse_args(argv)
+    
+    if args.shard:
+        return run_shard(*args.shard, args.test_path, args.output_dir, args.durations)
+    if args.local:
+        return run_local_shards(args.local, args.test_path, args.durations)
+    if args.merge:
+        return merge_reports(args.merge, args.durations)
+    return generate_ci_reports()
 
 if __name__ == "__main__":
-    exit_code = generate_ci_reports()
-    sys.exit(exit_code)
\ No newline at end of file
+    sys.exit(main())
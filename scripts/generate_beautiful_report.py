@@ -1,20 +1,51 @@
 import sys
 import os
+import importlib.util
 from pathlib import Path
-import subprocess
-import json
 from datetime import datetime
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-# Try to import the existing beautiful report generator
-try:
-    from beautiful_api_report import BeautifulAPITestReport
-    HAS_BEAUTIFUL_GENERATOR = True
-except ImportError:
-    HAS_BEAUTIFUL_GENERATOR = False
+# Only check that the beautiful report generator exists; importing it pulls in
+# requests, so the import is deferred until a beautiful report is requested
+HAS_BEAUTIFUL_GENERATOR = importlib.util.find_spec('beautiful_api_report') is not None
+HAS_JSON_REPORT = importlib.util.find_spec('pytest_jsonreport') is not None
+
+USAGE = """Usage: python {script} [TYPE] [TEST_PATH]
+
+Report types:
+  html          pytest-html report
+  json          JSON report (pytest-json-report)
+  xml           JUnit XML report
+  coverage      coverage report
+  beautiful     beautiful custom report
+  all           every report from a single test run
+  list          list existing reports
+  interactive   interactive menu (default when no TYPE is given)
+
+Options:
+  --profile         time network, decoding, validation and reporting per test
+  --profile-sample  also write sampling-profiler folded stacks (flamegraph)
+"""
+
+
+def run_tests(args):
+    """Run pytest and return its structured results
+    
+    Runs in this process, except coverage runs, which need a fresh
+    interpreter so coverage starts before anything under tests/ is imported.
+    """
+    from tests.utilities.pytest_runner import run_pytest, run_pytest_with_coverage
+    
+    if any(arg.startswith('--cov') for arg in args):
+        result = run_pytest_with_coverage(args)
+    else:
+        result = run_pytest(args)
+    print(f"🧪 {result.passed} passed, {result.failed} failed, {result.skipped} skipped "
+          f"in {result.duration:.2f}s")
+    return result
 
 def ensure_directories():
     """Ensure report directories exist"""
@@ -43,7 +74,6 @@ def generate_pytest_html_report(test_path="tests/", report_name=None):
     print(f"📄 Report: {report_path}")
     
     cmd = [
-        sys.executable, "-m", "pytest",
         test_path,
         "-v",
         "--html", report_path,
@@ -52,14 +82,15 @@ def generate_pytest_html_report(test_path="tests/", report_name=None):
         f"--html-title=API Test Report - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
     ]
     
-    result = subprocess.run(cmd)
+    result = run_tests(cmd)
+    returncode = result.exit_code
     
-    if result.returncode == 0:
+    if returncode == 0:
         print(f"✅ HTML report generated: {report_path}")
     else:
-        print(f"❌ Report generation failed (exit code: {result.returncode})")
+        print(f"❌ Report generation failed (exit code: {returncode})")
     
-    return result.returncode, report_path
+    return returncode, report_path
 
 def generate_json_report(test_path="tests/", report_name=None):
     """Generate JSON report for programmatic access"""
@@ -73,7 +104,6 @@ def generate_json_report(test_path="tests/", report_name=None):
     print(f"📊 Generating JSON report...")
     
     cmd = [
-        sys.executable, "-m", "pytest",
         test_path,
         "-v",
         "--json-report",
@@ -81,14 +111,15 @@ def generate_json_report(test_path="tests/", report_name=None):
         "--tb=short"
     ]
     
-    result = subprocess.run(cmd)
+    result = run_tests(cmd)
+    returncode = result.exit_code
     
-    if result.returncode == 0:
+    if returncode == 0:
         print(f"✅ JSON report generated: {report_path}")
     else:
         print(f"❌ JSON report generation failed")
     
-    return result.returncode, report_path
+    return returncode, report_path
 
 def generate_junit_xml_report(test_path="tests/", report_name=None):
     """Generate JUnit XML report for CI/CD integration"""
@@ -102,21 +133,21 @@ def generate_junit_xml_report(test_path="tests/", report_name=None):
     print(f"📊 Generating JUnit XML report...")
     
     cmd = [
-        sys.executable, "-m", "pytest",
         test_path,
         "-v",
         f"--junitxml={report_path}",
         "--tb=short"
     ]
     
-    result = subprocess.run(cmd)
+    result = run_tests(cmd)
+    returncode = result.exit_code
     
-    if result.returncode == 0:
+    if returncode == 0:
         print(f"✅ JUnit XML report generated: {report_path}")
     else:
         print(f"❌ JUnit XML report generation failed")
     
-    return result.returncode, report_path
+    return returncode, report_path
 
 def generate_coverage_report(test_path="tests/"):
     """Generate coverage report"""
@@ -124,7 +155,6 @@ def generate_coverage_report(test_path="tests/"):
     print(f"📊 Generating coverage report...")
     
     cmd = [
-        sys.executable, "-m", "pytest",
         test_path,
         "-v",
         "--cov=tests",
@@ -134,14 +164,15 @@ def generate_coverage_report(test_path="tests/"):
         "--tb=short"
     ]
     
-    result = subprocess.run(cmd)
+    result = run_tests(cmd)
+    returncode = result.exit_code
     
-    if result.returncode == 0:
+    if returncode == 0:
         print(f"✅ Coverage report generated: reports/coverage/index.html")
     else:
         print(f"❌ Coverage report generation failed")
     
-    return result.returncode, "reports/coverage/index.html"
+    return returncode, "reports/coverage/index.html"
 
 def generate_beautiful_custom_report():
     """Generate beautiful custom report using existing generator"""
@@ -154,12 +185,11 @@ def generate_beautiful_custom_report():
     print(f"🎨 Generating beautiful custom report...")
     
     try:
+        from beautiful_api_report import BeautifulAPITestReport
         generator = BeautifulAPITestReport()
-        generator.run_all_tests()
+        report_path = generator.run_all_tests()
         
-        # The report should be in html/awesome_api_report.html
-        report_path = "html/awesome_api_report.html"
-        if os.path.exists(report_path):
+        if report_path and os.path.exists(report_path):
             print(f"✅ Beautiful custom report generated: {report_path}")
             return 0, report_path
         else:
@@ -179,25 +209,53 @@ def generate_comprehensive_report_suite(test_path="tests/"):
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     reports = {}
     
-    # Generate HTML report
-    exit_code, html_report = generate_pytest_html_report(test_path, f"comprehensive_html_{timestamp}.html")
-    reports['html'] = html_report if exit_code == 0 else None
+    # One test run feeds the HTML, JSON, JUnit XML and coverage reports
+    html_report = f"reports/html/comprehensive_html_{timestamp}.html"
+    json_report = f"reports/json/comprehensive_json_{timestamp}.json"
+    xml_report = f"reports/xml/comprehensive_junit_{timestamp}.xml"
+    coverage_report = "reports/coverage/index.html"
+    
+    cmd = [
+        test_path,
+        "-v",
+        "--html", html_report,
+        "--self-contained-html",
+        f"--junitxml={xml_report}",
+        "--cov=tests",
+        "--cov-report=html:reports/coverage",
+        "--cov-report=xml:reports/coverage/coverage.xml",
+        "--tb=short"
+    ]
+    if HAS_JSON_REPORT:
+        cmd.extend(["--json-report", f"--json-report-file={json_report}"])
+    else:
+        print("⚠️  JSON report skipped (pytest-json-report not installed)")
+    
+    print(f"📊 Running tests once for HTML, JSON, JUnit XML and coverage reports...")
+    result = run_tests(cmd)
     
-    # Generate JSON report  
-    exit_code, json_report = generate_json_report(test_path, f"comprehensive_json_{timestamp}.json")
-    reports['json'] = json_report if exit_code == 0 else None
+    # Flaky and quarantined tests are marked in the beautiful report
+    from tests.utilities.flaky import apply_reruns
+    apply_reruns(result)
     
-    # Generate JUnit XML
-    exit_code, xml_report = generate_junit_xml_report(test_path, f"comprehensive_junit_{timestamp}.xml")
-    reports['xml'] = xml_report if exit_code == 0 else None
+    reports['html'] = result.report_paths.get('html')
+    reports['json'] = result.report_paths.get('json')
+    reports['xml'] = result.report_paths.get('junit_xml')
+    reports['coverage'] = coverage_report if os.path.exists(coverage_report) else None
     
-    # Generate coverage report
-    exit_code, coverage_report = generate_coverage_report(test_path)
-    reports['coverage'] = coverage_report if exit_code == 0 else None
+    # Render the beautiful report from the same run instead of testing the API again
+    if HAS_BEAUTIFUL_GENERATOR:
+        from beautiful_api_report import BeautifulAPITestReport
+        reports['beautiful'] = BeautifulAPITestReport.from_run(result).generate_beautiful_html_report()
+    else:
+        reports['beautiful'] = None
     
-    # Generate beautiful custom report
-    exit_code, beautiful_report = generate_beautiful_custom_report()
-    reports['beautiful'] = beautiful_report if exit_code == 0 else None
+    # Archive compressed copies of this run; older runs are pruned and compacted
+    from tests.utilities.artifacts import archive_run, asset_paths, run_summary
+    artifacts = [(kind, path) for kind, path in reports.items() if kind != 'coverage']
+    if reports['beautiful']:
+        artifacts += asset_paths(os.path.join(os.path.dirname(reports['beautiful']), 'assets'))
+    archive_run(timestamp, artifacts, run_summary(result))
     
     # Summary
     print("\n" + "=" * 50)
@@ -297,36 +355,49 @@ def interactive_report_generator():
             print("❌ Invalid choice. Please try again.")
 
 def list_existing_reports():
-    """List all existing reports"""
+    """List archived report runs from the artifact manifest"""
+    from tests.utilities.artifacts import ArtifactStore
     
     print("\n📋 Existing Reports:")
     
-    report_dirs = [
-        ("HTML Reports", "reports/html"),
-        ("JSON Reports", "reports/json"),
-        ("XML Reports", "reports/xml"),
-        ("Coverage Reports", "reports/coverage"),
-        ("Beautiful Reports", "html")
-    ]
-    
-    for category, directory in report_dirs:
-        print(f"\n🔹 {category}:")
-        if os.path.exists(directory):
-            files = [f for f in os.listdir(directory) if f.endswith(('.html', '.json', '.xml'))]
-            if files:
-                for file in sorted(files, reverse=True)[:5]:  # Show last 5
-                    file_path = os.path.join(directory, file)
-                    size = os.path.getsize(file_path)
-                    mtime = datetime.fromtimestamp(os.path.getmtime(file_path))
-                    print(f"   📄 {file} ({size:,} bytes, {mtime.strftime('%Y-%m-%d %H:%M')})")
-            else:
-                print("   (no reports found)")
-        else:
-            print("   (directory not found)")
+    store = ArtifactStore()
+    runs = store.runs()
+    if not runs:
+        print("   (no archived runs found)")
+    for run_id in reversed(list(runs)[-5:]):  # Show last 5
+        entries = runs[run_id]
+        created = datetime.fromtimestamp(min(entry.created for entry in entries))
+        print(f"\n🔹 Run {run_id} ({created.strftime('%Y-%m-%d %H:%M')}):")
+        for entry in entries:
+            if entry.kind in ('summary', 'asset'):
+                continue
+            print(f"   📄 {entry.kind}: {entry.name} ({entry.size:,} bytes, "
+                  f"{entry.stored_size:,} stored)")
+    
+    summaries = store.summaries()
+    if summaries:
+        print(f"\n🗜️  {len(summaries)} older run(s) compacted into summaries")
+        for row in summaries[-3:]:
+            print(f"   {row['run_id']}: {row.get('passed', '?')} passed, {row.get('failed', '?')} failed")
+    print(f"\n💡 Archive: {store.root} (extract with ArtifactStore().extract(entry, path))")
 
 def main():
     """Main function"""
     
+    if len(sys.argv) > 1 and sys.argv[1] in ('-h', '--help', 'help'):
+        print(USAGE.format(script=sys.argv[0]))
+        return
+    
+    profile_sample = '--profile-sample' in sys.argv
+    profile = profile_sample or '--profile' in sys.argv
+    if profile:
+        sys.argv = [arg for arg in sys.argv if arg not in ('--profile', '--profile-sample')]
+        from tests.utilities.profiling import ProfilingSession
+        
+        report_type = sys.argv[1].lower() if len(sys.argv) > 1 else 'interactive'
+        with ProfilingSession(f"{report_type}_report", sample=profile_sample):
+            return main()
+    
     print("🎨 API Test Report Generator")
     print("=" * 40)
     
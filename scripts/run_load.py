@@ -0,0 +1,243 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.utilities.scenario import RampProfile, read_scenario, compile_scenario
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Run a load scenario with a ramp profile")
+    parser.add_argument('scenario', nargs='?',
+                        help="Scenario file (absolute, relative, or name in tests/fixtures/scenarios)")
+    parser.add_argument('--profile', choices=RampProfile.PROFILES, help="Override the scenario ramp profile")
+    parser.add_argument('--start', type=int, help="Starting concurrency")
+    parser.add_argument('--step', type=int, help="Concurrency added per step (step profile)")
+    parser.add_argument('--end', type=int, help="Final concurrency (linear profile)")
+    parser.add_argument('--stages', type=int, help="Number of stages")
+    parser.add_argument('--stage-duration', type=float, help="Seconds per stage (step profile)")
+    parser.add_argument('--duration', type=float, help="Total ramp duration in seconds (linear profile)")
+    parser.add_argument('--rate', type=float, help="Fixed request rate per second (first stage)")
+    parser.add_argument('--rate-step', type=float, help="Request rate added per step (step profile)")
+    parser.add_argument('--end-rate', type=float, help="Final request rate (linear profile)")
+    parser.add_argument('--max', type=int, help="Highest concurrency the adaptive profile may reach")
+    parser.add_argument('--target-latency', type=float,
+                        help="Adaptive profile latency target in seconds (p95 by default)")
+    parser.add_argument('--max-error-rate', type=float,
+                        help="Error rate above which the adaptive profile backs off")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="Spawn N local worker processes and merge their results")
+    parser.add_argument('--remote-workers', type=int, default=0,
+                        help="Also wait for N workers started on other hosts with --worker")
+    parser.add_argument('--listen', default='127.0.0.1:0',
+                        help="Coordinator HOST:PORT that workers connect to")
+    parser.add_argument('--worker', metavar='HOST:PORT',
+                        help="Run as a worker for the coordinator at HOST:PORT")
+    parser.add_argument('--live', action='store_true',
+                        help="Show a live RPS/latency/error dashboard (in-process runs)")
+    parser.add_argument('--metrics-port', type=int,
+                        help="Expose Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument('--abort-error-rate', type=float,
+                        help="Stop early when the live error rate exceeds this fraction")
+    parser.add_argument('--abort-p95', type=float,
+                        help="Stop early when live p95 latency exceeds this many seconds")
+    parser.add_argument('--store', metavar='DIR',
+                        help="Directory for the per-request columnar result store "
+                             "(default: reports/results/<scenario>_<timestamp>)")
+    parser.add_argument('--no-store', action='store_true',
+                        help="Do not keep per-request results on disk")
+    parser.add_argument('--warm-up', action='store_true',
+                        help="Resolve the host and open pooled connections before timing (in-process runs)")
+    args = parser.parse_args(argv)
+    if not args.worker and not args.scenario:
+        parser.error("a scenario is required unless running with --worker")
+    return args
+
+
+def build_ramp(scenario, args):
+    """Merge command line ramp overrides into the scenario ramp"""
+    ramp = dict(scenario.get('ramp') or {})
+    overrides = {
+        'profile': args.profile,
+        'start': args.start,
+        'step': args.step,
+        'end': args.end,
+        'stages': args.stages,
+        'stage_duration': args.stage_duration,
+        'duration': args.duration,
+        'rate': args.rate,
+        'rate_step': args.rate_step,
+        'end_rate': args.end_rate,
+        'max': args.max,
+        'target_latency': args.target_latency,
+        'max_error_rate': args.max_error_rate,
+    }
+    ramp.update({key: value for key, value in overrides.items() if value is not None})
+    return ramp
+
+
+def print_stage(stage):
+    """Print a one-line stage summary"""
+    percentiles = stage.histogram.percentiles()
+    line = (f"📈 Stage {stage.index + 1}: {stage.concurrency} users, "
+            f"{stage.throughput:.1f} req/s, p50 {percentiles['p50'] * 1000:.1f}ms, "
+            f"p95 {percentiles['p95'] * 1000:.1f}ms, errors {stage.error_rate * 100:.1f}%")
+    if stage.corrected is not None:
+        line += (f", target {stage.rate:.1f} req/s, "
+                 f"corrected p99 {stage.corrected.percentile(99) * 1000:.1f}ms")
+    print(line)
+
+
+def print_live(live):
+    """Print the coordinator's merged live view on one line"""
+    print(f"\r📡 Stage {live.stage + 1}: {live.requests} requests, {live.throughput:.1f} req/s, "
+          f"p95 {live.histogram.percentile(95) * 1000:.1f}ms, errors {live.error_rate * 100:.1f}%",
+          end='', flush=True)
+
+
+def store_path(plan, args):
+    """Where per-request results go, or None when the store is disabled"""
+    if args.no_store:
+        return None
+    if args.store:
+        return os.path.abspath(args.store)
+    from datetime import datetime
+    from config.test_config import APITestConfig
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return os.path.abspath(os.path.join(APITestConfig.RESULTS_STORE_DIR, f"{plan.name}_{timestamp}"))
+
+
+def run_distributed(scenario, args, store=None):
+    """Run a scenario across worker processes"""
+    from tests.utilities.distributed import Coordinator, parse_address
+
+    coordinator = Coordinator(
+        scenario,
+        local_workers=args.workers,
+        remote_workers=args.remote_workers,
+        address=parse_address(args.listen),
+        on_update=print_live,
+        store_path=store,
+    )
+    if args.remote_workers:
+        from config.test_config import APITestConfig
+
+        if not APITestConfig.LOAD_WORKER_AUTHKEY:
+            print(f"🔑 Worker key for this run: {coordinator.authkey.decode()}")
+            print("   Start each remote worker with LOAD_WORKER_AUTHKEY set to it")
+        print(f"⏳ Waiting for {args.remote_workers} remote worker(s) on {args.listen}")
+    result = coordinator.run()
+    print()
+    for error in coordinator.errors:
+        print(f"❌ {error}")
+    for stage in result.stages:
+        print_stage(stage)
+    return result
+
+
+def run_local(plan, args, store=None):
+    """Run a plan in this process, optionally with live metrics"""
+    if not store:
+        return run_local_plan(plan, args)
+
+    from config.test_config import APITestConfig
+    from tests.utilities.result_store import ColumnarResultWriter
+
+    with ColumnarResultWriter(store, APITestConfig.RESULTS_STORE_FLUSH_ROWS) as writer:
+        return run_local_plan(plan, args, writer.append_sample)
+
+
+def run_local_plan(plan, args, on_sample=None):
+    """Run the ramp, wrapped in a live metrics session when asked for"""
+    import threading
+    from tests.utilities.api_client import APITestClient
+    from tests.utilities.load_runner import run_ramp
+
+    client = APITestClient()
+    if args.warm_up:
+        cold = client.warm_up(connections=plan.ramp.max_concurrency)
+        print(f"🔥 Warm-up: DNS {cold.dns * 1000:.1f}ms, first request {cold.cold_latency * 1000:.1f}ms, "
+              f"steady {cold.warm_latency * 1000:.1f}ms, {cold.connections} connections primed")
+
+    if not (args.live or args.metrics_port is not None
+            or args.abort_error_rate is not None or args.abort_p95 is not None):
+        return run_ramp(client, plan, on_stage=print_stage, on_sample=on_sample)
+
+    from tests.utilities.live_metrics import LiveMetricsSession
+
+    stop_event = threading.Event()
+    with LiveMetricsSession(dashboard=args.live, port=args.metrics_port, stop_event=stop_event,
+                            abort_error_rate=args.abort_error_rate,
+                            abort_p95=args.abort_p95) as session:
+        result = run_ramp(client, plan, stop_event=stop_event,
+                          on_stage=None if args.live else print_stage, on_sample=on_sample)
+    if session.abort_reason:
+        print(f"🛑 Run aborted early: {session.abort_reason}")
+    if args.live:
+        for stage in result.stages:
+            print_stage(stage)
+    return result
+
+
+def main(argv=None):
+    """Main function"""
+    args = parse_args(argv)
+
+    if args.worker:
+        from config.test_config import APITestConfig
+        from tests.utilities.distributed import run_worker, parse_address
+        if not APITestConfig.LOAD_WORKER_AUTHKEY:
+            print("❌ Set LOAD_WORKER_AUTHKEY to the worker key the coordinator printed")
+            return 2
+        print(f"👷 Worker connecting to coordinator at {args.worker}")
+        run_worker(parse_address(args.worker))
+        return 0
+
+    from tests.utilities.load_report import write_load_reports
+
+    scenario = read_scenario(args.scenario)
+    scenario['ramp'] = build_ramp(scenario, args)
+    plan = compile_scenario(scenario)
+
+    print(f"🚀 Running scenario '{plan.name}' ({len(plan)} planned requests, "
+          f"{plan.ramp.profile} profile, {len(plan.ramp.stages)} stages)")
+
+    workers = args.workers + args.remote_workers
+    if workers > plan.max_shards:
+        print(f"❌ This plan can be split over at most {plan.max_shards} workers, not {workers}")
+        return 2
+
+    store = store_path(plan, args)
+    if workers:
+        result = run_distributed(scenario, args, store)
+    else:
+        result = run_local(plan, args, store)
+    json_path, html_path = write_load_reports(result)
+
+    if result.saturation:
+        knee = result.saturation
+        print(f"🎯 Saturation point: {knee['concurrency']} users at {knee['throughput']:.1f} req/s")
+    else:
+        print("🎯 No saturation point detected")
+    if result.adaptive:
+        settled = result.adaptive
+        label = f"p{settled['percentile']:g}"
+        print(f"🎚️  Adaptive concurrency settled at {settled['concurrency']} in flight, "
+              f"{settled['throughput']:.1f} req/s ({label} {settled[label] * 1000:.1f}ms, "
+              f"errors {settled['error_rate'] * 100:.1f}%)")
+    print(f"📄 JSON report: {json_path}")
+    print(f"📄 HTML report: {html_path}")
+    if store:
+        print(f"🗄️  Per-request results: {store}")
+
+    return 1 if result.total_errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
-import pytest
+import argparse
 import sys
 import os
+import threading
 from datetime import datetime
 from pathlib import Path
 
@@ -17,8 +18,46 @@ except ImportError:
     REPORTS_DIR = "reports/html"
 
 
-def run_test_suite(test_type='all'):
+class LiveAbortPlugin:
+    """Stop the pytest session once the live dashboard decides to abort"""
+    
+    def __init__(self, stop_event):
+        self.stop_event = stop_event
+    
+    def pytest_runtest_teardown(self, item):
+        if self.stop_event.is_set():
+            item.session.shouldstop = "live metrics abort threshold crossed"
+
+
+def rerun_failures(result, reruns=None):
+    """Rerun the run's failures to separate flaky tests from real failures, and print the outcome"""
+    from tests.utilities.flaky import apply_reruns, blocking, quarantined
+    
+    reruns = APITestConfig.FLAKY_RERUNS if reruns is None else reruns
+    if reruns and result.failed:
+        print(f"🔁 Rerunning {result.failed} failed tests {reruns} times...")
+    rerun = apply_reruns(result, reruns)
+    for record in rerun:
+        flakiness = record.flakiness
+        print(f"   {record.status:<7} {record.nodeid} ({flakiness['rerun_passes']}/{flakiness['reruns']} "
+              f"reruns passed, flakiness {flakiness['score']:.2f})")
+    for record in quarantined(result.records):
+        print(f"🚧 Quarantined: {record.nodeid} (flakiness {record.flakiness['score']:.2f}, "
+              f"recent {record.flakiness['recent']})")
+    if rerun and not blocking(result.records):
+        print("✅ Every failure was flaky or quarantined")
+
+
+def run_test_suite(test_type='all', live=False, metrics_port=None,
+                   abort_error_rate=None, abort_p95=None, profile=False, profile_sample=False,
+                   reruns=None):
     """Run organized test suite"""
+    if profile or profile_sample:
+        from tests.utilities.profiling import ProfilingSession
+        
+        with ProfilingSession(f"{test_type}_tests", sample=profile_sample):
+            return run_test_suite(test_type, live, metrics_port, abort_error_rate, abort_p95,
+                                  reruns=reruns)
     
     # Ensure directories exist
     APITestConfig.ensure_directories()
@@ -55,8 +94,24 @@ def run_test_suite(test_type='all'):
     print(f"🚀 Running {test_type} tests...")
     print(f"📊 Report will be saved to: {html_report_path}")
     
+    # Imported here so argument validation and --help stay fast
+    from tests.utilities.pytest_runner import run_pytest
+    
     # Run pytest
-    exit_code = pytest.main(pytest_args)
+    if live or metrics_port is not None or abort_error_rate is not None or abort_p95 is not None:
+        from tests.utilities.live_metrics import LiveMetricsSession
+        
+        stop_event = threading.Event()
+        with LiveMetricsSession(dashboard=live, port=metrics_port, stop_event=stop_event,
+                                abort_error_rate=abort_error_rate, abort_p95=abort_p95):
+            result = run_pytest(pytest_args, plugins=[LiveAbortPlugin(stop_event)])
+    else:
+        result = run_pytest(pytest_args)
+    
+    print(f"🧪 {result.passed} passed, {result.failed} failed, {result.skipped} skipped "
+          f"in {result.duration:.2f}s")
+    rerun_failures(result, reruns)
+    exit_code = result.exit_code
     
     if exit_code == 0:
         print("✅ All tests passed!")
@@ -67,14 +122,28 @@ def run_test_suite(test_type='all'):
     return exit_code
 
 if __name__ == "__main__":
-    test_type = sys.argv[1] if len(sys.argv) > 1 else 'all'
-    
     valid_types = ['all', 'smoke', 'performance', 'posts', 'users', 'comments']
     
-    if test_type not in valid_types:
-        print(f"❌ Invalid test type: {test_type}")
-        print(f"✅ Valid types: {', '.join(valid_types)}")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Run organized API test suites")
+    parser.add_argument('test_type', nargs='?', default='all', choices=valid_types)
+    parser.add_argument('--live', action='store_true',
+                        help="Show a live RPS/latency/error dashboard while tests run")
+    parser.add_argument('--metrics-port', type=int,
+                        help="Expose Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument('--abort-error-rate', type=float,
+                        help="Stop the run when the live error rate exceeds this fraction")
+    parser.add_argument('--abort-p95', type=float,
+                        help="Stop the run when live p95 latency exceeds this many seconds")
+    parser.add_argument('--profile', action='store_true',
+                        help="Time network, decoding, validation and reporting per test into reports/profile")
+    parser.add_argument('--profile-sample', action='store_true',
+                        help="Also run a sampling profiler and write flamegraph folded stacks (implies --profile)")
+    parser.add_argument('--reruns', type=int,
+                        help="Rerun failed tests this many times to tell flaky tests from real failures "
+                             f"(default {APITestConfig.FLAKY_RERUNS}, 0 to disable)")
+    args = parser.parse_args()
     
-    exit_code = run_test_suite(test_type)
+    exit_code = run_test_suite(args.test_type, args.live, args.metrics_port,
+                               args.abort_error_rate, args.abort_p95,
+                               args.profile, args.profile_sample, args.reruns)
     sys.exit(exit_code)
\ No newline at end of file
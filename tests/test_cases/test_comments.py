@@ -1,3 +1,4 @@
+from config.test_config import APITestConfig
 from tests.utilities.api_client import APITestClient
 from tests.utilities.validators import ResponseValidator
 
@@ -10,15 +11,23 @@ class TestComments:
         self.validator = ResponseValidator()
     
     def test_get_all_comments(self):
-        """Test GET /comments - Retrieve all comments"""
-        response = self.client.get('/comments')
+        """Test GET /comments - Retrieve all comments, page by page"""
+        comments = self.client.paginate('/comments')
         
-        self.validator.validate_status_code(response, 200)
-        comments = response.json()
-        self.validator.validate_list_response(comments, 500)
+        self.validator.validate_list_response(comments, APITestConfig.expected_count('comments'),
+                                              item_validator=self.validator.validate_comment_structure)
+        assert comments.pages > 1
+    
+    def test_comment_pagination_styles_agree(self):
+        """Test _page/_limit, _start/_end and Link-header pagination return the same comments"""
+        ids = {
+            style: [comment['id'] for comment in self.client.paginate('/posts/1/comments', page_size=2, style=style)]
+            for style in ('page', 'range', 'link')
+        }
         
-        # Validate first comment structure
-        self.validator.validate_comment_structure(comments[0])
+        assert len(ids['page']) > 0
+        assert ids['page'] == ids['range'] == ids['link']
+        assert ids['page'] == sorted(set(ids['page']))
     
     def test_get_post_comments(self):
         """Test GET /posts/{id}/comments - Get comments for post"""
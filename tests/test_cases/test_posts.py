@@ -1,4 +1,5 @@
 import pytest
+from config.test_config import APITestConfig
 from tests.utilities.api_client import APITestClient
 from tests.utilities.validators import ResponseValidator
 
@@ -16,7 +17,7 @@ class TestPosts:
         
         self.validator.validate_status_code(response, 200)
         posts = response.json()
-        self.validator.validate_list_response(posts, 100)
+        self.validator.validate_list_response(posts, APITestConfig.expected_count('posts'))
         
         # Validate first post structure
         self.validator.validate_post_structure(posts[0])
@@ -40,6 +41,17 @@ class TestPosts:
         post = response.json()
         assert post['id'] == post_id
     
+    def test_get_posts_batch(self):
+        """Test fetching several posts concurrently with APITestClient.batch"""
+        post_ids = [1, 2, 3, 4, 5]
+        results = self.client.batch([f'/posts/{post_id}' for post_id in post_ids])
+        
+        for post_id, result in zip(post_ids, results):
+            assert result.ok, f"GET /posts/{post_id} failed: {result.error}"
+            self.validator.validate_status_code(result.response, 200)
+            post = result.response.json()
+            assert post['id'] == post_id
+    
     def test_create_post(self):
         """Test POST /posts - Create new post"""
         new_post = {
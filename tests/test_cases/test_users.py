@@ -1,3 +1,4 @@
+from config.test_config import APITestConfig
 from tests.utilities.api_client import APITestClient
 from tests.utilities.validators import ResponseValidator
 
@@ -15,7 +16,7 @@ class TestUsers:
         
         self.validator.validate_status_code(response, 200)
         users = response.json()
-        self.validator.validate_list_response(users, 10)
+        self.validator.validate_list_response(users, APITestConfig.expected_count('users'))
         
         # Validate first user structure
         self.validator.validate_user_structure(users[0])
@@ -1,7 +1,36 @@
+import threading
 import time
 
 from tests.utilities.api_client import APITestClient
+from tests.utilities.transports import create_transport
 from tests.utilities.validators import ResponseValidator
+from tests.utilities.scenario import load_scenario
+from tests.utilities.load_runner import run_plan, run_ramp, run_stage
+
+
+class HeldTransport:
+    """Real transport that holds the first request open until ``hold_until()`` is true"""
+    
+    def __init__(self, hold_until, timeout=5.0):
+        self.transport = create_transport()
+        self.hold_until = hold_until
+        self.timeout = timeout
+        self.calls = 0
+        self._lock = threading.Lock()
+    
+    def __getattr__(self, name):
+        return getattr(self.transport, name)
+    
+    def request(self, method, url, timeout=None, **kwargs):
+        with self._lock:
+            self.calls += 1
+            first = self.calls == 1
+        if first:
+            deadline = time.monotonic() + self.timeout
+            while not self.hold_until() and time.monotonic() < deadline:
+                time.sleep(0.005)
+        return self.transport.request(method, url, timeout=timeout, **kwargs)
+
 
 class PerformanceTestSuite:
     """Performance tests for API endpoints"""
@@ -13,9 +42,11 @@ class PerformanceTestSuite:
     
     def test_response_time_get_posts(self):
         """Test response time for GET /posts"""
-        start_time = time.time()
+        # Time the steady state; DNS, connect and TLS are reported as cold start
+        self.client.warm_up()
+        start_time = time.perf_counter()
         response = self.client.get('/posts')
-        end_time = time.time()
+        end_time = time.perf_counter()
         
         response_time = end_time - start_time
         self.validator.validate_status_code(response, 200)
@@ -23,14 +54,67 @@ class PerformanceTestSuite:
     
     def test_concurrent_requests(self):
         """Test handling of concurrent requests"""
-        import concurrent.futures
+        plan = load_scenario('concurrent_posts.json')
+        samples = run_plan(self.client, plan)
+        
+        for sample in samples:
+            assert sample.ok, \
+                f"{sample.method} {sample.endpoint} returned {sample.status} ({sample.error})"
+    
+    def test_single_flight_coalesces_identical_gets(self):
+        """Test concurrent identical GETs share calls, and load runs bypass coalescing"""
+        transport = HeldTransport(lambda: client.single_flight.coalesced >= 7)
+        client = APITestClient(transport=transport, single_flight=True)
+        results = client.batch(['/posts/1'] * 8, max_concurrency=8)
+        
+        for result in results:
+            assert result.ok, f"GET /posts/1 failed: {result.error}"
+            self.validator.validate_post_structure(result.response.json())
+        stats = client.single_flight.stats()
+        assert (stats['calls'], stats['coalesced']) == (1, 7)
+        assert transport.calls == 1
+        
+        plan = load_scenario('concurrent_posts.json')
+        stage = run_stage(client, plan, plan.ramp.stages[0])
+        assert stage.requests == len(plan)
+        samples = run_plan(client, plan)
+        assert len(samples) == len(plan)
+        assert transport.calls == 1 + 2 * len(plan), "Load runs must send every request"
+        assert client.single_flight.stats() == stats
+    
+    def test_step_ramp_records_stage_metrics(self):
+        """Test a step ramp records throughput and latency per stage"""
+        plan = load_scenario('step_ramp_posts.json')
+        result = run_ramp(self.client, plan)
         
-        def make_request():
-            return self.client.get('/posts/1')
+        assert [stage.concurrency for stage in result.stages] == [1, 3, 5]
+        assert result.total_requests == len(plan)
+        assert result.total_errors == 0, f"{result.total_errors} requests failed during the ramp"
+        for stage in result.stages:
+            assert stage.throughput > 0
+            assert stage.histogram.percentile(95) >= stage.histogram.percentile(50)
+    
+    def test_fixed_rate_corrected_latency(self):
+        """Test p99 latency measured from intended send times under a fixed rate"""
+        plan = load_scenario('fixed_rate_posts.json')
+        stage = run_stage(self.client, plan, plan.ramp.stages[0])
+        
+        assert stage.errors == 0, f"{stage.errors} requests failed at {stage.rate} req/s"
+        assert stage.corrected.count == stage.histogram.count == len(plan)
+        # Corrected latency includes any schedule slip, so it can never be lower
+        assert stage.corrected.percentile(99) >= stage.histogram.percentile(50)
+        p99 = stage.corrected.percentile(99)
+        assert p99 < 2.0, f"Corrected p99 {p99:.3f}s exceeds 2s threshold"
+    
+    def test_adaptive_concurrency_settles(self):
+        """Test adaptive concurrency stays within bounds and reports where it settled"""
+        plan = load_scenario('adaptive_posts.json')
+        result = run_ramp(self.client, plan)
+        settings = plan.ramp.adaptive
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            futures = [executor.submit(make_request) for _ in range(10)]
-            
-            for future in concurrent.futures.as_completed(futures):
-                response = future.result()
-                self.validator.validate_status_code(response, 200)
\ No newline at end of file
+        assert result.total_requests == len(plan)
+        assert result.total_errors == 0, f"{result.total_errors} requests failed under adaptive load"
+        for window in result.stages:
+            assert settings.minimum <= window.concurrency <= settings.maximum
+        assert result.adaptive is not None
+        assert result.adaptive['throughput'] > 0
@@ -1,5 +1,7 @@
-from tests.utilities.api_client import APITestClient
+from config.test_config import APITestConfig
+from tests.utilities.api_client import APITestClient, RequestSpec
 from tests.utilities.validators import ResponseValidator
+from tests.utilities.scenario import load_scenario
 
 class SmokeTestSuite:
     """Quick smoke tests for basic API functionality"""
@@ -16,9 +18,17 @@ class SmokeTestSuite:
     
     def test_all_main_endpoints(self):
         """Test all main endpoints are accessible"""
-        endpoints = ['/posts', '/users', '/comments', '/albums', '/photos', '/todos']
+        plan = load_scenario('smoke_endpoints.json')
         
-        for endpoint in endpoints:
-            response = self.client.get(endpoint)
-            self.validator.validate_status_code(response, 200)
+        results = self.client.batch(
+            RequestSpec(planned.method, planned.endpoint, planned.params) for planned in plan
+        )
+        
+        for planned, result in zip(plan, results):
+            assert result.ok, f"{planned.method} {planned.endpoint} failed: {result.error}"
+            response = result.response
+            self.validator.validate_status_code(response, planned.expect_status)
+            self.validator.validate_response_size(response, APITestConfig.MAX_RESPONSE_BYTES)
+            if APITestConfig.REQUIRE_COMPRESSION:
+                self.validator.validate_compression(response)
             assert len(response.json()) > 0
@@ -0,0 +1,116 @@
+from tests.utilities.adaptive import AIMDLimiter, settled_point
+from tests.utilities.load_runner import StageResult
+
+class TestAIMDLimiter:
+    """Unit tests for the additive-increase / multiplicative-decrease limiter"""
+    
+    def make_limiter(self, **overrides):
+        settings = dict(initial=4, minimum=1, maximum=6, target_latency=0.1, max_error_rate=0.1,
+                        percentile=95, window=10, backoff=0.5, increase=1)
+        settings.update(overrides)
+        return AIMDLimiter(**settings)
+    
+    def saturate(self, limiter):
+        for _ in range(limiter.limit):
+            assert limiter.acquire(timeout=0)
+        for _ in range(limiter.limit):
+            limiter.release()
+    
+    def test_grows_only_when_saturated(self):
+        """Test a fast window raises the limit only if the limit was reached"""
+        limiter = self.make_limiter()
+        windows = [limiter.record(0.01, True) for _ in range(10)]
+        assert windows[:-1] == [None] * 9
+        assert windows[-1]['requests'] == 10
+        assert limiter.limit == 4
+        
+        self.saturate(limiter)
+        for _ in range(10):
+            limiter.record(0.01, True)
+        assert limiter.limit == 5
+    
+    def test_increase_stops_at_maximum(self):
+        """Test the limit never grows past the maximum"""
+        limiter = self.make_limiter(initial=6)
+        self.saturate(limiter)
+        for _ in range(10):
+            limiter.record(0.01, True)
+        assert limiter.limit == 6
+    
+    def test_backs_off_on_latency_and_errors(self):
+        """Test slow or failing windows multiply the limit by the backoff, down to the minimum"""
+        limiter = self.make_limiter()
+        for _ in range(10):
+            limiter.record(0.5, True)
+        assert limiter.limit == 2
+        
+        for i in range(10):
+            limiter.record(0.01, i >= 2)
+        assert limiter.limit == 1
+        
+        for _ in range(10):
+            limiter.record(0.5, True)
+        assert limiter.limit == 1
+    
+    def test_window_percentile_is_configurable(self):
+        """Test the limiter judges the configured percentile, not always p95"""
+        latencies = [0.01] * 8 + [0.5] * 2
+        p50 = self.make_limiter(percentile=50)
+        p95 = self.make_limiter(percentile=95)
+        for latency in latencies:
+            p50.record(latency, True)
+            p95.record(latency, True)
+        assert p50.limit == 4
+        assert p95.limit == 2
+    
+    def test_acquire_blocks_at_limit(self):
+        """Test acquire refuses a request beyond the limit until one is released"""
+        limiter = self.make_limiter(initial=1)
+        assert limiter.acquire(timeout=0)
+        assert not limiter.acquire(timeout=0.01)
+        limiter.release()
+        assert limiter.acquire(timeout=0)
+    
+    def test_flush_keeps_limit(self):
+        """Test flushing a partial window reports it without adjusting the limit"""
+        limiter = self.make_limiter()
+        assert limiter.flush() is None
+        for _ in range(3):
+            limiter.record(0.5, False)
+        window = limiter.flush()
+        assert window['requests'] == 3
+        assert window['errors'] == 3
+        assert limiter.limit == 4
+
+
+class TestSettledPoint:
+    """Unit tests for where an adaptive run settled"""
+    
+    def make_stage(self, index, concurrency, latencies):
+        stage = StageResult(index, concurrency)
+        for latency in latencies:
+            stage.histogram.record(latency)
+        stage.requests = len(latencies)
+        stage.elapsed = 1.0
+        return stage
+    
+    def test_uses_last_half_of_windows(self):
+        """Test concurrency and throughput come from the settled tail of the run"""
+        stages = [self.make_stage(i, concurrency, [0.01] * 10)
+                  for i, concurrency in enumerate([1, 2, 8, 8, 9, 8])]
+        settled = settled_point(stages)
+        assert settled['concurrency'] == 8
+        assert settled['throughput'] == 10.0
+        assert settled['windows'] == 3
+        assert settled_point([]) is None
+    
+    def test_reports_the_limiter_percentile(self):
+        """Test the latency is reported at the configured percentile, under a matching key"""
+        stages = [self.make_stage(0, 4, [0.01] * 9 + [1.0])]
+        p50 = settled_point(stages, percentile=50.0)
+        assert p50['percentile'] == 50.0
+        assert 'p95' not in p50
+        assert abs(p50['p50'] - 0.01) < 0.001
+        
+        p95 = settled_point(stages)
+        assert abs(p95['p95'] - 1.0) < 0.01
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+from tests.utilities import artifacts
+from tests.utilities.artifacts import ArtifactStore
+
+
+class TestApplyRetention:
+    """Unit tests for compacting archived runs under the retention policy"""
+    
+    @pytest.fixture
+    def store(self, tmp_path, monkeypatch):
+        self.now = 1_000_000.0
+        monkeypatch.setattr(artifacts, 'time', SimpleNamespace(time=lambda: self.now))
+        return ArtifactStore(str(tmp_path), codec='gzip')
+    
+    def put(self, store, run_id, report, age_days=0.0, summary=None):
+        """Archive a run with a shared asset and its own report, ``age_days`` old"""
+        now, self.now = self.now, self.now - age_days * 86400
+        store.put_bytes(b'shared asset', run_id, 'asset', 'style.css')
+        store.put_bytes(report, run_id, 'html', 'report.html')
+        if summary is not None:
+            store.put_json(summary, run_id, 'summary', 'summary.json')
+        self.now = now + 1
+    
+    def blob_exists(self, store, data):
+        sha256 = hashlib.sha256(data).hexdigest()
+        return os.path.exists(store._blob_path(sha256, 'gzip'))
+    
+    def test_keeps_newest_runs(self, store):
+        """Test runs beyond keep_runs become summary rows and lose their unshared blobs"""
+        for index in range(1, 5):
+            self.put(store, f"run_{index}", f"report {index}".encode(), summary={'passed': index})
+        
+        assert store.apply_retention(keep_runs=2, max_age_days=0) == ['run_1', 'run_2']
+        assert list(store.runs()) == ['run_3', 'run_4']
+        summaries = store.summaries()
+        assert [row['run_id'] for row in summaries] == ['run_1', 'run_2']
+        assert summaries[0]['artifacts'] == 3
+        assert summaries[0]['passed'] == 1
+        assert not self.blob_exists(store, b'report 1')
+        assert self.blob_exists(store, b'report 3')
+        assert self.blob_exists(store, b'shared asset')
+    
+    def test_expires_old_runs(self, store):
+        """Test runs older than max_age_days are compacted even within keep_runs"""
+        self.put(store, 'old', b'old report', age_days=10)
+        self.put(store, 'recent', b'recent report', age_days=1)
+        self.put(store, 'latest', b'latest report')
+        
+        assert store.apply_retention(keep_runs=5, max_age_days=7) == ['old']
+        assert set(store.runs()) == {'recent', 'latest'}
+    
+    def test_protected_run_is_retained(self, store):
+        """Test the newest run, or keep_run when given, survives any policy"""
+        for index in range(1, 4):
+            self.put(store, f"run_{index}", f"report {index}".encode(), age_days=30)
+        assert store.apply_retention(keep_runs=0, max_age_days=1, keep_run='run_1') == ['run_2', 'run_3']
+        assert list(store.runs()) == ['run_1']
+        assert store.apply_retention(keep_runs=0, max_age_days=1) == []
+        assert list(store.runs()) == ['run_1']
+    
+    def test_nothing_to_compact(self, store):
+        """Test an empty archive or one within policy is left untouched"""
+        assert store.apply_retention(keep_runs=2, max_age_days=0) == []
+        self.put(store, 'run_1', b'report')
+        self.put(store, 'run_2', b'report')
+        with open(store.manifest_path, 'r', encoding='utf-8') as f:
+            manifest = [json.loads(line) for line in f]
+        
+        assert store.apply_retention(keep_runs=2, max_age_days=0) == []
+        assert not os.path.exists(store.summaries_path)
+        assert [entry.to_dict() for entry in store.entries()] == manifest
+
+
+class TestPruneOriginals:
+    """Unit tests for deleting loose report files of compacted runs"""
+    
+    def write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return str(path)
+    
+    def test_prunes_only_compacted_runs(self, tmp_path):
+        """Test compaction deletes its runs' unchanged reports but keeps assets and reused paths"""
+        store = ArtifactStore(str(tmp_path / 'artifacts'), codec='gzip')
+        asset = self.write(tmp_path / 'html' / 'assets' / 'style.css', b'shared asset')
+        latest = self.write(tmp_path / 'html' / 'latest.html', b'latest report')
+        reports = {}
+        for index in range(1, 4):
+            reports[index] = self.write(tmp_path / 'html' / f"report_{index}.html", f"report {index}".encode())
+            store.put_run(f"run_{index}", [('asset', asset), ('html', reports[index]), ('html', latest)])
+        self.write(reports[2], b'report 2, edited after archiving')
+        
+        assert store.apply_retention(keep_runs=1, max_age_days=0, prune_originals=True) == ['run_1', 'run_2']
+        assert not os.path.exists(reports[1])
+        assert os.path.exists(reports[2])
+        assert os.path.exists(reports[3])
+        assert os.path.exists(latest)
+        assert os.path.exists(asset)
+    
+    def test_retained_runs_keep_their_files(self, tmp_path):
+        """Test archiving without compaction, or without pruning, deletes nothing"""
+        store = ArtifactStore(str(tmp_path / 'artifacts'), codec='gzip')
+        first = self.write(tmp_path / 'html' / 'report_1.html', b'report 1')
+        second = self.write(tmp_path / 'html' / 'report_2.html', b'report 2')
+        store.put_run('run_1', {'html': first})
+        store.put_run('run_2', {'html': second})
+        
+        assert store.apply_retention(keep_runs=2, max_age_days=0, prune_originals=True) == []
+        assert store.apply_retention(keep_runs=1, max_age_days=0) == ['run_1']
+        assert os.path.exists(first)
+        assert os.path.exists(second)
@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+import pytest
+from tests.utilities.capture import (
+    FAILED_REQUEST, FAILED_TEST, SLOW_REQUEST, CaptureStore, format_captures, load_capture, preview
+)
+
+TEST = 'tests/test_cases/test_posts.py::TestPosts::test_create_post'
+
+
+def response(status=200, body=b'{"id": 1}', request_body=b'{"title": "x"}'):
+    request = SimpleNamespace(headers={'Content-Type': 'application/json'}, body=request_body)
+    return SimpleNamespace(status_code=status, headers={'Content-Type': 'application/json'},
+                           content=body, request=request)
+
+
+class TestCaptureStore:
+    """Unit tests for bounded request/response capture"""
+    
+    @pytest.fixture
+    def store(self, tmp_path):
+        return CaptureStore(str(tmp_path), slow_percentile=90, min_samples=10, sample_size=5,
+                            max_body_bytes=16, max_spilled=10, pending_per_test=2, seed=1)
+    
+    def test_failed_requests_are_spilled(self, store):
+        """Test 5xx responses and raised requests are written out in full, bodies cut"""
+        store.capture('GET', '/posts/1', 0.01, response(503, body=b'x' * 40), test=TEST)
+        store.capture('GET', '/posts/2', 0.02, error='ConnectionError: reset', test=TEST)
+        
+        first, second = store.captures_for(TEST)
+        assert (first['reason'], first['status'], second['status']) == (FAILED_REQUEST, 503, 0)
+        full = load_capture(first['path'])
+        assert full['response']['body'] == 'x' * 16
+        assert (full['response']['body_bytes'], full['response']['truncated']) == (40, True)
+        assert full['request']['body'] == '{"title": "x"}'
+        assert 'response' not in load_capture(second['path'])
+        assert 'ConnectionError: reset' in preview(second['path'])
+        assert '…(truncated)' in preview(first['path'])
+        assert preview(first['path'], limit=10).endswith('\n…')
+        assert '/posts/2 -> ConnectionError: reset in 20.0ms' in format_captures([second])
+    
+    def test_slow_requests_after_min_samples(self, store):
+        """Test requests over the running percentile are spilled once enough samples exist"""
+        store.capture('GET', '/early', 1.0, response())
+        for _ in range(20):
+            store.capture('GET', '/posts', 0.01, response())
+        store.capture('GET', '/slow', 0.5, response())
+        
+        assert [(entry['url'], entry['reason']) for entry in store.spilled] == [('/slow', SLOW_REQUEST)]
+        assert store.summary()['slow_threshold'] == pytest.approx(0.01, rel=0.02)
+    
+    def test_failing_test_spills_its_recent_requests(self, store):
+        """Test a failing test's last requests are written out, a passing test's forgotten"""
+        for index in range(3):
+            store.capture('POST', f"/posts/{index}", 0.01, response(400), test=TEST)
+        assert store.spilled == []
+        captures = store.spill_test(TEST)
+        assert [(entry['url'], entry['reason']) for entry in captures] == [
+            ('/posts/1', FAILED_TEST), ('/posts/2', FAILED_TEST)]
+        
+        store.capture('GET', '/posts', 0.01, response(), test='other')
+        assert store.finish_test('other') == []
+        assert store.spill_test('other') == []
+    
+    def test_memory_stays_bounded(self, store):
+        """Test samples stay at sample_size and spills stop at max_spilled"""
+        for index in range(100):
+            store.capture('GET', f"/posts/{index}", 0.01, response(500 if index % 2 else 200))
+        
+        summary = store.summary()
+        assert (summary['requests'], summary['spilled'], summary['dropped']) == (100, 10, 40)
+        assert len(summary['samples']) == 5
+        assert len({sample['url'] for sample in summary['samples']}) == 5
+        assert all('response' not in sample and sample['response_headers'] for sample in summary['samples'])
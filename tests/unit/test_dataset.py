@@ -0,0 +1,31 @@
+import os
+
+from tests.utilities import dataset
+from tests.utilities.dataset import DatasetStore, ensure_dataset
+
+COUNTS = {'users': 2, 'posts': 4, 'comments': 8, 'albums': 2, 'photos': 4, 'todos': 4}
+
+class TestEnsureDataset:
+    """Unit tests for the cached dataset directory"""
+    
+    def test_generates_once_and_reuses(self, tmp_path):
+        """Test the same parameters map to one generated directory"""
+        path = ensure_dataset(COUNTS, seed=1, skew=0.5, root=str(tmp_path))
+        assert ensure_dataset(COUNTS, seed=1, skew=0.5, root=str(tmp_path)) == path
+        assert ensure_dataset(COUNTS, seed=2, skew=0.5, root=str(tmp_path)) != path
+        assert os.path.exists(os.path.join(path, dataset.META_FILE))
+    
+    def test_losing_a_generation_race_removes_its_copy(self, tmp_path, monkeypatch):
+        """Test a process whose rename loses to another's leaves no temporary directory behind"""
+        generate = dataset.generate_dataset
+        
+        def racing_generate(path, *args):
+            # Another process publishes the final directory while this one generates
+            generate(path.rsplit('.tmp', 1)[0], *args)
+            return generate(path, *args)
+        
+        monkeypatch.setattr(dataset, 'generate_dataset', racing_generate)
+        path = ensure_dataset(COUNTS, seed=1, skew=0.5, root=str(tmp_path))
+        
+        assert os.listdir(tmp_path) == [os.path.basename(path)]
+        assert DatasetStore(path).count('posts') == COUNTS['posts']
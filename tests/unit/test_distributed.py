@@ -0,0 +1,113 @@
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+from types import SimpleNamespace
+
+import pytest
+from config.test_config import APITestConfig
+from tests.utilities.distributed import MSG_DONE, MSG_PLAN, Coordinator, DeltaReporter, run_worker
+from tests.utilities.load_runner import StageResult
+from tests.utilities.scenario import ScenarioError, compile_scenario
+
+SCENARIO = {
+    'name': 'distributed',
+    'requests': 9,
+    'mix': [{'endpoint': '/posts/1'}],
+    'ramp': {'profile': 'step', 'start': 3, 'step': 3, 'stages': 2, 'rate': 30},
+}
+
+
+def fake_worker(coordinator, latencies=(0.01, 0.2)):
+    """Worker speaking the real protocol, with the ramp replaced by canned samples per shard"""
+    while coordinator.address[1] == 0:
+        time.sleep(0.01)
+    conn = Client(coordinator.address, authkey=coordinator.authkey)
+    try:
+        kind, assignment = conn.recv()
+        assert kind == MSG_PLAN
+        plan = compile_scenario(assignment['scenario']).shard(assignment['shard'], assignment['shards'])
+        latency = latencies[assignment['shard']]
+        with DeltaReporter(conn, assignment['shard'], interval=0.01) as reporter:
+            for index, stage in enumerate(plan.ramp.stages):
+                result = StageResult(index, stage.concurrency, stage.rate)
+                for _ in plan:
+                    reporter.record(SimpleNamespace(latency=latency, ok=latency < 0.1))
+                    result.histogram.record(latency)
+                    result.corrected.record(latency * 2)
+                    result.requests += 1
+                    result.errors += latency >= 0.1
+                result.elapsed = latency * len(plan)
+                reporter.stage_done(result)
+        reporter.send(MSG_DONE, {'worker': assignment['shard']})
+    finally:
+        conn.close()
+
+
+class TestCoordinator:
+    """Unit tests for the coordinator/worker protocol"""
+    
+    def test_merges_worker_stages(self):
+        """Test each worker gets its own shard and the stage totals are merged"""
+        updates = []
+        coordinator = Coordinator(SCENARIO, local_workers=0, remote_workers=2, on_update=updates.append)
+        workers = [threading.Thread(target=fake_worker, args=(coordinator,), daemon=True) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        result = coordinator.run()
+        for worker in workers:
+            worker.join(5)
+        
+        assert coordinator.errors == []
+        assert [stage.concurrency for stage in result.stages] == [3, 6]
+        assert [stage.rate for stage in result.stages] == [pytest.approx(30), pytest.approx(30)]
+        first = result.stages[0]
+        # Shard 0 runs requests 0, 2, 4, 6, 8 and shard 1 the other four
+        assert (first.requests, first.errors) == (9, 4)
+        assert first.elapsed == pytest.approx(0.8)
+        assert first.corrected.max == pytest.approx(0.4, rel=0.02)
+        assert updates and coordinator.live.requests == 18
+        assert coordinator.live.errors == 8
+    
+    def test_random_key_per_run(self, monkeypatch):
+        """Test without a configured key each coordinator makes its own, and other keys are refused"""
+        monkeypatch.setattr(APITestConfig, 'LOAD_WORKER_AUTHKEY', None)
+        first, second = Coordinator(SCENARIO), Coordinator(SCENARIO)
+        assert first.authkey != second.authkey
+        assert len(first.authkey) == 32
+        assert Coordinator(SCENARIO, authkey=b'given').authkey == b'given'
+        monkeypatch.setattr(APITestConfig, 'LOAD_WORKER_AUTHKEY', b'configured')
+        assert Coordinator(SCENARIO).authkey == b'configured'
+    
+    def test_wrong_key_is_refused(self):
+        """Test a client with another key is turned away and the run goes on without it"""
+        coordinator = Coordinator(SCENARIO, local_workers=0, remote_workers=1)
+        errors = []
+        
+        def intruder():
+            while coordinator.address[1] == 0:
+                time.sleep(0.01)
+            try:
+                Client(coordinator.address, authkey=b'guessed')
+            except AuthenticationError as e:
+                errors.append(e)
+            fake_worker(coordinator)
+        
+        thread = threading.Thread(target=intruder, daemon=True)
+        thread.start()
+        result = coordinator.run()
+        thread.join(5)
+        assert errors
+        assert coordinator.errors == ["rejected a connection: digest received was wrong"]
+        assert result.stages[0].requests == 9
+    
+    def test_worker_needs_a_key(self, monkeypatch):
+        """Test a worker without a key refuses to connect"""
+        monkeypatch.setattr(APITestConfig, 'LOAD_WORKER_AUTHKEY', None)
+        with pytest.raises(ValueError, match="LOAD_WORKER_AUTHKEY"):
+            run_worker(('127.0.0.1', 1))
+    
+    def test_too_many_workers(self):
+        """Test the coordinator refuses more workers than the plan can be split over"""
+        with pytest.raises(ScenarioError, match="at most 3 workers, not 4"):
+            Coordinator(SCENARIO, local_workers=4).run()
@@ -0,0 +1,112 @@
+import pytest
+from config.test_config import APITestConfig
+from tests.utilities.flaky import (
+    FAIL, FLAKY_OUTCOME, PASS, FlakinessHistory, apply_reruns, blocking, record_history
+)
+from tests.utilities.pytest_runner import RunResult
+from tests.utilities.results import FAILED, FLAKY, PASSED, ResultRecord
+
+NODEID = 'tests/test_cases/test_posts.py::TestPosts::test_get_all_posts'
+
+
+def quarantine(history, nodeid=NODEID):
+    for _ in range(APITestConfig.FLAKY_MIN_RUNS):
+        history.record(nodeid, FLAKY_OUTCOME)
+    assert history.entry(nodeid)['quarantined']
+
+
+class TestFlakinessHistory:
+    """Unit tests for flakiness scores and quarantine hysteresis"""
+    
+    @pytest.fixture
+    def history(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(APITestConfig, 'FLAKY_HISTORY_FILE', str(tmp_path / 'flakiness.json'))
+        return FlakinessHistory()
+    
+    def test_score_is_an_exponential_average(self, history):
+        """Test each run moves the score by FLAKY_SCORE_ALPHA towards its outcome"""
+        history.record(NODEID, FLAKY_OUTCOME)
+        history.record(NODEID, FAIL)
+        entry = history.record(NODEID, PASS)
+        assert entry['score'] == pytest.approx(0.2 * 0.8 * 0.8)
+        assert (entry['runs'], entry['flaky'], entry['failures'], entry['recent']) == (3, 1, 1, 'KFP')
+        assert history.entry('unknown')['runs'] == 0
+    
+    def test_quarantine_waits_for_min_runs(self, history):
+        """Test a score over the threshold only quarantines after FLAKY_MIN_RUNS runs"""
+        for _ in range(APITestConfig.FLAKY_MIN_RUNS - 1):
+            entry = history.record(NODEID, FLAKY_OUTCOME)
+            assert not entry['quarantined']
+        assert entry['score'] >= APITestConfig.FLAKY_QUARANTINE_SCORE
+        assert history.record(NODEID, FLAKY_OUTCOME)['quarantined']
+        assert history.quarantined() == [NODEID]
+    
+    def test_release_below_lower_threshold(self, history):
+        """Test a quarantined test stays so until its score falls under FLAKY_RELEASE_SCORE"""
+        quarantine(history)
+        entry = history.entry(NODEID)
+        between = 0
+        while entry['score'] >= APITestConfig.FLAKY_RELEASE_SCORE:
+            assert entry['quarantined']
+            between += entry['score'] < APITestConfig.FLAKY_QUARANTINE_SCORE
+            entry = history.record(NODEID, PASS)
+        assert between > 0
+        assert not entry['quarantined']
+        assert history.quarantined() == []
+        
+        # Climbing back over the release threshold alone does not re-quarantine
+        entry = history.record(NODEID, FLAKY_OUTCOME)
+        assert APITestConfig.FLAKY_RELEASE_SCORE <= entry['score'] < APITestConfig.FLAKY_QUARANTINE_SCORE
+        assert not entry['quarantined']
+    
+    def test_recent_history_is_bounded(self, history, monkeypatch):
+        """Test only the last FLAKY_HISTORY_LENGTH outcomes are kept"""
+        monkeypatch.setattr(APITestConfig, 'FLAKY_HISTORY_LENGTH', 4)
+        for outcome in (FAIL, PASS, PASS, FLAKY_OUTCOME, PASS):
+            entry = history.record(NODEID, outcome)
+        assert entry['recent'] == 'PPKP'
+    
+    def test_save_and_load(self, history):
+        """Test the history round-trips through its JSON file"""
+        quarantine(history)
+        history.record('tests/other.py::test_b', PASS)
+        loaded = FlakinessHistory(history.save())
+        assert loaded.tests == history.tests
+        assert loaded.quarantined() == [NODEID]
+
+
+class TestRecordHistory:
+    """Unit tests for folding a run's records into the flakiness history"""
+    
+    @pytest.fixture
+    def history(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(APITestConfig, 'FLAKY_HISTORY_FILE', str(tmp_path / 'flakiness.json'))
+        return FlakinessHistory()
+    
+    def test_quarantined_failures_do_not_block(self, history):
+        """Test failures of quarantined tests are annotated and no longer block the run"""
+        quarantine(history)
+        history.save()
+        records = [ResultRecord('a', nodeid=NODEID, status=FAILED),
+                   ResultRecord('b', nodeid='tests/other.py::test_b', status=PASSED)]
+        result = RunResult(1, records, 1.0, {})
+        
+        assert apply_reruns(result, reruns=0) == []
+        assert result.exit_code == 0
+        assert records[0].flakiness['quarantined']
+        assert records[1].flakiness is None
+        assert FlakinessHistory().entry(NODEID)['runs'] == APITestConfig.FLAKY_MIN_RUNS + 1
+    
+    def test_read_only_history(self, history):
+        """Test update=False annotates records without recording or saving the run"""
+        quarantine(history)
+        history.save()
+        records = [ResultRecord('a', nodeid=NODEID, status=FLAKY,
+                                flakiness={'outcome': FLAKY_OUTCOME, 'reruns': 3, 'rerun_passes': 1}),
+                   ResultRecord('b', nodeid='tests/other.py::test_b', status=FAILED)]
+        
+        record_history(records, FlakinessHistory(), update=False)
+        assert records[0].flakiness['quarantined']
+        assert records[0].flakiness['rerun_passes'] == 1
+        assert blocking(records) == [records[1]]
+        assert FlakinessHistory().entry(NODEID)['runs'] == APITestConfig.FLAKY_MIN_RUNS
@@ -0,0 +1,105 @@
+import random
+
+from tests.utilities.latency import LatencyHistogram
+from tests.utilities.load_runner import StageResult, find_saturation_point
+
+
+def stage(index, concurrency, throughput, latency, rate=None):
+    result = StageResult(index, concurrency, rate)
+    result.histogram.record(latency, 100)
+    result.requests = 100
+    result.elapsed = 100 / throughput
+    return result
+
+
+class TestLatencyHistogram:
+    """Unit tests for the log-bucketed latency histogram"""
+    
+    def test_percentiles_within_precision(self):
+        """Test percentiles stay within the bucket precision of the exact nearest-rank value"""
+        rng = random.Random(1)
+        values = sorted(rng.lognormvariate(-4, 1) for _ in range(5000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+        
+        for percentile in (50, 90, 95, 99, 100):
+            exact = values[max(1, -(-len(values) * percentile // 100)) - 1]
+            assert abs(histogram.percentile(percentile) - exact) <= 0.011 * exact
+        assert histogram.percentiles() == {key: histogram.percentile(float(key[1:]))
+                                           for key in ('p50', 'p90', 'p95', 'p99')}
+    
+    def test_nearest_rank_and_clamping(self):
+        """Test small samples use nearest rank and never leave the recorded range"""
+        histogram = LatencyHistogram()
+        for value in (0.010, 0.020, 0.030, 0.040):
+            histogram.record(value)
+        assert abs(histogram.percentile(50) - 0.020) < 0.0002
+        assert abs(histogram.percentile(51) - 0.030) < 0.0003
+        assert 0.010 == histogram.min <= histogram.percentile(0) <= 0.010 * 1.01
+        assert histogram.percentile(100) == histogram.max == 0.040
+        assert LatencyHistogram().percentile(95) == 0.0
+    
+    def test_merge_matches_recording_everything(self):
+        """Test merging two histograms equals one histogram of all samples"""
+        first, second, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for i in range(1, 201):
+            (first if i % 2 else second).record(i / 1000)
+            combined.record(i / 1000)
+        first.merge(second)
+        
+        assert first.counts == combined.counts
+        assert first.count == 200
+        assert (first.min, first.max) == (0.001, 0.2)
+        assert abs(first.mean - combined.mean) < 1e-12
+    
+    def test_dict_round_trip(self):
+        """Test to_dict/from_dict preserves counts and summary values, empty or not"""
+        histogram = LatencyHistogram(precision=0.05)
+        histogram.record(0.0000005)
+        histogram.record(0.25, count=3)
+        restored = LatencyHistogram.from_dict(histogram.to_dict())
+        assert restored.counts == histogram.counts
+        assert restored.precision == 0.05
+        assert restored.percentile(90) == histogram.percentile(90)
+        
+        empty = LatencyHistogram.from_dict(LatencyHistogram().to_dict())
+        empty.record(0.5)
+        assert empty.min == 0.5
+
+
+class TestFindSaturationPoint:
+    """Unit tests for knee detection across ramp stages"""
+    
+    def test_knee_is_last_efficient_stage(self):
+        """Test the knee is reported at the stage before latency outgrew throughput"""
+        stages = [stage(0, 1, 100, 0.010), stage(1, 2, 195, 0.0102),
+                  stage(2, 4, 210, 0.019), stage(3, 8, 212, 0.038)]
+        knee = find_saturation_point(stages, percentile=95, tolerance=0.05)
+        assert knee['stage'] == 1
+        assert knee['concurrency'] == 2
+        assert knee['knee_concurrency'] == 4
+        assert abs(knee['throughput'] - 195) < 1e-9
+        assert knee['latency_growth'] > knee['throughput_gain']
+    
+    def test_no_knee_while_throughput_keeps_up(self):
+        """Test growth within tolerance, or matched by throughput, is not a knee"""
+        scaling = [stage(0, 1, 100, 0.010), stage(1, 2, 200, 0.0104), stage(2, 4, 400, 0.012)]
+        assert find_saturation_point(scaling, percentile=95, tolerance=0.05) is None
+        assert find_saturation_point(scaling[:1]) is None
+    
+    def test_skips_empty_stages(self):
+        """Test stages without requests or throughput are not compared"""
+        empty = StageResult(1, 2)
+        stages = [stage(0, 1, 100, 0.010), empty, stage(2, 4, 110, 0.030)]
+        assert find_saturation_point(stages, percentile=95, tolerance=0.05) is None
+    
+    def test_fixed_rate_stages_use_corrected_latency(self):
+        """Test a stage's corrected histogram drives detection when it has one"""
+        first = stage(0, 4, 100, 0.010, rate=100)
+        first.corrected.record(0.010, 100)
+        second = stage(1, 4, 110, 0.010, rate=200)
+        second.corrected.record(0.050, 100)
+        knee = find_saturation_point([first, second], percentile=95, tolerance=0.05)
+        assert knee['stage'] == 0
+        assert abs(knee['latency_growth'] - 4.0) < 0.1
@@ -0,0 +1,66 @@
+import io
+import threading
+
+from config.test_config import APITestConfig
+from tests.utilities.latency import LatencyHistogram
+from tests.utilities.live_metrics import AbortMonitor, LiveMetricsSession, MetricsRegistry, get_active_registry
+
+class TestLiveMetrics:
+    """Unit tests for the live metrics registry"""
+    
+    def test_window_percentiles_use_nearest_rank(self):
+        """Test the live p50/p95 match LatencyHistogram's nearest-rank percentiles"""
+        registry = MetricsRegistry(window=60)
+        histogram = LatencyHistogram()
+        for i in range(1, 21):
+            registry.record('GET', '/posts', i / 100, True)
+            histogram.record(i / 100)
+        
+        snapshot = registry.snapshot()
+        assert snapshot['p50'] == 0.10
+        assert snapshot['p95'] == 0.19
+        assert abs(snapshot['p95'] - histogram.percentile(95)) < 0.01 * 0.19
+    
+    def test_error_rate_and_totals(self):
+        """Test window error rate and cumulative request counts"""
+        registry = MetricsRegistry(window=60)
+        registry.record('GET', '/posts', 0.01, True)
+        registry.record('GET', '/posts', 0.02, False)
+        registry.record('POST', '/posts', 0.03, True)
+        
+        snapshot = registry.snapshot()
+        assert snapshot['window_requests'] == 3
+        assert snapshot['total_requests'] == 3
+        assert snapshot['error_rate'] == 1 / 3
+        assert snapshot['endpoints'][('GET', '/posts')][:2] == (2, 1)
+
+
+class TestAbortMonitor:
+    """Unit tests for stopping a run on live abort thresholds"""
+    
+    def test_thresholds_need_enough_requests(self):
+        """Test thresholds are only judged once the window holds min_requests"""
+        registry = MetricsRegistry(window=60)
+        stop_event = threading.Event()
+        monitor = AbortMonitor(registry, stop_event=stop_event, abort_error_rate=0.1, min_requests=5,
+                               stream=io.StringIO())
+        for _ in range(4):
+            registry.record('GET', '/posts', 0.01, False)
+        assert monitor.check() is None
+        
+        registry.record('GET', '/posts', 0.01, False)
+        assert monitor.check() == "error rate 100.0% above 10.0%"
+        assert stop_event.is_set()
+        assert "Aborting run" in monitor.stream.getvalue()
+    
+    def test_session_aborts_without_dashboard(self, monkeypatch):
+        """Test a session without a dashboard still watches its abort thresholds"""
+        monkeypatch.setattr(APITestConfig, 'LIVE_METRICS_INTERVAL', 0.01)
+        stop_event = threading.Event()
+        with LiveMetricsSession(dashboard=False, stop_event=stop_event, abort_p95=0.5) as session:
+            assert session.dashboard is None
+            for _ in range(20):
+                get_active_registry().record('GET', '/posts', 1.0, True)
+            assert stop_event.wait(5)
+        assert session.abort_reason == "p95 1000ms above 500ms"
+        assert LiveMetricsSession(dashboard=False).monitor is None
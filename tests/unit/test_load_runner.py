@@ -0,0 +1,82 @@
+import itertools
+import threading
+from types import SimpleNamespace
+
+import pytest
+from tests.utilities import load_runner
+from tests.utilities.load_runner import _stage_worker
+from tests.utilities.scenario import LoadPlan, PlannedRequest, RampProfile, Stage
+
+STARTED = 100.0
+INTERVAL = 0.1
+
+
+class FakeClock:
+    """perf_counter/sleep pair that only moves when told to"""
+    
+    def __init__(self, now=STARTED):
+        self.now = now
+    
+    def perf_counter(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class StubClient:
+    """Answers every request after the next of ``latencies`` seconds on the fake clock"""
+    
+    def __init__(self, clock, latencies):
+        self.clock = clock
+        self.latencies = iter(latencies)
+        self.sent = []
+    
+    def request(self, method, endpoint, params=None, data=None):
+        self.sent.append(self.clock.now)
+        self.clock.now += next(self.latencies)
+        return SimpleNamespace(status_code=200)
+
+
+def run_worker(monkeypatch, latencies, duration):
+    """Run one fixed-rate worker against a stub client and return its client and results"""
+    clock = FakeClock()
+    monkeypatch.setattr(load_runner, 'time', clock)
+    monkeypatch.setattr(load_runner, 'measure_transfer', lambda response: SimpleNamespace(response_bytes=0))
+    client = StubClient(clock, latencies)
+    plan = LoadPlan('stub', [PlannedRequest('read', 'GET', '/posts/1')],
+                    RampProfile('constant', [Stage(1, duration, 1 / INTERVAL)]))
+    result = _stage_worker(client, plan, itertools.count(), itertools.count(len(plan), -1),
+                           STARTED + duration, threading.Event(), None, itertools.count(), STARTED, INTERVAL)
+    return client, result
+
+
+class TestStageWorker:
+    """Unit tests for the fixed-rate schedule and coordinated-omission correction"""
+    
+    def test_requests_follow_the_schedule(self, monkeypatch):
+        """Test request N is sent at started + N * interval until the deadline"""
+        client, (histogram, corrected, requests, errors) = run_worker(monkeypatch, [0.01] * 10, 0.5)
+        
+        assert requests == 5
+        assert errors == 0
+        assert client.sent == pytest.approx([STARTED + n * INTERVAL for n in range(5)])
+        assert corrected.total == pytest.approx(histogram.total)
+        assert corrected.max == pytest.approx(0.01)
+    
+    def test_slow_response_delays_later_corrected_latency(self, monkeypatch):
+        """Test a stall pushes the requests queued behind it up by their slip from the schedule"""
+        latencies = [0.01, 0.35, 0.01, 0.01, 0.01, 0.01]
+        client, (histogram, corrected, requests, errors) = run_worker(monkeypatch, latencies, 0.6)
+        
+        # Slots 2-4 are sent late rather than skipped, then the schedule catches up at slot 5
+        assert requests == 6
+        assert [sent - STARTED for sent in client.sent] == pytest.approx([0.0, 0.1, 0.45, 0.46, 0.47, 0.5])
+        assert histogram.total == pytest.approx(sum(latencies))
+        assert histogram.max == pytest.approx(0.35)
+        # Each late request waited its slip (0.25, 0.16, 0.07) on top of its own latency
+        assert corrected.total == pytest.approx(sum(latencies) + 0.25 + 0.16 + 0.07)
+        assert corrected.max == pytest.approx(0.35)
+        assert corrected.percentile(50) == pytest.approx(0.08, rel=0.02)
+        assert corrected.percentile(75) == pytest.approx(0.26, rel=0.02)
+        assert histogram.percentile(75) == pytest.approx(0.01, rel=0.02)
@@ -0,0 +1,95 @@
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from tests.utilities.api_client import Paginator
+
+BASE_URL = 'https://api.test'
+POSTS = [{'id': i} for i in range(1, 24)]
+
+
+class FakeClient:
+    """Serves ``POSTS`` the way json-server pages a collection"""
+    
+    def __init__(self, total_header=True, fail_on_page=None, ignore_paging=None):
+        self.base_url = BASE_URL
+        self.total_header = total_header
+        self.fail_on_page = fail_on_page
+        # Serve POSTS[:ignore_paging] for every page, like a server without paging support
+        self.ignore_paging = ignore_paging
+        self.requests = []
+    
+    def _make_request(self, method, url, params=None):
+        query = dict(params or {}, **{k: v[0] for k, v in parse_qs(urlparse(url).query).items()})
+        self.requests.append(query)
+        if '_start' in query:
+            start, end = int(query['_start']), int(query['_end'])
+        else:
+            page, limit = int(query['_page']), int(query['_limit'])
+            start, end = (page - 1) * limit, page * limit
+        items = POSTS[start:end] if self.ignore_paging is None else POSTS[:self.ignore_paging]
+        links = {}
+        if '_page' in query and end < len(POSTS):
+            links['next'] = {'url': f"/posts?_page={int(query['_page']) + 1}&_limit={query['_limit']}"}
+        headers = {'x-total-count': str(len(POSTS))} if self.total_header else {}
+        status = 500 if len(self.requests) == self.fail_on_page else 200
+        return SimpleNamespace(status_code=status, headers=headers, links=links, url=url,
+                               json=lambda: items)
+
+
+class TestPaginator:
+    """Unit tests for lazily iterating paginated collections"""
+    
+    @pytest.mark.parametrize("style", ['page', 'range', 'link'])
+    @pytest.mark.parametrize("prefetch", [False, True], ids=['sequential', 'prefetch'])
+    def test_yields_every_item_once(self, style, prefetch):
+        """Test every style walks the whole collection in order, with or without prefetch"""
+        client = FakeClient()
+        paginator = Paginator(client, '/posts', page_size=10, style=style, prefetch=prefetch)
+        assert list(paginator) == POSTS
+        assert (paginator.pages, paginator.items, paginator.total) == (3, 23, 23)
+        assert len(client.requests) == 3
+    
+    def test_stops_at_total_count(self):
+        """Test a full last page is not followed by an empty request when the total is known"""
+        client = FakeClient()
+        assert len(list(Paginator(client, '/posts', page_size=23, style='page', prefetch=False))) == 23
+        assert len(client.requests) == 1
+    
+    def test_stops_at_short_page_without_total(self):
+        """Test without X-Total-Count a page shorter than page_size ends the iteration"""
+        client = FakeClient(total_header=False)
+        paginator = Paginator(client, '/posts', params={'userId': 1}, page_size=5, style='range',
+                              prefetch=False)
+        assert list(paginator) == POSTS
+        assert paginator.total is None
+        assert client.requests[-1] == {'userId': 1, '_start': 20, '_end': 25}
+    
+    def test_is_lazy(self):
+        """Test pages are only requested as iteration reaches them"""
+        client = FakeClient()
+        items = iter(Paginator(client, '/posts', page_size=10, style='page', prefetch=False))
+        assert client.requests == []
+        assert [next(items) for _ in range(10)] == POSTS[:10]
+        assert len(client.requests) == 1
+    
+    def test_errors(self):
+        """Test a failing page raises and an unknown style is refused"""
+        with pytest.raises(RuntimeError, match="returned 500 on page 2"):
+            list(Paginator(FakeClient(fail_on_page=2), '/posts', page_size=10, style='page', prefetch=False))
+        with pytest.raises(ValueError, match="Unknown pagination style 'cursor'"):
+            Paginator(FakeClient(), '/posts', style='cursor')
+    
+    @pytest.mark.parametrize("style", ['page', 'range'])
+    @pytest.mark.parametrize("prefetch", [False, True], ids=['sequential', 'prefetch'])
+    def test_server_ignoring_paging(self, style, prefetch):
+        """Test a server that ignores paging and sends no total raises instead of looping forever"""
+        client = FakeClient(total_header=False, ignore_paging=len(POSTS))
+        with pytest.raises(RuntimeError, match="23 items on page 1, more than page_size 10"):
+            list(Paginator(client, '/posts', page_size=10, style=style, prefetch=prefetch))
+        
+        client = FakeClient(total_header=False, ignore_paging=10)
+        items = []
+        with pytest.raises(RuntimeError, match="page 2 repeats page 1"):
+            items.extend(Paginator(client, '/posts', page_size=10, style=style, prefetch=prefetch))
+        assert items == POSTS[:10]
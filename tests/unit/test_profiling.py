@@ -0,0 +1,48 @@
+import threading
+import time
+
+from tests.utilities.profiling import PhaseProfiler
+
+class TestPhaseProfiler:
+    """Unit tests for per-test phase timing"""
+    
+    def setup_method(self):
+        """Setup for each test method"""
+        self.profiler = PhaseProfiler()
+        self.profiler.current = 'test_batch'
+    
+    def test_concurrent_phase_counts_wall_time_once(self):
+        """Test a phase open on several threads counts the union of their time, not the sum"""
+        barrier = threading.Barrier(4)
+        
+        def request():
+            barrier.wait()
+            with self.profiler.phase('network'):
+                time.sleep(0.1)
+        
+        threads = [threading.Thread(target=request) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.profiler.durations['test_batch'] = 0.3
+        
+        row = self.profiler.rows()[0]
+        assert 0.1 <= row['network'] < 0.2
+        assert row['other'] > 0.1
+        assert abs(row['duration'] - row['network'] - row['other']) < 1e-9
+    
+    def test_nested_and_distinct_phases(self):
+        """Test re-entering a phase counts once and other excludes time in any phase"""
+        with self.profiler.phase('network'):
+            with self.profiler.phase('network'):
+                time.sleep(0.02)
+        with self.profiler.phase('decode'):
+            time.sleep(0.02)
+        self.profiler.durations['test_batch'] = 0.1
+        
+        row = self.profiler.rows()[0]
+        assert 0.02 <= row['network'] < 0.04
+        assert 0.02 <= row['decode'] < 0.04
+        assert abs(row['other'] - (0.1 - row['network'] - row['decode'])) < 1e-3
+        assert not self.profiler._open
@@ -0,0 +1,104 @@
+import os
+
+import pytest
+from tests.utilities import result_store, stats
+from tests.utilities.result_store import ColumnarResultWriter, ResultStore
+
+# started, latency, status, ok, method, endpoint, bytes
+ROWS = [
+    (100.0, 0.010, 200, True, 'GET', '/posts/1', 300),
+    (100.5, 0.020, 200, True, 'GET', '/posts/2', 310),
+    (101.0, 0.030, 500, False, 'GET', '/posts/3', 20),
+    (101.5, 0.040, 201, True, 'POST', '/posts', 120),
+    (102.0, 0.050, 200, True, 'GET', '/users', 900),
+]
+
+
+def write_store(path, rows, flush_every=2):
+    with ColumnarResultWriter(str(path), flush_every=flush_every) as writer:
+        for row in rows:
+            writer.append(*row)
+    return str(path)
+
+
+class TestResultStore:
+    """Unit tests for the columnar per-request result store"""
+    
+    @pytest.fixture(autouse=True, params=[True, False], ids=['numpy', 'python'])
+    def use_numpy(self, request, monkeypatch):
+        if request.param and not result_store.HAS_NUMPY:
+            pytest.skip("NumPy is not installed")
+        monkeypatch.setattr(result_store, 'HAS_NUMPY', request.param)
+        monkeypatch.setattr(stats, 'HAS_NUMPY', request.param)
+    
+    def test_round_trip_and_filters(self, tmp_path):
+        """Test rows read back as written and every filter narrows the selection"""
+        with ResultStore(write_store(tmp_path, ROWS)) as store:
+            assert store.rows == 5
+            assert store.endpoints() == ['/posts', '/posts/{id}', '/users']
+            assert store.query().count() == 5
+            assert store.query(endpoint='/posts/7').count() == 3
+            assert store.query(method='POST').values('endpoint') == ['/posts']
+            assert store.query(status=500).values('latency') == [pytest.approx(0.030)]
+            assert store.query(ok=False).count() == 1
+            assert store.query(start=100.5, end=102.0).count() == 3
+            assert store.query(method='DELETE').count() == 0
+            assert store.query(endpoint='/posts/7').error_rate() == pytest.approx(1 / 3)
+            assert [int(value) for value in store.query().values('bytes_received')] == [300, 310, 20, 120, 900]
+    
+    def test_percentiles(self, tmp_path):
+        """Test query percentiles use nearest rank, overall and per time window"""
+        with ResultStore(write_store(tmp_path, ROWS)) as store:
+            query = store.query()
+            assert query.percentile(50) == pytest.approx(0.030)
+            assert query.percentile(100) == pytest.approx(0.050)
+            windows = query.percentiles_by_window(1.0, percentiles=(50, 100))
+            assert [window['count'] for window in windows] == [2, 2, 1]
+            assert windows[0]['start'] == 100.0
+            assert windows[1]['p50'] == pytest.approx(0.030)
+            assert windows[1]['p100'] == pytest.approx(0.040)
+            assert store.query(method='PUT').percentiles_by_window(1.0) == []
+    
+    def test_windows_with_gaps_and_edges(self, tmp_path):
+        """Test rows on a window edge open the next window and empty windows are kept"""
+        rows = [(100.0 + started, latency, 200, True, 'GET', '/users', 0)
+                for started, latency in ((0.3, 0.04), (0.0, 0.01), (0.2, 0.03), (0.1, 0.02), (0.5, 0.05),
+                                         (1.5, 0.06))]
+        with ResultStore(write_store(tmp_path, rows)) as store:
+            windows = store.query().percentiles_by_window(0.5, percentiles=(50, 99))
+            assert [window['count'] for window in windows] == [4, 1, 0, 1]
+            assert [window['start'] for window in windows] == [100.0, 100.5, 101.0, 101.5]
+            assert windows[0]['p50'] == pytest.approx(0.02)
+            assert windows[0]['p99'] == pytest.approx(0.04)
+            assert windows[2]['p50'] == 0.0
+            assert store.query().latencies() == pytest.approx([0.01, 0.02, 0.03, 0.04, 0.05, 0.06])
+            assert store.query().percentile(50) == pytest.approx(0.03)
+            assert store.query(endpoint='/posts').latencies() == []
+    
+    def test_unflushed_rows_are_not_visible(self, tmp_path):
+        """Test readers see only flushed rows while a run is still writing"""
+        writer = ColumnarResultWriter(str(tmp_path), flush_every=3)
+        for row in ROWS[:4]:
+            writer.append(*row)
+        assert ResultStore(str(tmp_path)).rows == 3
+        writer.close()
+        assert ResultStore(str(tmp_path)).rows == 4
+    
+    def test_summary_across_shards(self, tmp_path):
+        """Test a directory of worker shards with their own dictionaries summarises as one"""
+        write_store(tmp_path / 'worker_1', ROWS[:3])
+        write_store(tmp_path / 'worker_2', list(reversed(ROWS[3:])) + [
+            (103.0, 0.060, 200, True, 'GET', '/posts/9', 300)])
+        os.makedirs(tmp_path / 'not_a_shard')
+        
+        with ResultStore(str(tmp_path)) as store:
+            assert store.rows == 6
+            groups = {(group.method, group.endpoint): group for group in store.summary(percentiles=(50,))}
+            posts = groups[('GET', '/posts/{id}')]
+            assert (posts.count, posts.errors) == (4, 1)
+            assert posts.percentiles['p50'] == pytest.approx(0.020)
+            assert posts.mean == pytest.approx(0.030)
+            assert posts.throughput == pytest.approx(4 / (103.06 - 100.0))
+            assert groups[('POST', '/posts')].count == 1
+            assert groups[('GET', '/users')].count == 1
+            assert store.query(endpoint='/posts/{id}').count() == 4
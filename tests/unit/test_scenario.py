@@ -0,0 +1,133 @@
+import pytest
+from tests.utilities.scenario import ScenarioError, compile_scenario
+
+
+def scenario(**overrides):
+    data = {
+        'name': 'posts',
+        'seed': 7,
+        'requests': 50,
+        'variables': {'post_id': {'range': [1, 100]}, 'user': {'choice': ['a', 'b']}},
+        'mix': [
+            {'name': 'read', 'endpoint': '/posts/{post_id}', 'weight': 3},
+            {'name': 'write', 'method': 'post', 'endpoint': '/posts', 'expect_status': 201,
+             'payload': {'userId': '{post_id}', 'title': 'by {user} #{seq}'}, 'think_time': 0.5},
+        ],
+    }
+    data.update(overrides)
+    return data
+
+
+class TestCompileScenario:
+    """Unit tests for compiling scenario definitions into load plans"""
+    
+    def test_same_seed_same_plan(self):
+        """Test a seeded scenario always compiles to the same request sequence"""
+        first = compile_scenario(scenario())
+        second = compile_scenario(scenario())
+        assert len(first) == 50
+        assert [(r.method, r.endpoint, r.payload) for r in first] == \
+               [(r.method, r.endpoint, r.payload) for r in second]
+        other = compile_scenario(scenario(seed=8))
+        assert [r.endpoint for r in other] != [r.endpoint for r in first]
+    
+    def test_renders_templates_and_keeps_native_types(self):
+        """Test placeholders render in endpoints and payloads, whole placeholders keep their type"""
+        plan = compile_scenario(scenario())
+        reads = [r for r in plan if r.name == 'read']
+        writes = [r for r in plan if r.name == 'write']
+        assert reads and writes
+        assert all(1 <= int(r.endpoint.rsplit('/', 1)[1]) <= 100 for r in reads)
+        for seq, request in enumerate(plan):
+            if request.name == 'write':
+                assert request.method == 'POST'
+                assert request.expect_status == 201
+                assert request.think_time == 0.5
+                assert isinstance(request.payload['userId'], int)
+                assert request.payload['title'].endswith(f"#{seq}")
+        assert all(r.think_time == 0.0 and r.expect_status == 200 for r in reads)
+    
+    def test_weights_shape_the_mix(self):
+        """Test entries are drawn in proportion to their weights"""
+        plan = compile_scenario(scenario(requests=2000))
+        reads = sum(1 for r in plan if r.name == 'read')
+        assert 0.7 < reads / len(plan) < 0.8
+    
+    def test_sequential_order_and_defaults(self):
+        """Test sequential order cycles the mix and the request count defaults to its size"""
+        plan = compile_scenario({'order': 'sequential', 'requests': 5,
+                                 'variables': {'id': {'sequence': [10, 20]}},
+                                 'mix': [{'endpoint': '/a/{id}'}, {'endpoint': '/b'}]})
+        assert [r.endpoint for r in plan] == ['/a/10', '/b', '/a/10', '/b', '/a/10']
+        assert plan.name == 'unnamed'
+        assert plan.ramp.profile == 'constant'
+        assert len(compile_scenario({'mix': [{'endpoint': '/a'}, {'endpoint': '/b'}]})) == 2
+    
+    def test_think_time_distributions(self):
+        """Test the scenario think time applies to entries without their own"""
+        plan = compile_scenario({'requests': 200, 'think_time': {'min': 0.1, 'max': 0.2},
+                                 'mix': [{'endpoint': '/a'}, {'endpoint': '/b', 'think_time': {'mean': 0}}]})
+        for request in plan:
+            if request.endpoint == '/a':
+                assert 0.1 <= request.think_time <= 0.2
+            else:
+                assert request.think_time == 0.0
+    
+    def test_ramp_is_compiled(self):
+        """Test the ramp section becomes the plan's stages"""
+        plan = compile_scenario(scenario(ramp={'profile': 'step', 'start': 2, 'step': 2, 'stages': 3,
+                                               'stage_duration': 5}))
+        assert [stage.concurrency for stage in plan.ramp.stages] == [2, 4, 6]
+        assert plan.ramp.max_concurrency == 6
+    
+    def test_invalid_scenarios(self):
+        """Test missing mix, missing endpoints, unknown variables and bad ramps are rejected"""
+        with pytest.raises(ScenarioError, match="non-empty 'mix'"):
+            compile_scenario({'mix': []})
+        with pytest.raises(ScenarioError, match="missing 'endpoint'"):
+            compile_scenario({'mix': [{'name': 'x'}]})
+        with pytest.raises(ScenarioError, match="Undefined template variable"):
+            compile_scenario({'mix': [{'endpoint': '/posts/{missing}'}]})
+        with pytest.raises(ScenarioError, match="Unsupported variable spec"):
+            compile_scenario(scenario(variables={'post_id': {'normal': 1}}))
+        with pytest.raises(ScenarioError, match="Unknown ramp profile"):
+            compile_scenario(scenario(ramp={'profile': 'spike'}))
+        with pytest.raises(ScenarioError, match="min <= start <= max"):
+            compile_scenario(scenario(ramp={'profile': 'adaptive', 'start': 8, 'max': 4}))
+
+
+class TestLoadPlanShard:
+    """Unit tests for splitting a plan over distributed workers"""
+    
+    def test_shards_partition_requests_and_load(self):
+        """Test shards split the requests, stage concurrency and rate without overlap"""
+        plan = compile_scenario(scenario(requests=10, ramp={'profile': 'step', 'start': 3, 'step': 2,
+                                                            'stages': 2, 'rate': 30}))
+        shards = [plan.shard(index, 3) for index in range(3)]
+        assert sorted(sum([[id(r) for r in shard] for shard in shards], [])) == sorted(id(r) for r in plan)
+        assert [len(shard) for shard in shards] == [4, 3, 3]
+        for stage, parts in zip(plan.ramp.stages, zip(*[shard.ramp.stages for shard in shards])):
+            assert sum(part.concurrency for part in parts) == stage.concurrency
+            assert all(part.concurrency >= 1 for part in parts)
+            if stage.rate:
+                assert sum(part.rate for part in parts) == pytest.approx(stage.rate)
+    
+    def test_adaptive_bounds_are_shared(self):
+        """Test adaptive start, min and max are split between workers"""
+        plan = compile_scenario(scenario(ramp={'profile': 'adaptive', 'start': 4, 'min': 2, 'max': 9}))
+        first, second = plan.shard(0, 2).ramp.adaptive, plan.shard(1, 2).ramp.adaptive
+        assert (first.start + second.start, first.minimum + second.minimum) == (4, 2)
+        assert first.maximum + second.maximum == 9
+        assert plan.max_shards == 2
+    
+    def test_rejects_more_workers_than_the_plan_allows(self):
+        """Test workers beyond the request count or the smallest stage are refused, not duplicated"""
+        few_requests = compile_scenario(scenario(requests=2, ramp={'profile': 'constant', 'concurrency': 8}))
+        assert few_requests.max_shards == 2
+        with pytest.raises(ScenarioError, match="at most 2 workers, not 3"):
+            few_requests.shard(0, 3)
+        
+        low_start = compile_scenario(scenario(ramp={'profile': 'step', 'start': 1, 'step': 4, 'stages': 3}))
+        assert low_start.max_shards == 1
+        with pytest.raises(ScenarioError, match="at most 1 workers"):
+            low_start.shard(1, 2)
@@ -0,0 +1,132 @@
+import json
+import os
+import xml.etree.ElementTree as ET
+
+import pytest
+from tests.utilities.sharding import (
+    NO_TESTS_COLLECTED, _merge_exit_codes, assign_shards, load_partials, merge_junit
+)
+
+
+def partial(index, count, junit_xml=None):
+    return {'exit_code': 0, 'records': [], 'duration': 1.0,
+            'shard': {'index': index, 'count': count, 'started': 0.0, 'tests': [], 'junit_xml': junit_xml}}
+
+
+def junit(*cases):
+    body = "".join(f'<testcase classname="tests" name="{name}" time="0.1">{child}</testcase>'
+                   for name, child in cases)
+    return (f'<?xml version="1.0" encoding="utf-8"?><testsuites><testsuite name="pytest" '
+            f'timestamp="2025-01-0{len(cases)}T00:00:00" hostname="ci">{body}</testsuite></testsuites>')
+
+
+class TestAssignShards:
+    """Unit tests for longest-processing-time shard assignment"""
+    
+    def test_balances_by_duration(self):
+        """Test the longest tests are spread first, each to the least loaded shard"""
+        durations = {'a': 5.0, 'b': 4.0, 'c': 3.0, 'd': 2.0, 'e': 2.0}
+        shards = assign_shards(list(durations), 2, durations)
+        assert shards == [['a', 'd', 'e'], ['b', 'c']]
+    
+    def test_same_split_whatever_the_input_order(self):
+        """Test every executor computes the same shards, ties broken by node id"""
+        nodeids = [f"test_{i}" for i in range(12)]
+        durations = {nodeid: 1.0 for nodeid in nodeids}
+        shards = assign_shards(nodeids, 3, durations)
+        assert shards == assign_shards(list(reversed(nodeids)), 3, durations)
+        assert sorted(sum(shards, [])) == sorted(nodeids)
+        assert [len(shard) for shard in shards] == [4, 4, 4]
+    
+    def test_unknown_tests_count_as_median(self):
+        """Test tests without history weigh the median known duration"""
+        durations = {'slow': 9.0, 'mid': 2.0, 'fast': 1.0}
+        shards = assign_shards(['slow', 'mid', 'fast', 'new_1', 'new_2'], 2, durations)
+        assert shards == [['slow'], ['mid', 'new_1', 'new_2', 'fast']]
+    
+    def test_more_shards_than_tests(self):
+        """Test surplus shards are left empty"""
+        assert assign_shards(['a'], 3, {}) == [['a'], [], []]
+
+
+class TestMergeExitCodes:
+    """Unit tests for combining shard exit codes"""
+    
+    def test_failures_win(self):
+        """Test any shard with failures fails the merged run"""
+        assert _merge_exit_codes([0, 2, 1]) == 1
+    
+    def test_first_other_error(self):
+        """Test without failures the first real error is kept"""
+        assert _merge_exit_codes([0, 3, 2]) == 3
+        assert _merge_exit_codes([0, 0]) == 0
+    
+    def test_empty_shards_are_not_errors(self):
+        """Test shards that selected no tests do not fail the run unless all did"""
+        assert _merge_exit_codes([0, NO_TESTS_COLLECTED]) == 0
+        assert _merge_exit_codes([NO_TESTS_COLLECTED, 2]) == 2
+        assert _merge_exit_codes([NO_TESTS_COLLECTED, NO_TESTS_COLLECTED]) == NO_TESTS_COLLECTED
+
+
+class TestLoadPartials:
+    """Unit tests for reading shard partial results"""
+    
+    def write(self, directory, data):
+        path = os.path.join(directory, f"shard_{data['shard']['index'] + 1}_of_{data['shard']['count']}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        return path
+    
+    def test_reads_directories_in_shard_order(self, tmp_path):
+        """Test directories are searched for shard files and sorted by shard index"""
+        for index in (2, 0, 1):
+            self.write(str(tmp_path), partial(index, 3))
+        (tmp_path / 'durations.json').write_text('{}')
+        assert [data['shard']['index'] for data in load_partials([str(tmp_path)])] == [0, 1, 2]
+    
+    def test_rejects_missing_duplicate_and_mixed_shards(self, tmp_path):
+        """Test an incomplete or inconsistent set of partials is refused"""
+        first = self.write(str(tmp_path), partial(0, 2))
+        with pytest.raises(ValueError, match="once each"):
+            load_partials([first])
+        with pytest.raises(ValueError, match="once each"):
+            load_partials([first, first])
+        
+        other = tmp_path / 'other'
+        other.mkdir()
+        with pytest.raises(ValueError, match="different shard counts"):
+            load_partials([first, self.write(str(other), partial(1, 3))])
+        empty = tmp_path / 'empty'
+        empty.mkdir()
+        with pytest.raises(ValueError, match="No partial results"):
+            load_partials([str(empty)])
+
+
+class TestMergeJunit:
+    """Unit tests for combining the shards' JUnit XML"""
+    
+    def test_sums_counts_across_shards(self, tmp_path):
+        """Test the merged suite holds every test case with summed counts"""
+        partials = [
+            partial(0, 3, junit(('test_a', ''), ('test_b', '<failure message="boom"/>'))),
+            partial(1, 3, junit(('test_c', '<skipped/>'), ('test_d', '<error message="setup"/>'),
+                                ('test_e', '<failure message="again"/>'))),
+            partial(2, 3),
+        ]
+        output = merge_junit(partials, str(tmp_path / 'junit.xml'), 2.5)
+        
+        suite = ET.parse(output).getroot().find('testsuite')
+        assert suite.get('tests') == '5'
+        assert suite.get('failures') == '2'
+        assert suite.get('errors') == '1'
+        assert suite.get('skipped') == '1'
+        assert suite.get('time') == '2.500'
+        assert suite.get('timestamp') == '2025-01-02T00:00:00'
+        assert suite.find("properties/property[@name='shards']").get('value') == '3'
+        assert [case.get('name') for case in suite.findall('testcase')] == [
+            'test_a', 'test_b', 'test_c', 'test_d', 'test_e']
+    
+    def test_no_junit_no_output(self, tmp_path):
+        """Test nothing is written when no shard produced JUnit XML"""
+        assert merge_junit([partial(0, 1)], str(tmp_path / 'junit.xml'), 1.0) is None
+        assert not (tmp_path / 'junit.xml').exists()
@@ -0,0 +1,68 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from tests.utilities.single_flight import SingleFlight
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+class TestSingleFlight:
+    """Unit tests for coalescing concurrent calls per key"""
+    
+    def test_concurrent_callers_share_one_call(self):
+        """Test callers arriving while a call is in flight wait for and share its result"""
+        flight = SingleFlight()
+        release = threading.Event()
+        runs = []
+        
+        def fetch():
+            runs.append(1)
+            release.wait(5)
+            return {'id': 1}
+        
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [executor.submit(flight.do, 'posts/1', fetch) for _ in range(5)]
+            wait_for(lambda: flight.coalesced == 4)
+            release.set()
+            outcomes = [future.result(timeout=5) for future in futures]
+        
+        assert len(runs) == 1
+        assert all(result is outcomes[0][0] for result, _ in outcomes)
+        assert sorted(shared for _, shared in outcomes) == [False, True, True, True, True]
+        assert flight.stats() == {'calls': 1, 'coalesced': 4, 'saved_ratio': 0.8}
+    
+    def test_error_reaches_every_caller(self):
+        """Test the leader's exception is raised to the callers sharing its call"""
+        flight = SingleFlight()
+        release = threading.Event()
+        
+        def fail():
+            release.wait(5)
+            raise ConnectionError("reset")
+        
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(flight.do, 'key', fail) for _ in range(3)]
+            wait_for(lambda: flight.coalesced == 2)
+            release.set()
+            for future in futures:
+                with pytest.raises(ConnectionError, match="reset"):
+                    future.result(timeout=5)
+        
+        # The failed call is forgotten, so the next caller tries again
+        assert flight.do('key', lambda: 'ok') == ('ok', False)
+    
+    def test_nothing_is_cached(self):
+        """Test sequential calls, and calls with other keys, each run their own function"""
+        flight = SingleFlight()
+        assert flight.do('a', lambda: 1) == (1, False)
+        assert flight.do('a', lambda: 2) == (2, False)
+        assert flight.do(('b', 1), lambda: 3) == (3, False)
+        assert flight.stats() == {'calls': 3, 'coalesced': 0, 'saved_ratio': 0.0}
+        assert SingleFlight().stats()['saved_ratio'] == 0.0
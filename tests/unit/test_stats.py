@@ -0,0 +1,123 @@
+import random
+import statistics
+
+import pytest
+from tests.utilities import stats
+from tests.utilities.pytest_runner import RunResult
+from tests.utilities.results import FAILED, FLAKY, PASSED, SKIPPED, XFAILED, XPASSED, ResultRecord
+from tests.utilities.stats import aggregate, nearest_rank, summarize, summarize_records
+
+LABELS = {0: ('GET', '/posts'), 1: ('POST', '/posts')}
+
+class TestAggregate:
+    """Unit tests for per-group statistics, on both the NumPy and pure-Python paths"""
+    
+    @pytest.fixture(autouse=True, params=[True, False], ids=['numpy', 'python'])
+    def use_numpy(self, request, monkeypatch):
+        if request.param and not stats.HAS_NUMPY:
+            pytest.skip("NumPy is not installed")
+        monkeypatch.setattr(stats, 'HAS_NUMPY', request.param)
+        return request.param
+    
+    def test_group_statistics(self):
+        """Test counts, errors, mean, population stddev, extremes and nearest-rank percentiles"""
+        latencies = [0.4, 0.1, 0.3, 0.2, 5.0, 7.0]
+        codes = [0, 0, 0, 0, 1, 1]
+        ok = [True, False, True, True, True, False]
+        get, post = aggregate(codes, latencies, ok, LABELS, duration=2.0, percentiles=(50, 75, 100))
+        
+        assert (get.method, get.endpoint, get.count, get.errors) == ('GET', '/posts', 4, 1)
+        assert get.mean == pytest.approx(0.25)
+        assert get.stddev == pytest.approx(statistics.pstdev([0.1, 0.2, 0.3, 0.4]))
+        assert (get.min, get.max) == (0.1, 0.4)
+        assert get.percentiles == {'p50': 0.2, 'p75': 0.3, 'p100': 0.4}
+        assert get.throughput == pytest.approx(2.0)
+        assert get.error_rate == 0.25
+        assert (post.count, post.errors, post.percentiles['p50']) == (2, 1, 5.0)
+    
+    def test_throughput_over_each_groups_span(self):
+        """Test send times give each group its own span, first send to last completion"""
+        started = [0.0, 1.0, 3.0, 10.0, 10.5]
+        latencies = [0.5, 0.5, 1.0, 0.1, 0.4]
+        groups = aggregate([0, 0, 0, 1, 1], latencies, [True] * 5, LABELS, started=started)
+        assert groups[0].throughput == pytest.approx(3 / 4.0)
+        assert groups[1].throughput == pytest.approx(2 / 0.9)
+        
+        single = aggregate([0], [0.5], [True], LABELS)
+        assert single[0].throughput is None
+    
+    def test_matches_direct_computation(self):
+        """Test the statistics match a direct computation on random samples"""
+        rng = random.Random(3)
+        size = 3000
+        codes = [rng.randrange(5) for _ in range(size)]
+        latencies = [rng.expovariate(20) for _ in range(size)]
+        ok = [rng.random() > 0.05 for _ in range(size)]
+        started = [i / 100 for i in range(size)]
+        labels = {code: ('GET', f"/r{code}") for code in range(5)}
+        
+        groups = aggregate(codes, latencies, ok, labels, started=started)
+        for group in groups:
+            values = sorted(l for c, l in zip(codes, latencies) if labels[c][1] == group.endpoint)
+            assert group.count == len(values)
+            assert group.mean == pytest.approx(statistics.fmean(values))
+            assert group.stddev == pytest.approx(statistics.pstdev(values))
+            for p in (50, 90, 95, 99):
+                assert group.percentiles[f"p{p}"] == values[nearest_rank(len(values), p)]
+    
+    def test_empty_input(self):
+        """Test no samples give no groups, and summarize falls back to an empty group"""
+        assert aggregate([], [], [], LABELS) == []
+        empty = summarize([], [], 'GET', '/posts')
+        assert (empty.count, empty.mean, empty.throughput) == (0, 0.0, 0.0)
+        assert empty.percentiles == {'p50': 0.0, 'p90': 0.0, 'p95': 0.0, 'p99': 0.0}
+
+
+class TestNearestRank:
+    """Unit tests for the shared percentile rank"""
+    
+    def test_ranks(self):
+        """Test the index is ceil(n * p / 100) - 1, never below the first sample"""
+        assert nearest_rank(20, 50) == 9
+        assert nearest_rank(20, 95) == 18
+        assert nearest_rank(20, 100) == 19
+        assert nearest_rank(20, 0) == 0
+        assert nearest_rank(1, 99) == 0
+        assert all(nearest_rank(n, 100) == n - 1 for n in range(1, 50))
+
+
+class TestSummarizeRecords:
+    """Unit tests for run statistics built from test records"""
+    
+    def test_skips_are_neither_passed_nor_failed(self):
+        """Test skipped and xfailed tests are counted apart and left out of the success rate"""
+        records = [ResultRecord('a', status=PASSED), ResultRecord('b', status=SKIPPED),
+                   ResultRecord('c', status=XFAILED), ResultRecord('d', status=FLAKY),
+                   ResultRecord('e', status=XPASSED)]
+        stats = summarize_records(records)
+        assert (stats.total, stats.passed, stats.failed, stats.skipped) == (5, 2, 1, 2)
+        assert stats.success_rate == pytest.approx(200 / 3)
+        assert summarize_records([ResultRecord('a', status=PASSED),
+                                  ResultRecord('b', status=SKIPPED)]).success_rate == 100.0
+        result = RunResult(0, records, 1.0, {})
+        assert (result.passed, result.failed, result.skipped) == (1, 1, 2)
+        assert [record.skipped for record in records] == [False, True, True, False, False]
+    
+    def test_each_request_counts_for_its_own_endpoint(self):
+        """Test a test's requests are grouped by their own endpoint, errors by HTTP status"""
+        record = ResultRecord('test_mixed', status=FAILED)
+        record.add_request('GET', '/posts/1', 200, 0.1)
+        record.add_request('GET', '/users/2', 503, 0.2)
+        record.add_request('POST', '/photos', 201, 0.3)
+        restored = ResultRecord.from_dict(record.to_dict())
+        
+        stats = summarize_records([restored])
+        assert [(group.method, group.endpoint, group.count, group.errors) for group in stats.endpoints] == [
+            ('POST', '/photos', 1, 0), ('GET', '/posts/{id}', 1, 0), ('GET', '/users/{id}', 1, 1)]
+        assert (stats.requests.count, stats.requests.errors) == (3, 1)
+    
+    def test_records_without_calls_use_the_test_endpoint(self):
+        """Test records saved before requests were kept individually still aggregate"""
+        record = ResultRecord('old', status=FAILED, method='GET', endpoint='/posts/1', timings=[0.1, 0.2])
+        group, = summarize_records([record]).endpoints
+        assert (group.endpoint, group.count, group.errors) == ('/posts/{id}', 2, 2)
@@ -0,0 +1,127 @@
+import math
+import threading
+import time
+from typing import Dict, List, Optional
+
+from tests.utilities.latency import LatencyHistogram
+
+
+class AIMDLimiter:
+    """Additive-increase / multiplicative-decrease cap on in-flight requests
+
+    Completed requests are judged in windows of ``window`` samples. A window
+    whose p95 (or configured percentile) latency and error rate stay within
+    target raises the limit by ``increase``, as long as the limit was actually
+    reached; otherwise the limit is multiplied by ``backoff``. The decision
+    logic in ``record`` does not depend on threads. ``acquire``/``release``
+    gate worker threads, and an event-loop client needs its own gate around
+    the same ``limit``.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int, target_latency: float,
+                 max_error_rate: float, percentile: float = 95, window: int = 20,
+                 backoff: float = 0.7, increase: int = 1):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(max(initial, self.minimum), self.maximum)
+        self.target_latency = target_latency
+        self.max_error_rate = max_error_rate
+        self.percentile = percentile
+        self.window = window
+        self.backoff = backoff
+        self.increase = increase
+        self.in_flight = 0
+        self._saturated = False
+        self._condition = threading.Condition()
+        self._reset_window()
+
+    def _reset_window(self):
+        self.histogram = LatencyHistogram()
+        self.errors = 0
+        self.window_limit = self.limit
+        self.window_started = time.perf_counter()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Block until fewer than ``limit`` requests are in flight"""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.in_flight < self.limit, timeout):
+                return False
+            self.in_flight += 1
+            if self.in_flight >= self.limit:
+                self._saturated = True
+            return True
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    def record(self, latency: float, ok: bool) -> Optional[Dict]:
+        """Fold one completed request into the window; returns the window when it closes"""
+        with self._condition:
+            self.histogram.record(latency)
+            self.errors += not ok
+            if self.histogram.count < self.window:
+                return None
+
+            closed = self._close()
+            latency_p = closed['histogram'].percentile(self.percentile)
+            error_rate = closed['errors'] / closed['requests']
+            if latency_p > self.target_latency or error_rate > self.max_error_rate:
+                self.limit = max(self.minimum, math.floor(self.limit * self.backoff))
+            elif self._saturated:
+                # Only grow when the current limit was the bottleneck
+                self.limit = min(self.maximum, self.limit + self.increase)
+            self._saturated = False
+            self._condition.notify_all()
+            return closed
+
+    def flush(self) -> Optional[Dict]:
+        """Close a partly filled window at the end of a run, without adjusting the limit"""
+        with self._condition:
+            return self._close() if self.histogram.count else None
+
+    def _close(self) -> Dict:
+        closed = {
+            'concurrency': self.window_limit,
+            'histogram': self.histogram,
+            'requests': self.histogram.count,
+            'errors': self.errors,
+            'elapsed': time.perf_counter() - self.window_started,
+        }
+        self._reset_window()
+        return closed
+
+    @classmethod
+    def from_settings(cls, settings) -> 'AIMDLimiter':
+        """Limiter for a scenario's ``AdaptiveSettings``"""
+        return cls(settings.start, settings.minimum, settings.maximum, settings.target_latency,
+                   settings.max_error_rate, settings.percentile, settings.window,
+                   settings.backoff, settings.increase)
+
+
+def settled_point(stages: List, percentile: float = 95, tail: float = 0.5) -> Optional[Dict]:
+    """Concurrency and throughput an adaptive run settled at
+
+    Uses the last ``tail`` fraction of its windows, after the limiter has had
+    time to converge. The concurrency is the median limit there, the
+    throughput is requests over elapsed time across those windows. Latency
+    is reported at the limiter's ``percentile``, keyed like ``p95``.
+    """
+    if not stages:
+        return None
+    settled = stages[-max(1, math.ceil(len(stages) * tail)):]
+    limits = sorted(stage.concurrency for stage in settled)
+    elapsed = sum(stage.elapsed for stage in settled)
+    requests = sum(stage.requests for stage in settled)
+    histogram = LatencyHistogram()
+    for stage in settled:
+        histogram.merge(stage.histogram)
+    return {
+        'concurrency': limits[len(limits) // 2],
+        'throughput': requests / elapsed if elapsed else 0.0,
+        'percentile': percentile,
+        f"p{percentile:g}": histogram.percentile(percentile),
+        'error_rate': sum(stage.errors for stage in settled) / requests if requests else 0.0,
+        'windows': len(settled),
+    }
@@ -1,20 +1,236 @@
 
+import contextlib
 import requests
+import socket
+import statistics
+import threading
 import time
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urljoin, urlsplit
 from config.test_config import APITestConfig
+from tests.utilities.bandwidth import TransferSizes, measure_transfer
+from tests.utilities.live_metrics import get_active_registry
+from tests.utilities.profiling import get_active_profiler, phase
+from tests.utilities.pytest_runner import get_active_collector
+from tests.utilities.results import normalize_endpoint
+from tests.utilities.single_flight import SingleFlight
+from tests.utilities.transports import create_transport
+
+# Requests safe to share between concurrent callers
+COALESCED_METHODS = ('GET', 'HEAD')
+
+
+class RequestSpec:
+    """One request in a batch"""
+    
+    __slots__ = ('method', 'endpoint', 'params', 'data')
+    
+    def __init__(self, method: str, endpoint: str, params: Optional[Dict] = None,
+                 data: Optional[Dict] = None):
+        self.method = method.upper()
+        self.endpoint = endpoint
+        self.params = params
+        self.data = data
+    
+    @classmethod
+    def coerce(cls, spec: Union['RequestSpec', str, tuple]) -> 'RequestSpec':
+        """Accept a RequestSpec, a bare endpoint (GET) or a (method, endpoint[, params[, data]]) tuple"""
+        if isinstance(spec, cls):
+            return spec
+        if isinstance(spec, str):
+            return cls('GET', spec)
+        return cls(*spec)
+    
+    def __repr__(self):
+        return f"RequestSpec({self.method} {self.endpoint})"
+
+
+class BatchResult:
+    """Outcome of one batched request: the response, or the error that replaced it"""
+    
+    __slots__ = ('spec', 'response', 'error', 'started', 'elapsed')
+    
+    def __init__(self, spec: RequestSpec, response=None, error: Optional[Exception] = None,
+                 started: float = 0.0, elapsed: float = 0.0):
+        self.spec = spec
+        self.response = response
+        self.error = error
+        self.started = started
+        self.elapsed = elapsed
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+    
+    @property
+    def status_code(self) -> int:
+        return self.response.status_code if self.response is not None else 0
+
+
+class WarmUpResult:
+    """Cold-start cost paid by warm_up() before any timed request
+    
+    ``dns`` times a separate lookup of the host made before the first
+    request; the request resolves the host again, usually from the OS cache.
+    """
+    
+    __slots__ = ('base_url', 'dns', 'cold_latency', 'warm_latency', 'connections', 'discarded')
+    
+    def __init__(self, base_url: str, dns: float, cold_latency: float, warm_latency: float,
+                 connections: int, discarded: int):
+        self.base_url = base_url
+        self.dns = dns
+        self.cold_latency = cold_latency
+        self.warm_latency = warm_latency
+        self.connections = connections
+        self.discarded = discarded
+    
+    @property
+    def cold_penalty(self) -> float:
+        """Extra seconds the first request paid for connect and TLS, plus its own lookup"""
+        return max(0.0, self.cold_latency - self.warm_latency)
+    
+    def to_dict(self) -> Dict:
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data['cold_penalty'] = self.cold_penalty
+        return data
+
+
+PAGINATION_STYLES = ('page', 'range', 'link')
+
+
+class Paginator:
+    """Lazy iterator over every item of a paginated collection
+    
+    ``style`` 'page' requests ``_page``/``_limit``, 'range' requests
+    ``_start``/``_end``, and 'link' follows the Link header's ``rel="next"``
+    from a first ``_page`` request. Iteration stops at a short page, at the
+    server's ``X-Total-Count`` or when there is no next link. A page longer
+    than ``page_size`` or starting with the previous page's first id means
+    the server ignores the paging parameters, and raises RuntimeError. With
+    ``prefetch`` the next page is requested while the caller works through
+    the current one, so only two pages are ever held in memory.
+    """
+    
+    def __init__(self, client: 'APITestClient', endpoint: str, params: Optional[Dict] = None,
+                 page_size: Optional[int] = None, style: Optional[str] = None,
+                 prefetch: Optional[bool] = None):
+        self.client = client
+        self.endpoint = endpoint
+        self.params = dict(params or {})
+        self.page_size = page_size or APITestConfig.PAGE_SIZE
+        self.style = style or APITestConfig.PAGINATION_STYLE
+        if self.style not in PAGINATION_STYLES:
+            raise ValueError(f"Unknown pagination style '{self.style}'; choose from {', '.join(PAGINATION_STYLES)}")
+        self.prefetch = APITestConfig.PAGINATION_PREFETCH if prefetch is None else prefetch
+        self.total: Optional[int] = None
+        self.pages = 0
+        self.items = 0
+    
+    def _page_request(self, index: int) -> Tuple[str, Dict]:
+        """URL and params of the 0-based page ``index``"""
+        if self.style == 'range':
+            start = index * self.page_size
+            paging = {'_start': start, '_end': start + self.page_size}
+        else:
+            paging = {'_page': index + 1, '_limit': self.page_size}
+        return f"{self.client.base_url}{self.endpoint}", dict(self.params, **paging)
+    
+    def _next_request(self, response, received: int) -> Optional[Tuple[str, Optional[Dict]]]:
+        if self.style == 'link':
+            link = response.links.get('next')
+            return (urljoin(str(response.url), link['url']), None) if link else None
+        if received < self.page_size or (self.total is not None and self.items + received >= self.total):
+            return None
+        return self._page_request(self.pages + 1)
+    
+    def _fetch(self, request: Tuple[str, Optional[Dict]]):
+        url, params = request
+        response = self.client._make_request('GET', url, params=params)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} returned {response.status_code} on page {self.pages + 1}")
+        return response
+    
+    def __iter__(self) -> Iterator[Dict]:
+        executor = ThreadPoolExecutor(max_workers=1) if self.prefetch else None
+        request = self._page_request(0)
+        pending = None
+        previous_id = None
+        try:
+            while request is not None:
+                response = pending.result() if pending is not None else self._fetch(request)
+                page = response.json()
+                # Without these checks a server that ignores paging would be requested forever
+                if self.style != 'link' and len(page) > self.page_size:
+                    raise RuntimeError(f"GET {self.endpoint} returned {len(page)} items on page {self.pages + 1}, "
+                                       f"more than page_size {self.page_size}; the server ignores paging")
+                first_id = page[0].get('id') if page and isinstance(page[0], dict) else None
+                if first_id is not None and first_id == previous_id:
+                    raise RuntimeError(f"GET {self.endpoint} page {self.pages + 1} repeats page {self.pages}; "
+                                       f"the server ignores paging")
+                previous_id = first_id
+                total = response.headers.get('x-total-count')
+                if total is not None and total.isdigit():
+                    self.total = int(total)
+                request = self._next_request(response, len(page))
+                self.pages += 1
+                pending = executor.submit(self._fetch, request) if executor and request else None
+                for item in page:
+                    self.items += 1
+                    yield item
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
 
 class APITestClient:
     """Reusable API client for testing"""
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'User-Agent': 'API-Test-Suite/2.0'
-        })
-        self.base_url = APITestConfig.BASE_URL
+    def __init__(self, transport=None, base_url: Optional[str] = None,
+                 single_flight: Optional[bool] = None, retries: Optional[int] = None):
+        self.base_url = base_url or APITestConfig.BASE_URL
+        self.transport = transport or create_transport(base_url=self.base_url)
+        self.session = self.transport.session
         self.timeout = APITestConfig.TIMEOUT
+        # Attempts per request, the first included
+        self.retries = APITestConfig.MAX_RETRIES if retries is None else retries
+        self.cold_start: Optional[WarmUpResult] = None
+        enabled = APITestConfig.SINGLE_FLIGHT if single_flight is None else single_flight
+        self.single_flight: Optional[SingleFlight] = SingleFlight() if enabled else None
+        # Requests a thread sends inside _not_recorded() skip metrics and the collector
+        self._local = threading.local()
+        self._single_flight_suspended = 0
+        self._suspend_lock = threading.Lock()
+    
+    def close(self):
+        """Close the transport's pooled connections"""
+        self.transport.close()
+    
+    @property
+    def _recording(self) -> bool:
+        return getattr(self._local, 'recording', True)
+    
+    @contextlib.contextmanager
+    def _not_recorded(self):
+        """Keep requests sent from this thread out of live metrics and the result collector"""
+        previous = self._recording
+        self._local.recording = False
+        try:
+            yield
+        finally:
+            self._local.recording = previous
+    
+    @contextlib.contextmanager
+    def suspend_single_flight(self):
+        """Send every request on its own while the block runs, e.g. while generating load"""
+        with self._suspend_lock:
+            self._single_flight_suspended += 1
+        try:
+            yield self
+        finally:
+            with self._suspend_lock:
+                self._single_flight_suspended -= 1
     
     def get(self, endpoint: str, params: Optional[Dict] = None) -> requests.Response:
         """GET request with error handling"""
@@ -41,15 +257,159 @@ class APITestClient:
         url = f"{self.base_url}{endpoint}"
         return self._make_request('DELETE', url)
     
+    def request(self, method: str, endpoint: str, params: Optional[Dict] = None,
+                data: Optional[Dict] = None) -> requests.Response:
+        """Generic request used by load plans and batch helpers"""
+        url = f"{self.base_url}{endpoint}"
+        return self._make_request(method.upper(), url, params=params, json=data)
+    
+    def paginate(self, endpoint: str, params: Optional[Dict] = None, page_size: Optional[int] = None,
+                 style: Optional[str] = None, prefetch: Optional[bool] = None) -> Paginator:
+        """Iterate a collection page by page instead of fetching it in one response"""
+        return Paginator(self, endpoint, params, page_size, style, prefetch)
+    
+    def batch(self, specs: Iterable[Union[RequestSpec, str, tuple]],
+              max_concurrency: Optional[int] = None) -> List[BatchResult]:
+        """Send requests concurrently over the pooled connections
+        
+        Results come back in input order. A request that still fails after
+        retries is reported in its ``BatchResult.error`` instead of raising, so
+        one bad item does not hide the others.
+        """
+        specs = [RequestSpec.coerce(spec) for spec in specs]
+        max_concurrency = max_concurrency or APITestConfig.BATCH_MAX_CONCURRENCY
+        # Worker threads inherit whether the calling thread records its requests
+        recording = self._recording
+        
+        def send(spec: RequestSpec) -> BatchResult:
+            started = time.perf_counter()
+            try:
+                with contextlib.nullcontext() if recording else self._not_recorded():
+                    response = self.request(spec.method, spec.endpoint, params=spec.params, data=spec.data)
+                return BatchResult(spec, response, None, started, time.perf_counter() - started)
+            except Exception as e:
+                return BatchResult(spec, None, e, started, time.perf_counter() - started)
+        
+        if len(specs) <= 1 or max_concurrency <= 1:
+            return [send(spec) for spec in specs]
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(specs))) as executor:
+            return list(executor.map(send, specs))
+    
+    def warm_up(self, connections: Optional[int] = None, discard: Optional[int] = None,
+                endpoint: Optional[str] = None) -> WarmUpResult:
+        """Time a DNS lookup, open pooled connections and drop the first samples
+        
+        The host is looked up once on its own to time DNS; the result is not
+        reused. The first request pays for TCP connect and the TLS handshake;
+        it is kept as the cold-start metric instead of counting against timed
+        checks. ``connections`` concurrent requests then fill the pool and
+        ``discard`` more are sent and thrown away. Nothing sent here reaches
+        live metrics or the pytest result collector.
+        """
+        connections = APITestConfig.WARM_UP_CONNECTIONS if connections is None else connections
+        discard = APITestConfig.WARM_UP_DISCARD if discard is None else discard
+        endpoint = endpoint or APITestConfig.WARM_UP_ENDPOINT
+        
+        split = urlsplit(self.base_url)
+        started = time.perf_counter()
+        try:
+            socket.getaddrinfo(split.hostname, split.port or (443 if split.scheme == 'https' else 80),
+                               type=socket.SOCK_STREAM)
+        except OSError:
+            pass  # The first request reports the failure with more context
+        dns = time.perf_counter() - started
+        
+        # Priming the pool needs every request to go out on its own
+        with self._not_recorded(), self.suspend_single_flight():
+            started = time.perf_counter()
+            self.get(endpoint).content
+            cold_latency = time.perf_counter() - started
+            
+            if connections > 1:
+                for result in self.batch([endpoint] * connections, max_concurrency=connections):
+                    if result.error is not None:
+                        raise result.error
+            
+            samples = []
+            for _ in range(discard):
+                started = time.perf_counter()
+                self.get(endpoint).content
+                samples.append(time.perf_counter() - started)
+        
+        self.cold_start = WarmUpResult(self.base_url, dns, cold_latency,
+                                       statistics.median(samples) if samples else cold_latency,
+                                       max(connections, 1), discard)
+        collector = get_active_collector()
+        if collector is not None:
+            collector.record_cold_start(self.cold_start)
+        return self.cold_start
+    
     def _make_request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Make HTTP request, sharing an identical in-flight GET when single-flight is on"""
+        if (self.single_flight is None or self._single_flight_suspended
+                or method not in COALESCED_METHODS or kwargs.get('json') is not None):
+            return self._send(method, url, **kwargs)
+        
+        params = kwargs.get('params')
+        key = (method, url, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())))
+        started = time.perf_counter()
+        response, shared = self.single_flight.do(key, lambda: self._send_shared(method, url, **kwargs))
+        if shared:
+            self._after_coalesced(method, url, started)
+        return response
+    
+    def _send_shared(self, method: str, url: str, **kwargs) -> requests.Response:
+        response = self._send(method, url, **kwargs)
+        response.content  # Read the body once, before other threads get the response
+        return response
+    
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
         """Make HTTP request with retry logic"""
-        for attempt in range(APITestConfig.MAX_RETRIES):
+        started = time.perf_counter()
+        for attempt in range(self.retries):
             try:
-                response = self.session.request(
-                    method, url, timeout=self.timeout, **kwargs
-                )
+                with phase('network'):
+                    response = self.transport.request(
+                        method, url, timeout=self.timeout, **kwargs
+                    )
+                profiler = get_active_profiler()
+                if profiler is not None:
+                    profiler.instrument_response(response)
+                self._after_request(method, url, started, response.status_code, attempt,
+                                    sizes=measure_transfer(response), response=response)
                 return response
-            except requests.exceptions.RequestException as e:
-                if attempt == APITestConfig.MAX_RETRIES - 1:
+            except self.transport.errors as e:
+                if attempt == self.retries - 1:
+                    self._after_request(method, url, started, 0, attempt, e)
                     raise e
-                time.sleep(1)  # Wait before retry
\ No newline at end of file
+                time.sleep(1)  # Wait before retry
+    
+    def _after_coalesced(self, method: str, url: str, started: float):
+        """Report a request answered by another caller's identical in-flight request"""
+        if not self._recording:
+            return
+        collector = get_active_collector()
+        if collector is not None:
+            path = url[len(self.base_url):].split('?')[0] if url.startswith(self.base_url) else url
+            collector.record_coalesced(method, path, time.perf_counter() - started)
+    
+    def _after_request(self, method: str, url: str, started: float, status: int,
+                       retries: int, error: Optional[Exception] = None,
+                       sizes: Optional[TransferSizes] = None, response=None):
+        """Report a finished request to live metrics and the pytest result collector"""
+        if not self._recording:
+            return
+        registry = get_active_registry()
+        collector = get_active_collector()
+        if registry is None and collector is None:
+            return
+        
+        elapsed = time.perf_counter() - started
+        path = url[len(self.base_url):].split('?')[0] if url.startswith(self.base_url) else url
+        if registry is not None:
+            registry.record(method, normalize_endpoint(path), elapsed,
+                            error is None and status < 500)
+        if collector is not None:
+            collector.record_request(method, path, status, elapsed, retries,
+                                     str(error) if error else None, sizes)
+            collector.capture_response(method, url, elapsed, response, str(error) if error else None)
@@ -0,0 +1,268 @@
+import gzip
+import hashlib
+import importlib.util
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config.test_config import APITestConfig
+
+HAS_ZSTD = importlib.util.find_spec('zstandard') is not None
+
+MANIFEST_FILE = 'manifest.jsonl'
+SUMMARIES_FILE = 'summaries.jsonl'
+
+
+def _codec(name: str):
+    """(extension, compress, decompress) for a codec name"""
+    if name == 'zstd':
+        import zstandard
+        return ('.zst', zstandard.ZstdCompressor(level=10).compress,
+                zstandard.ZstdDecompressor().decompress)
+    return '.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0), gzip.decompress
+
+
+class ArtifactEntry:
+    """One report file of a run, pointing at a compressed, content-addressed blob"""
+
+    __slots__ = ('run_id', 'kind', 'name', 'sha256', 'size', 'stored_size', 'codec', 'source', 'created')
+
+    def __init__(self, run_id: str, kind: str, name: str, sha256: str, size: int, stored_size: int,
+                 codec: str, source: Optional[str] = None, created: Optional[float] = None):
+        self.run_id = run_id
+        self.kind = kind
+        self.name = name
+        self.sha256 = sha256
+        self.size = size
+        self.stored_size = stored_size
+        self.codec = codec
+        self.source = source
+        self.created = created if created is not None else time.time()
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ArtifactEntry':
+        return cls(**{name: data[name] for name in cls.__slots__ if name in data})
+
+
+class ArtifactStore:
+    """Compressed, deduplicated archive of report artifacts with a run manifest
+
+    Blobs live under ``blobs/<aa>/<sha256><ext>``, keyed by the hash of the
+    uncompressed content, so identical reports, assets and payload snapshots
+    are stored once. ``manifest.jsonl`` lists every artifact of every retained
+    run; runs dropped by the retention policy leave one row in ``summaries.jsonl``.
+    """
+
+    def __init__(self, root: Optional[str] = None, codec: Optional[str] = None):
+        self.root = root or APITestConfig.ARTIFACTS_DIR
+        codec = codec or APITestConfig.ARTIFACT_COMPRESSION
+        if codec == 'auto':
+            codec = 'zstd' if HAS_ZSTD else 'gzip'
+        self.codec = codec
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.root, MANIFEST_FILE)
+
+    @property
+    def summaries_path(self) -> str:
+        return os.path.join(self.root, SUMMARIES_FILE)
+
+    def _blob_path(self, sha256: str, codec: str) -> str:
+        extension = _codec(codec)[0]
+        return os.path.join(self.root, 'blobs', sha256[:2], sha256 + extension)
+
+    def put_bytes(self, data: bytes, run_id: str, kind: str, name: str,
+                  source: Optional[str] = None) -> ArtifactEntry:
+        """Store ``data`` (once per distinct content) and record it in the manifest"""
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(sha256, self.codec)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(_codec(self.codec)[1](data))
+            os.replace(tmp_path, path)
+        entry = ArtifactEntry(run_id, kind, name, sha256, len(data), os.path.getsize(path),
+                              self.codec, source)
+        with open(self.manifest_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry.to_dict()) + "\n")
+        return entry
+
+    def put_file(self, path: str, run_id: str, kind: str, name: Optional[str] = None) -> ArtifactEntry:
+        with open(path, 'rb') as f:
+            data = f.read()
+        return self.put_bytes(data, run_id, kind, name or os.path.basename(path), source=path)
+
+    def put_json(self, payload, run_id: str, kind: str, name: str) -> ArtifactEntry:
+        """Snapshot a JSON-serialisable payload; key order is normalised so equal payloads dedupe"""
+        data = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        return self.put_bytes(data, run_id, kind, name)
+
+    def put_run(self, run_id: str, paths, summary: Optional[Dict] = None) -> List[ArtifactEntry]:
+        """Archive a run's report files
+
+        ``paths`` maps kind -> path, or is a list of (kind, path) pairs when a
+        kind has several files; missing paths are skipped.
+        """
+        pairs = paths.items() if isinstance(paths, dict) else paths
+        entries = [
+            self.put_file(path, run_id, kind)
+            for kind, path in pairs if path and os.path.isfile(path)
+        ]
+        if summary is not None:
+            entries.append(self.put_json(summary, run_id, 'summary', 'summary.json'))
+        return entries
+
+    def read(self, entry: ArtifactEntry) -> bytes:
+        with open(self._blob_path(entry.sha256, entry.codec), 'rb') as f:
+            return _codec(entry.codec)[2](f.read())
+
+    def extract(self, entry: ArtifactEntry, path: str) -> str:
+        """Write an artifact back out uncompressed, e.g. to open it in a browser"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(self.read(entry))
+        return path
+
+    def entries(self) -> List[ArtifactEntry]:
+        if not os.path.exists(self.manifest_path):
+            return []
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return [ArtifactEntry.from_dict(json.loads(line)) for line in f if line.strip()]
+
+    def runs(self) -> Dict[str, List[ArtifactEntry]]:
+        """Manifest entries grouped by run, oldest run first"""
+        runs: Dict[str, List[ArtifactEntry]] = {}
+        for entry in sorted(self.entries(), key=lambda entry: entry.created):
+            runs.setdefault(entry.run_id, []).append(entry)
+        return runs
+
+    def summaries(self) -> List[Dict]:
+        if not os.path.exists(self.summaries_path):
+            return []
+        with open(self.summaries_path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def _run_summary(self, run_id: str, entries: List[ArtifactEntry]) -> Dict:
+        row = {
+            'run_id': run_id,
+            'created': min(entry.created for entry in entries),
+            'artifacts': len(entries),
+            'size': sum(entry.size for entry in entries),
+        }
+        for entry in entries:
+            if entry.kind == 'summary':
+                try:
+                    row.update(json.loads(self.read(entry)))
+                except (OSError, ValueError):
+                    pass
+        return row
+
+    def apply_retention(self, keep_runs: Optional[int] = None, max_age_days: Optional[float] = None,
+                        keep_run: Optional[str] = None, prune_originals: bool = False) -> List[str]:
+        """Compact runs beyond the newest ``keep_runs`` or older than ``max_age_days``
+
+        Compacted runs are rolled into one summary row each, dropped from the
+        manifest, and blobs no retained run references are deleted. With
+        ``prune_originals`` their loose report files are deleted as well. The
+        newest run (or ``keep_run``) is always retained. Returns the compacted
+        run ids.
+        """
+        keep_runs = APITestConfig.ARTIFACT_KEEP_RUNS if keep_runs is None else keep_runs
+        max_age_days = APITestConfig.ARTIFACT_MAX_AGE_DAYS if max_age_days is None else max_age_days
+
+        runs = self.runs()
+        run_ids = list(runs)
+        if not run_ids:
+            return []
+        cutoff = time.time() - max_age_days * 86400 if max_age_days else None
+        protected = keep_run or run_ids[-1]
+        newest = set(run_ids[-keep_runs:]) if keep_runs > 0 else set()
+        expired = [
+            run_id for run_id in run_ids
+            if run_id != protected and (
+                run_id not in newest
+                or (cutoff is not None and max(entry.created for entry in runs[run_id]) < cutoff)
+            )
+        ]
+        if not expired:
+            return []
+        # Prune while the manifest still lists the compacted runs' files
+        if prune_originals:
+            self.prune_originals(expired)
+
+        with open(self.summaries_path, 'a', encoding='utf-8') as f:
+            for run_id in expired:
+                f.write(json.dumps(self._run_summary(run_id, runs[run_id])) + "\n")
+
+        retained = [entry for run_id in run_ids if run_id not in expired for entry in runs[run_id]]
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in retained:
+                f.write(json.dumps(entry.to_dict()) + "\n")
+        os.replace(tmp_path, self.manifest_path)
+
+        referenced = {self._blob_path(entry.sha256, entry.codec) for entry in retained}
+        for run_id in expired:
+            for entry in runs[run_id]:
+                path = self._blob_path(entry.sha256, entry.codec)
+                if path not in referenced and os.path.exists(path):
+                    os.remove(path)
+        return expired
+
+    def prune_originals(self, run_ids: List[str]) -> int:
+        """Delete the loose report files of ``run_ids`` now that they are archived
+
+        Shared assets and files another run in the manifest still lists (e.g.
+        reports overwritten in place) are kept, and a file is only removed
+        while its content still matches the archived blob.
+        """
+        entries = self.entries()
+        in_use = {entry.source for entry in entries if entry.run_id not in run_ids}
+        removed = 0
+        for entry in entries:
+            path = entry.source
+            if entry.run_id not in run_ids or entry.kind == 'asset' or path in in_use:
+                continue
+            if not path or not os.path.isfile(path) or os.path.getsize(path) != entry.size:
+                continue
+            with open(path, 'rb') as f:
+                if hashlib.sha256(f.read()).hexdigest() != entry.sha256:
+                    continue
+            os.remove(path)
+            removed += 1
+        return removed
+
+
+def archive_run(run_id: str, paths, summary: Optional[Dict] = None,
+                store: Optional[ArtifactStore] = None) -> ArtifactStore:
+    """Archive a run and apply the retention policy, pruning compacted runs' loose files"""
+    store = store or ArtifactStore()
+    store.put_run(run_id, paths, summary)
+    store.apply_retention(keep_run=run_id, prune_originals=APITestConfig.ARTIFACT_PRUNE_ORIGINALS)
+    return store
+
+
+def run_summary(result) -> Dict:
+    """Summary row kept for a RunResult after its artifacts are compacted"""
+    return {
+        'exit_code': result.exit_code,
+        'duration': result.duration,
+        'passed': result.passed,
+        'failed': result.failed,
+        'skipped': result.skipped,
+        'flaky': result.flaky,
+    }
+
+
+def asset_paths(directory: str) -> List[Tuple[str, str]]:
+    """('asset', path) pairs for a shared assets directory, to archive with the reports using it"""
+    if not os.path.isdir(directory):
+        return []
+    return [('asset', os.path.join(directory, name)) for name in sorted(os.listdir(directory))
+            if os.path.isfile(os.path.join(directory, name))]
@@ -0,0 +1,145 @@
+import threading
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit
+
+# Content-Encoding values that mean the body crossed the wire compressed
+COMPRESSED_ENCODINGS = ('gzip', 'br', 'deflate', 'zstd', 'compress')
+
+
+class TransferSizes:
+    """Bytes one request/response pair put on the wire, and what the body decoded to"""
+
+    __slots__ = ('request_bytes', 'response_bytes', 'response_body_bytes', 'decoded_bytes', 'encoding')
+
+    def __init__(self, request_bytes: int, response_bytes: int, response_body_bytes: int,
+                 decoded_bytes: int, encoding: str = ''):
+        self.request_bytes = request_bytes
+        self.response_bytes = response_bytes
+        self.response_body_bytes = response_body_bytes
+        self.decoded_bytes = decoded_bytes
+        self.encoding = encoding
+
+    @property
+    def compressed(self) -> bool:
+        return any(coding in COMPRESSED_ENCODINGS for coding in self.encoding.split(','))
+
+    def to_dict(self) -> Dict:
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data['compressed'] = self.compressed
+        return data
+
+
+def _header_bytes(headers) -> int:
+    return sum(len(name) + len(str(value)) + 4 for name, value in headers.items()) + 2
+
+
+def measure_transfer(response) -> TransferSizes:
+    """Wire and decoded sizes of a fully read ``requests`` or ``httpx`` response
+
+    Header sizes are reconstructed from the HTTP/1.1 framing; over HTTP/2
+    they are HPACK-compressed on the wire, so header bytes are an upper
+    bound there. The response body's wire size comes from the bytes read off
+    the socket, which are still compressed when a Content-Encoding was
+    negotiated.
+    """
+    if hasattr(response, 'num_bytes_downloaded'):
+        return _measure_httpx(response)
+    request = response.request
+    body = request.body or b''
+    host = urlsplit(request.url).netloc
+    request_bytes = (len(f"{request.method} {request.path_url} HTTP/1.1\r\n") +
+                     len(f"Host: {host}\r\n") + _header_bytes(request.headers) +
+                     len(body.encode('utf-8') if isinstance(body, str) else body))
+
+    decoded_bytes = len(response.content)
+    try:
+        body_bytes = response.raw.tell()
+    except (AttributeError, OSError, ValueError):
+        body_bytes = 0
+    if not body_bytes:
+        body_bytes = int(response.headers.get('Content-Length') or decoded_bytes)
+    status_line = len(f"HTTP/1.1 {response.status_code} {response.reason or ''}\r\n")
+    response_bytes = status_line + _header_bytes(response.headers) + body_bytes
+
+    encoding = response.headers.get('Content-Encoding', '').lower().replace(' ', '')
+    return TransferSizes(request_bytes, response_bytes, body_bytes, decoded_bytes, encoding)
+
+
+def _measure_httpx(response) -> TransferSizes:
+    request = response.request
+    # httpx already carries Host in the request headers
+    request_bytes = (len(f"{request.method} ") + len(request.url.raw_path) + len(" HTTP/1.1\r\n") +
+                     _header_bytes(request.headers) + len(request.content))
+
+    decoded_bytes = len(response.content)
+    body_bytes = response.num_bytes_downloaded or decoded_bytes
+    status_line = len(f"HTTP/1.1 {response.status_code} {response.reason_phrase}\r\n")
+    response_bytes = status_line + _header_bytes(response.headers) + body_bytes
+
+    encoding = response.headers.get('Content-Encoding', '').lower().replace(' ', '')
+    return TransferSizes(request_bytes, response_bytes, body_bytes, decoded_bytes, encoding)
+
+
+class EndpointBandwidth:
+    """Byte totals for one method/endpoint pair"""
+
+    __slots__ = ('method', 'endpoint', 'requests', 'request_bytes', 'response_bytes',
+                 'decoded_bytes', 'compressed', 'max_response_bytes')
+
+    def __init__(self, method: str, endpoint: str):
+        self.method = method
+        self.endpoint = endpoint
+        self.requests = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.decoded_bytes = 0
+        self.compressed = 0
+        self.max_response_bytes = 0
+
+    def add(self, sizes: TransferSizes):
+        self.requests += 1
+        self.request_bytes += sizes.request_bytes
+        self.response_bytes += sizes.response_bytes
+        self.decoded_bytes += sizes.decoded_bytes
+        self.compressed += sizes.compressed
+        self.max_response_bytes = max(self.max_response_bytes, sizes.response_bytes)
+
+    @property
+    def compression_ratio(self) -> float:
+        """Decoded bytes per wire byte; 1.0 means nothing was saved"""
+        return self.decoded_bytes / self.response_bytes if self.response_bytes else 0.0
+
+    def to_dict(self) -> Dict:
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data['compression_ratio'] = self.compression_ratio
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'EndpointBandwidth':
+        totals = cls(data['method'], data['endpoint'])
+        for name in cls.__slots__[2:]:
+            setattr(totals, name, data[name])
+        return totals
+
+
+class BandwidthTracker:
+    """Thread-safe per-endpoint bandwidth accounting"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[Tuple[str, str], EndpointBandwidth] = {}
+
+    def record(self, method: str, endpoint: str, sizes: TransferSizes):
+        with self._lock:
+            totals = self._endpoints.get((method, endpoint))
+            if totals is None:
+                totals = self._endpoints[(method, endpoint)] = EndpointBandwidth(method, endpoint)
+            totals.add(sizes)
+
+    def endpoints(self) -> List[EndpointBandwidth]:
+        """Per-endpoint totals, heaviest transfer first"""
+        with self._lock:
+            return sorted(self._endpoints.values(), key=lambda totals: -totals.response_bytes)
+
+    def to_dict(self) -> List[Dict]:
+        return [totals.to_dict() for totals in self.endpoints()]
@@ -0,0 +1,217 @@
+import collections
+import datetime
+import gzip
+import json
+import os
+import random
+import threading
+from typing import Dict, List, Optional
+
+from config.test_config import APITestConfig
+from tests.utilities.latency import LatencyHistogram
+
+# Why a full capture was written to disk
+FAILED_REQUEST = 'failed_request'
+SLOW_REQUEST = 'slow_request'
+FAILED_TEST = 'failed_test'
+
+# Characters of a spilled capture shown inline in HTML reports
+PREVIEW_CHARS = 4000
+
+
+def _headers(headers) -> Dict[str, str]:
+    return {str(name): str(value) for name, value in (headers or {}).items()}
+
+
+def _text(body, limit: int) -> Dict:
+    """Body as text, cut at ``limit`` bytes"""
+    if body is None:
+        return {'body': None, 'body_bytes': 0, 'truncated': False}
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    return {'body': bytes(body[:limit]).decode('utf-8', errors='replace'),
+            'body_bytes': len(body), 'truncated': len(body) > limit}
+
+
+class CaptureStore:
+    """Bounded request/response capture for failure diagnostics
+
+    Full payloads are kept only where they help debugging: requests that
+    raised or got a 5xx, requests slower than the running ``slow_percentile`` latency, and
+    the last ``pending_per_test`` requests of a test that goes on to fail.
+    Those are written to disk as gzipped JSON and only a small index entry
+    stays in memory. Every other request contributes to a fixed-size,
+    uniformly sampled set of headers-only records. Memory therefore stays flat
+    however long the run is: bodies are cut at ``max_body_bytes`` and at most
+    ``max_spilled`` captures are written.
+    """
+
+    def __init__(self, directory: Optional[str] = None, slow_percentile: Optional[float] = None,
+                 min_samples: Optional[int] = None, sample_size: Optional[int] = None,
+                 max_body_bytes: Optional[int] = None, max_spilled: Optional[int] = None,
+                 pending_per_test: Optional[int] = None, seed: Optional[int] = None):
+        self.directory = directory or os.path.join(
+            APITestConfig.CAPTURE_DIR, f"run_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        self.slow_percentile = slow_percentile or APITestConfig.CAPTURE_SLOW_PERCENTILE
+        self.min_samples = APITestConfig.CAPTURE_MIN_SAMPLES if min_samples is None else min_samples
+        self.sample_size = APITestConfig.CAPTURE_SAMPLE_SIZE if sample_size is None else sample_size
+        self.max_body_bytes = max_body_bytes or APITestConfig.CAPTURE_MAX_BODY_BYTES
+        self.max_spilled = APITestConfig.CAPTURE_MAX_SPILLED if max_spilled is None else max_spilled
+        pending_per_test = (APITestConfig.CAPTURE_PENDING_PER_TEST
+                            if pending_per_test is None else pending_per_test)
+
+        self.latency = LatencyHistogram()
+        self.seen = 0
+        self.samples: List[Dict] = []
+        self.spilled: List[Dict] = []
+        self.dropped = 0
+        self._pending: collections.deque = collections.deque(maxlen=pending_per_test)
+        self._by_test: Dict[str, List[Dict]] = collections.defaultdict(list)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def capture(self, method: str, url: str, elapsed: float, response=None,
+                error: Optional[str] = None, test: Optional[str] = None):
+        """Record one finished request; ``response`` is None when it raised"""
+        status = response.status_code if response is not None else 0
+        with self._lock:
+            threshold = (self.latency.percentile(self.slow_percentile)
+                         if self.latency.count >= self.min_samples else None)
+            self.latency.record(elapsed)
+            self.seen += 1
+
+        summary = {'test': test, 'method': method, 'url': url, 'status': status,
+                   'elapsed': elapsed, 'error': error}
+        # A 4xx is often what a negative test expects; it is kept only if the test fails
+        if error is not None or status >= 500:
+            self._spill(self._full(summary, response), FAILED_REQUEST)
+        elif threshold is not None and elapsed > threshold:
+            self._spill(self._full(summary, response), SLOW_REQUEST)
+        else:
+            with self._lock:
+                if test is not None and self._pending.maxlen:
+                    self._pending.append((summary, response))
+                self._sample(summary, response)
+
+    def _sample(self, summary: Dict, response):
+        """Reservoir sampling: every request so far is equally likely to be kept"""
+        slot = len(self.samples) if len(self.samples) < self.sample_size else self._random.randrange(self.seen)
+        if slot < self.sample_size:
+            record = dict(summary, response_headers=_headers(getattr(response, 'headers', None)))
+            if slot == len(self.samples):
+                self.samples.append(record)
+            else:
+                self.samples[slot] = record
+
+    def _full(self, summary: Dict, response) -> Dict:
+        full = dict(summary)
+        if response is not None:
+            request = response.request
+            body = getattr(request, 'body', None)
+            if body is None and hasattr(request, 'content'):
+                body = request.content
+            full['request'] = dict(headers=_headers(request.headers), **_text(body, self.max_body_bytes))
+            full['response'] = dict(headers=_headers(response.headers),
+                                    **_text(response.content, self.max_body_bytes))
+        return full
+
+    def _spill(self, full: Dict, reason: str) -> Optional[Dict]:
+        """Write a full capture to disk and keep its index entry"""
+        with self._lock:
+            if len(self.spilled) >= self.max_spilled:
+                self.dropped += 1
+                return None
+            index = len(self.spilled) + 1
+            entry = {name: full[name] for name in ('test', 'method', 'url', 'status', 'elapsed', 'error')}
+            entry.update(reason=reason, path=os.path.join(self.directory, f"{index:06d}_{reason}.json.gz"))
+            self.spilled.append(entry)
+            if full['test'] is not None:
+                self._by_test[full['test']].append(entry)
+
+        os.makedirs(self.directory, exist_ok=True)
+        with gzip.open(entry['path'], 'wt', encoding='utf-8') as f:
+            json.dump(dict(full, reason=reason), f, indent=2)
+        return entry
+
+    def spill_test(self, test: str) -> List[Dict]:
+        """Write out the failing test's recent requests; returns all its captures"""
+        with self._lock:
+            pending = [item for item in self._pending if item[0]['test'] == test]
+            self._pending.clear()
+        for summary, response in pending:
+            self._spill(self._full(summary, response), FAILED_TEST)
+        return self.captures_for(test)
+
+    def finish_test(self, test: str) -> List[Dict]:
+        """Forget the test's pending payloads; returns its captures"""
+        with self._lock:
+            self._pending.clear()
+        return self.captures_for(test)
+
+    def captures_for(self, test: str) -> List[Dict]:
+        with self._lock:
+            return list(self._by_test.get(test, ()))
+
+    def pytest_plugin(self):
+        """Plugin that writes out a failing test's requests and lists them in its report"""
+        import pytest
+
+        store = self
+
+        class CapturePlugin:
+            @pytest.hookimpl(hookwrapper=True)
+            def pytest_runtest_makereport(self, item, call):
+                outcome = yield
+                report = outcome.get_result()
+                if report.failed:
+                    captures = store.spill_test(item.nodeid)
+                    if captures:
+                        report.sections.append(("Captured API requests", format_captures(captures)))
+
+        return CapturePlugin()
+
+    def summary(self) -> Dict:
+        return {
+            'directory': self.directory,
+            'requests': self.seen,
+            'spilled': len(self.spilled),
+            'dropped': self.dropped,
+            'slow_threshold': (self.latency.percentile(self.slow_percentile)
+                               if self.latency.count >= self.min_samples else None),
+            'samples': list(self.samples),
+        }
+
+
+def load_capture(path: str) -> Dict:
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def preview(path: str, limit: int = PREVIEW_CHARS) -> str:
+    """Headers and bodies of a spilled capture as text, cut at ``limit`` characters"""
+    try:
+        capture = load_capture(path)
+    except (OSError, ValueError) as e:
+        return f"Capture unavailable: {e}"
+    lines = []
+    for part in ('request', 'response'):
+        data = capture.get(part)
+        if not data:
+            continue
+        lines.append(f"--- {part} ---")
+        lines.extend(f"{name}: {value}" for name, value in data['headers'].items())
+        if data['body']:
+            lines.extend(["", data['body'] + (" …(truncated)" if data['truncated'] else "")])
+    if capture.get('error'):
+        lines.append(f"--- error ---\n{capture['error']}")
+    text = "\n".join(lines)
+    return text if len(text) <= limit else text[:limit] + "\n…"
+
+
+def format_captures(captures: List[Dict]) -> str:
+    """Plain-text listing for pytest report sections"""
+    return "\n".join(
+        f"{capture['reason']}: {capture['method']} {capture['url']} -> {capture['status'] or capture['error']} "
+        f"in {capture['elapsed'] * 1000:.1f}ms ({capture['path']})"
+        for capture in captures
+    )
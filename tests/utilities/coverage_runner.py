@@ -0,0 +1,70 @@
+"""Run pytest under coverage started before anything under tests/ is imported
+
+pytest-cov options are translated to the coverage API: ``--cov=SOURCE``
+selects what is measured and ``--cov-report=KIND[:PATH]`` (term,
+term-missing, html, xml) what is written. The run's RunResult is written
+to ``--output`` as JSON for ``run_pytest_with_coverage``.
+
+    python -m tests.utilities.coverage_runner --output result.json tests/ --cov=tests
+"""
+import argparse
+import json
+import sys
+from typing import List, Tuple
+
+# Only stdlib imports above: tests.* must be imported after coverage starts
+
+
+def split_coverage_args(args: List[str]) -> Tuple[List[str], List[Tuple[str, str]], List[str]]:
+    """(sources, [(report kind, path)], remaining pytest args) from pytest-cov style options"""
+    sources, reports, rest = [], [], []
+    for arg in args:
+        if arg.startswith('--cov='):
+            sources.append(arg[len('--cov='):])
+        elif arg == '--cov':
+            sources.append('.')
+        elif arg.startswith('--cov-report='):
+            kind, _, path = arg[len('--cov-report='):].partition(':')
+            reports.append((kind, path))
+        else:
+            rest.append(arg)
+    return sources, reports or [('term', '')], rest
+
+
+def write_reports(cov, reports: List[Tuple[str, str]]):
+    for kind, path in reports:
+        if kind in ('term', 'term-missing'):
+            cov.report(show_missing=kind == 'term-missing')
+        elif kind == 'html':
+            cov.html_report(directory=path or 'htmlcov')
+        elif kind == 'xml':
+            cov.xml_report(outfile=path or 'coverage.xml')
+
+
+def main(argv=None):
+    """Start coverage, run pytest in this process, write coverage reports and the RunResult"""
+    parser = argparse.ArgumentParser(description="Run pytest under coverage", allow_abbrev=False)
+    parser.add_argument('--output', required=True)
+    args, pytest_args = parser.parse_known_args(argv)
+    sources, reports, pytest_args = split_coverage_args(pytest_args)
+
+    import coverage
+
+    cov = coverage.Coverage(source=sources, omit=[__file__])
+    cov.start()
+    try:
+        from tests.utilities.pytest_runner import run_pytest
+
+        result = run_pytest(pytest_args)
+    finally:
+        cov.stop()
+        cov.save()
+    write_reports(cov, reports)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(result.to_dict(), f)
+    return result.exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
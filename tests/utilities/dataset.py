@@ -0,0 +1,278 @@
+"""Seeded JSONPlaceholder-shaped datasets at any scale, in a memory-mapped store
+
+Each resource is one file of newline-separated compact JSON records plus an
+offsets file, so record N is a slice of the mapped data file. Children are
+generated grouped by parent, which makes a nested route such as
+``/users/7/posts`` a contiguous id range read straight from the
+``.parents`` offsets. The same seed, counts and skew always produce the same
+bytes.
+
+    python -m tests.utilities.dataset --scale 1000 --out reports/datasets/large
+"""
+import argparse
+import array
+import hashlib
+import json
+import mmap
+import os
+import random
+import shutil
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+from config.test_config import APITestConfig
+
+# Parents are generated before their children
+RESOURCES = ('users', 'posts', 'comments', 'albums', 'photos', 'todos')
+
+# Child resource -> (parent resource, foreign key)
+PARENTS = {
+    'posts': ('users', 'userId'),
+    'comments': ('posts', 'postId'),
+    'albums': ('users', 'userId'),
+    'photos': ('albums', 'albumId'),
+    'todos': ('users', 'userId'),
+}
+
+META_FILE = 'meta.json'
+
+_WORDS = ("lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt "
+          "ut labore et dolore magna aliqua enim ad minim veniam quis nostrud exercitation").split()
+
+
+def dataset_counts(scale: int = 1) -> Dict[str, int]:
+    """JSONPlaceholder's collection sizes multiplied by ``scale``"""
+    return {resource: count * scale for resource, count in APITestConfig.DATASET_BASE_COUNTS.items()}
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(_WORDS, k=words))
+
+
+def _user(rng: random.Random, i: int, parent: int) -> Dict:
+    return {
+        'id': i,
+        'name': f"User {i}",
+        'username': f"user{i}",
+        'email': f"user{i}@example.com",
+        'address': {'street': _sentence(rng, 2), 'suite': f"Apt. {i}", 'city': _sentence(rng, 1),
+                    'zipcode': f"{rng.randrange(10000, 99999)}",
+                    'geo': {'lat': f"{rng.uniform(-90, 90):.4f}", 'lng': f"{rng.uniform(-180, 180):.4f}"}},
+        'phone': f"1-555-{rng.randrange(100, 999)}-{rng.randrange(1000, 9999)}",
+        'website': f"user{i}.example.org",
+        'company': {'name': f"Company {i}", 'catchPhrase': _sentence(rng, 4), 'bs': _sentence(rng, 3)},
+    }
+
+
+def _post(rng: random.Random, i: int, parent: int) -> Dict:
+    return {'userId': parent, 'id': i, 'title': _sentence(rng, 6), 'body': _sentence(rng, 30)}
+
+
+def _comment(rng: random.Random, i: int, parent: int) -> Dict:
+    return {'postId': parent, 'id': i, 'name': _sentence(rng, 5),
+            'email': f"commenter{i}@example.net", 'body': _sentence(rng, 25)}
+
+
+def _album(rng: random.Random, i: int, parent: int) -> Dict:
+    return {'userId': parent, 'id': i, 'title': _sentence(rng, 4)}
+
+
+def _photo(rng: random.Random, i: int, parent: int) -> Dict:
+    return {'albumId': parent, 'id': i, 'title': _sentence(rng, 5),
+            'url': f"https://via.placeholder.com/600/{i:06x}",
+            'thumbnailUrl': f"https://via.placeholder.com/150/{i:06x}"}
+
+
+def _todo(rng: random.Random, i: int, parent: int) -> Dict:
+    return {'userId': parent, 'id': i, 'title': _sentence(rng, 5), 'completed': rng.random() < 0.5}
+
+
+BUILDERS = {'users': _user, 'posts': _post, 'comments': _comment,
+            'albums': _album, 'photos': _photo, 'todos': _todo}
+
+
+def fanout(parents: int, children: int, skew: float, rng: random.Random) -> array.array:
+    """First child index per parent (plus the end), for ``children`` spread over ``parents``
+
+    Every parent gets one child when there are enough to go round; the rest
+    are shared out by log-normal weights, so with ``skew`` > 0 a few parents
+    own many children, as in real data. ``skew`` 0 spreads them evenly.
+    """
+    base = 1 if children >= parents else 0
+    spare = children - base * parents
+    weights = [rng.lognormvariate(0.0, skew) if skew else 1.0 for _ in range(parents)]
+    total = sum(weights)
+    counts = [base + int(spare * weight / total) for weight in weights]
+    # Hand out what rounding down left over, heaviest parents first
+    for index in sorted(range(parents), key=weights.__getitem__, reverse=True)[:children - sum(counts)]:
+        counts[index] += 1
+
+    starts = array.array('Q', [0])
+    for count in counts:
+        starts.append(starts[-1] + count)
+    return starts
+
+
+def generate_dataset(path: str, counts: Optional[Dict[str, int]] = None, seed: Optional[int] = None,
+                     skew: Optional[float] = None) -> str:
+    """Write a dataset store to ``path`` and return the path"""
+    counts = dict(counts or dataset_counts(APITestConfig.DATASET_SCALE))
+    seed = APITestConfig.DATASET_SEED if seed is None else seed
+    skew = APITestConfig.DATASET_FANOUT_SKEW if skew is None else skew
+    os.makedirs(path, exist_ok=True)
+    started = time.perf_counter()
+
+    for resource in RESOURCES:
+        rng = random.Random(f"{seed}:{resource}")
+        build = BUILDERS[resource]
+        if resource in PARENTS:
+            parent = PARENTS[resource][0]
+            starts = fanout(counts[parent], counts[resource], skew, rng)
+            with open(os.path.join(path, f"{resource}.parents"), 'wb') as f:
+                starts.tofile(f)
+            owners = ((parent_id, starts[parent_id] - starts[parent_id - 1])
+                      for parent_id in range(1, counts[parent] + 1))
+        else:
+            owners = [(0, counts[resource])]
+
+        offsets = array.array('Q', [0])
+        with open(os.path.join(path, f"{resource}.jsonl"), 'wb') as data:
+            record_id = 0
+            chunk = []
+            for parent_id, children in owners:
+                for _ in range(children):
+                    record_id += 1
+                    line = json.dumps(build(rng, record_id, parent_id), separators=(',', ':')).encode() + b'\n'
+                    chunk.append(line)
+                    offsets.append(offsets[-1] + len(line))
+                if len(chunk) >= 10000:
+                    data.write(b''.join(chunk))
+                    chunk = []
+            data.write(b''.join(chunk))
+        with open(os.path.join(path, f"{resource}.offsets"), 'wb') as f:
+            offsets.tofile(f)
+
+    meta = {'seed': seed, 'skew': skew, 'counts': counts,
+            'generated_in': round(time.perf_counter() - started, 3)}
+    with open(os.path.join(path, META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    return path
+
+
+def ensure_dataset(counts: Optional[Dict[str, int]] = None, seed: Optional[int] = None,
+                   skew: Optional[float] = None, root: Optional[str] = None) -> str:
+    """Path of a cached dataset for these parameters, generating it the first time"""
+    counts = dict(counts or dataset_counts(APITestConfig.DATASET_SCALE))
+    seed = APITestConfig.DATASET_SEED if seed is None else seed
+    skew = APITestConfig.DATASET_FANOUT_SKEW if skew is None else skew
+    key = hashlib.sha256(json.dumps([counts, seed, skew], sort_keys=True).encode()).hexdigest()[:12]
+    path = os.path.join(root or APITestConfig.DATASET_DIR, f"dataset_{key}")
+    if not os.path.exists(os.path.join(path, META_FILE)):
+        # Generate beside the final path and rename, so concurrent callers never read half a store
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        generate_dataset(tmp_path, counts, seed, skew)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            # Another process finished first; its copy is identical
+            shutil.rmtree(tmp_path, ignore_errors=True)
+    return path
+
+
+class DatasetStore:
+    """Read-only, memory-mapped view of a generated dataset"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, META_FILE), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.counts: Dict[str, int] = self.meta['counts']
+        self._maps = []
+        self._data: Dict[str, mmap.mmap] = {}
+        self._offsets: Dict[str, memoryview] = {}
+        self._parents: Dict[str, memoryview] = {}
+        for resource in RESOURCES:
+            self._data[resource] = self._map(f"{resource}.jsonl")
+            self._offsets[resource] = memoryview(self._map(f"{resource}.offsets")).cast('Q')
+            if resource in PARENTS:
+                self._parents[resource] = memoryview(self._map(f"{resource}.parents")).cast('Q')
+
+    def _map(self, name: str) -> mmap.mmap:
+        with open(os.path.join(self.path, name), 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return mapped
+
+    def __contains__(self, resource: str) -> bool:
+        return resource in self._data
+
+    def count(self, resource: str) -> int:
+        return self.counts[resource]
+
+    def record(self, resource: str, record_id: int) -> Optional[bytes]:
+        """One record's JSON, or None when the id does not exist"""
+        if not 1 <= record_id <= self.counts[resource]:
+            return None
+        offsets = self._offsets[resource]
+        return self._data[resource][offsets[record_id - 1]:offsets[record_id] - 1]
+
+    def records(self, resource: str, start: int = 1, end: Optional[int] = None) -> Iterator[bytes]:
+        """JSON of records ``start`` up to (not including) ``end``"""
+        end = self.counts[resource] + 1 if end is None else min(end, self.counts[resource] + 1)
+        offsets = self._offsets[resource]
+        data = self._data[resource]
+        for record_id in range(max(start, 1), end):
+            yield data[offsets[record_id - 1]:offsets[record_id] - 1]
+
+    def span(self, resource: str, start: int = 1, end: Optional[int] = None) -> int:
+        """Bytes of JSON (without separators) in ``records(resource, start, end)``"""
+        end = self.counts[resource] + 1 if end is None else min(end, self.counts[resource] + 1)
+        start = max(start, 1)
+        if end <= start:
+            return 0
+        offsets = self._offsets[resource]
+        return offsets[end - 1] - offsets[start - 1] - (end - start)
+
+    def children(self, resource: str, parent_id: int) -> Tuple[int, int]:
+        """Id range [first, end) of ``resource`` records that belong to ``parent_id``"""
+        starts = self._parents[resource]
+        if not 1 <= parent_id < len(starts):
+            return 1, 1
+        return starts[parent_id - 1] + 1, starts[parent_id] + 1
+
+    def close(self):
+        for view in list(self._offsets.values()) + list(self._parents.values()):
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
+        self._maps.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a seeded JSONPlaceholder-shaped dataset")
+    parser.add_argument('--scale', type=int, default=APITestConfig.DATASET_SCALE,
+                        help="Multiple of JSONPlaceholder's collection sizes")
+    parser.add_argument('--seed', type=int, default=APITestConfig.DATASET_SEED)
+    parser.add_argument('--skew', type=float, default=APITestConfig.DATASET_FANOUT_SKEW,
+                        help="Log-normal sigma of children per parent (0 for an even spread)")
+    parser.add_argument('--out', help="Store directory (default: cached under reports/datasets)")
+    args = parser.parse_args(argv)
+
+    counts = dataset_counts(args.scale)
+    if args.out:
+        path = generate_dataset(args.out, counts, args.seed, args.skew)
+    else:
+        path = ensure_dataset(counts, args.seed, args.skew)
+    with DatasetStore(path) as store:
+        sizes = ", ".join(f"{store.count(resource):,} {resource}" for resource in RESOURCES)
+        print(f"🗃️  Dataset at {path}: {sizes} (seed {store.meta['seed']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+import multiprocessing
+import secrets
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config.test_config import APITestConfig
+from tests.utilities.latency import LatencyHistogram
+from tests.utilities.load_runner import LoadResult, StageResult
+from tests.utilities.scenario import ScenarioError, compile_scenario
+
+# Message types exchanged between coordinator and workers. Every message is a
+# (type, payload) tuple sent over an authenticated multiprocessing connection.
+MSG_PLAN = 'plan'
+MSG_DELTA = 'delta'
+MSG_STAGE = 'stage'
+MSG_DONE = 'done'
+MSG_ERROR = 'error'
+
+
+def parse_address(value: str) -> Tuple[str, int]:
+    """Parse HOST:PORT into a socket address"""
+    host, _, port = value.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+class DeltaReporter:
+    """Worker-side buffer that streams histogram deltas to the coordinator"""
+
+    def __init__(self, conn, worker_id: int, interval: Optional[float] = None):
+        self.conn = conn
+        self.worker_id = worker_id
+        self.interval = interval or APITestConfig.LOAD_WORKER_FLUSH_INTERVAL
+        self._send_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._stage = 0
+        self._reset()
+
+    def _reset(self):
+        self._histogram = LatencyHistogram()
+        self._requests = 0
+        self._errors = 0
+
+    def send(self, kind: str, payload: Dict):
+        with self._send_lock:
+            self.conn.send((kind, payload))
+
+    def record(self, sample):
+        """on_sample hook for run_ramp"""
+        with self._lock:
+            self._histogram.record(sample.latency)
+            self._requests += 1
+            if not sample.ok:
+                self._errors += 1
+
+    def flush(self):
+        with self._lock:
+            if not self._requests:
+                return
+            payload = {
+                'worker': self.worker_id,
+                'stage': self._stage,
+                'histogram': self._histogram.to_dict(),
+                'requests': self._requests,
+                'errors': self._errors,
+            }
+            self._reset()
+        self.send(MSG_DELTA, payload)
+
+    def stage_done(self, stage: StageResult):
+        """on_stage hook for run_ramp: send the exact stage totals"""
+        self.flush()
+        self.send(MSG_STAGE, {
+            'worker': self.worker_id,
+            'stage': stage.index,
+            'concurrency': stage.concurrency,
+            'rate': stage.rate,
+            'histogram': stage.histogram.to_dict(),
+            'corrected': stage.corrected.to_dict() if stage.corrected else None,
+            'requests': stage.requests,
+            'errors': stage.errors,
+            'elapsed': stage.elapsed,
+        })
+        with self._lock:
+            self._stage = stage.index + 1
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.flush()
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        self._thread.join()
+        self.flush()
+
+
+def run_worker(address: Tuple[str, int], authkey: Optional[bytes] = None):
+    """Connect to a coordinator, run the assigned plan shard and report back"""
+    import os
+    from tests.utilities.api_client import APITestClient
+    from tests.utilities.load_runner import run_ramp
+    from tests.utilities.result_store import ColumnarResultWriter
+
+    authkey = authkey or APITestConfig.LOAD_WORKER_AUTHKEY
+    if not authkey:
+        raise ValueError("Set LOAD_WORKER_AUTHKEY to the worker key the coordinator printed")
+    conn = Client(address, authkey=authkey)
+    try:
+        kind, assignment = conn.recv()
+        if kind != MSG_PLAN:
+            return
+        worker_id = assignment['shard']
+        plan = compile_scenario(assignment['scenario']).shard(worker_id, assignment['shards'])
+
+        reporter = DeltaReporter(conn, worker_id)
+        on_sample = reporter.record
+        store = None
+        if assignment.get('store'):
+            store = ColumnarResultWriter(os.path.join(assignment['store'], f"shard-{worker_id}"),
+                                         APITestConfig.RESULTS_STORE_FLUSH_ROWS)
+
+            def on_sample(sample):
+                reporter.record(sample)
+                store.append_sample(sample)
+        try:
+            with reporter:
+                run_ramp(APITestClient(), plan, on_stage=reporter.stage_done, on_sample=on_sample)
+        except Exception as e:
+            reporter.send(MSG_ERROR, {'worker': worker_id, 'error': str(e)})
+            return
+        finally:
+            if store is not None:
+                store.close()
+        reporter.send(MSG_DONE, {'worker': worker_id})
+    finally:
+        conn.close()
+
+
+class LiveView:
+    """Coordinator-side merge of the deltas streamed by all workers"""
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+        self.stage = 0
+        self.started = time.perf_counter()
+
+    def apply(self, delta: Dict):
+        self.histogram.merge(LatencyHistogram.from_dict(delta['histogram']))
+        self.requests += delta['requests']
+        self.errors += delta['errors']
+        self.stage = max(self.stage, delta['stage'])
+
+    @property
+    def throughput(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return self.requests / elapsed if elapsed else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+
+class Coordinator:
+    """Fan a scenario out to worker processes and merge their results"""
+
+    def __init__(self, scenario: Dict, local_workers: int = 2, remote_workers: int = 0,
+                 address: Tuple[str, int] = ('127.0.0.1', 0), authkey: Optional[bytes] = None,
+                 on_update: Optional[Callable] = None, store_path: Optional[str] = None):
+        self.scenario = scenario
+        self.local_workers = local_workers
+        self.remote_workers = remote_workers
+        self.address = address
+        # Connections carry pickles, so a guessable key would let anyone who reaches them run code
+        self.authkey = authkey or APITestConfig.LOAD_WORKER_AUTHKEY or secrets.token_hex(16).encode()
+        self.on_update = on_update
+        # Workers write per-request rows to <store_path>/shard-<i> when set
+        self.store_path = store_path
+        self.live = LiveView()
+        self.errors: List[str] = []
+
+    @property
+    def worker_count(self) -> int:
+        return self.local_workers + self.remote_workers
+
+    def _merge_stage(self, stages: Dict[int, StageResult], payload: Dict):
+        stage = stages.get(payload['stage'])
+        if stage is None:
+            stage = stages[payload['stage']] = StageResult(payload['stage'], 0, payload['rate'])
+            stage.rate = 0.0 if payload['rate'] else None
+        stage.concurrency += payload['concurrency']
+        if payload['rate']:
+            stage.rate += payload['rate']
+        stage.histogram.merge(LatencyHistogram.from_dict(payload['histogram']))
+        if payload['corrected']:
+            stage.corrected.merge(LatencyHistogram.from_dict(payload['corrected']))
+        stage.requests += payload['requests']
+        stage.errors += payload['errors']
+        # Workers run their shards side by side, so the stage lasts as long as the slowest one
+        stage.elapsed = max(stage.elapsed, payload['elapsed'])
+
+    def _accept_workers(self, listener, processes) -> List:
+        """Accept every worker connection, failing fast if local workers die first"""
+        connections = []
+
+        def accept_all():
+            while len(connections) < self.worker_count:
+                try:
+                    connections.append(listener.accept())
+                except (AuthenticationError, EOFError, OSError) as e:
+                    # A client without the key is turned away; the real workers can still connect
+                    self.errors.append(f"rejected a connection: {e}")
+
+        acceptor = threading.Thread(target=accept_all, daemon=True)
+        acceptor.start()
+        deadline = time.monotonic() + APITestConfig.LOAD_WORKER_CONNECT_TIMEOUT
+        while acceptor.is_alive():
+            acceptor.join(0.1)
+            exited = [process for process in processes if process.exitcode is not None]
+            if exited and len(connections) < self.worker_count:
+                raise RuntimeError(f"{len(exited)} local worker(s) exited before connecting")
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Only {len(connections)} of {self.worker_count} workers connected")
+        return connections
+
+    def run(self) -> LoadResult:
+        """Run the scenario on all workers and return the merged result"""
+        plan = compile_scenario(self.scenario)
+        if self.worker_count > plan.max_shards:
+            raise ScenarioError(f"Plan '{plan.name}' can be split over at most {plan.max_shards} "
+                                f"workers, not {self.worker_count}")
+        context = multiprocessing.get_context('spawn')
+        stages: Dict[int, StageResult] = {}
+
+        with Listener(self.address, authkey=self.authkey) as listener:
+            self.address = listener.address
+            processes = [
+                context.Process(target=run_worker, args=(listener.address, self.authkey), daemon=True)
+                for _ in range(self.local_workers)
+            ]
+            for process in processes:
+                process.start()
+
+            connections = self._accept_workers(listener, processes)
+            for shard, conn in enumerate(connections):
+                conn.send((MSG_PLAN, {
+                    'scenario': self.scenario,
+                    'shard': shard,
+                    'shards': self.worker_count,
+                    'store': self.store_path,
+                }))
+
+            pending = list(connections)
+            while pending:
+                for conn in wait(pending):
+                    try:
+                        kind, payload = conn.recv()
+                    except EOFError:
+                        self.errors.append("worker disconnected before finishing")
+                        pending.remove(conn)
+                        continue
+
+                    if kind == MSG_DELTA:
+                        self.live.apply(payload)
+                        if self.on_update:
+                            self.on_update(self.live)
+                    elif kind == MSG_STAGE:
+                        self._merge_stage(stages, payload)
+                    elif kind in (MSG_DONE, MSG_ERROR):
+                        if kind == MSG_ERROR:
+                            self.errors.append(f"worker {payload['worker']}: {payload['error']}")
+                        pending.remove(conn)
+                        conn.close()
+
+            for process in processes:
+                process.join()
+
+        return LoadResult(plan, plan.ramp, [stages[index] for index in sorted(stages)])
@@ -0,0 +1,193 @@
+"""Rerun failed tests in parallel, classify them and track flakiness over time
+
+A test that fails and then passes on any rerun is flaky; one that fails
+every rerun fails. Each run's outcome moves the test's score, an
+exponentially weighted share of flaky runs kept in the results history.
+Tests whose score crosses the quarantine threshold still run, but their
+failures no longer fail the run until the score drops back under the
+release threshold.
+
+    python -m tests.utilities.flaky --output outcomes.json NODEID...
+"""
+import argparse
+import concurrent.futures
+import datetime
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from config.test_config import APITestConfig
+from tests.utilities.pytest_runner import RunResult, run_pytest
+from tests.utilities.results import ERROR, FAILED, FLAKY, PASSED, XPASSED, ResultRecord
+
+# Per-run classification of a test
+PASS = 'pass'
+FLAKY_OUTCOME = 'flaky'
+FAIL = 'fail'
+
+# One letter per run in a test's recent history
+_LETTERS = {PASS: 'P', FLAKY_OUTCOME: 'K', FAIL: 'F'}
+
+
+class FlakinessHistory:
+    """Per-test flakiness scores and quarantine state, stored as JSON"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or APITestConfig.FLAKY_HISTORY_FILE
+        self.tests: Dict[str, Dict] = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.tests = json.load(f)
+
+    def entry(self, nodeid: str) -> Dict:
+        return self.tests.get(nodeid) or {'runs': 0, 'flaky': 0, 'failures': 0, 'score': 0.0,
+                                          'quarantined': False, 'recent': ''}
+
+    def record(self, nodeid: str, outcome: str) -> Dict:
+        """Fold one run's outcome into the test's score and quarantine state"""
+        entry = self.entry(nodeid)
+        alpha = APITestConfig.FLAKY_SCORE_ALPHA
+        entry['runs'] += 1
+        entry['flaky'] += outcome == FLAKY_OUTCOME
+        entry['failures'] += outcome == FAIL
+        entry['score'] = round((1 - alpha) * entry['score'] + alpha * (outcome == FLAKY_OUTCOME), 6)
+        entry['recent'] = (entry['recent'] + _LETTERS[outcome])[-APITestConfig.FLAKY_HISTORY_LENGTH:]
+        # Separate enter and leave thresholds, so a test near the line does not flip every run
+        if entry['quarantined']:
+            entry['quarantined'] = entry['score'] >= APITestConfig.FLAKY_RELEASE_SCORE
+        else:
+            entry['quarantined'] = (entry['score'] >= APITestConfig.FLAKY_QUARANTINE_SCORE
+                                    and entry['runs'] >= APITestConfig.FLAKY_MIN_RUNS)
+        entry['updated'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.tests[nodeid] = entry
+        return entry
+
+    def quarantined(self) -> List[str]:
+        return sorted(nodeid for nodeid, entry in self.tests.items() if entry['quarantined'])
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(sorted(self.tests.items())), f, indent=2)
+        os.replace(tmp_path, self.path)
+        return self.path
+
+
+def rerun(nodeids: Sequence[str], reruns: int, workers: Optional[int] = None,
+          pytest_args: Sequence[str] = ()) -> Dict[str, List[str]]:
+    """Run ``nodeids`` ``reruns`` more times, each round in its own process, rounds in parallel
+
+    Returns every test's statuses, one per round. Request capture is off in
+    the rerun processes so their passing attempts do not write diagnostics.
+    """
+    workers = workers or APITestConfig.FLAKY_RERUN_WORKERS
+    env = dict(os.environ, API_CAPTURE='0')
+
+    def one_round(_):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'outcomes.json')
+            subprocess.run([sys.executable, '-m', 'tests.utilities.flaky', '--output', output,
+                            *[f"--pytest-arg={arg}" for arg in pytest_args], *nodeids],
+                           cwd=APITestConfig.PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if not os.path.exists(output):
+                return {}
+            with open(output, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+    outcomes: Dict[str, List[str]] = {nodeid: [] for nodeid in nodeids}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(workers, reruns))) as executor:
+        for statuses in executor.map(one_round, range(reruns)):
+            for nodeid in nodeids:
+                # A round that crashed before reporting the test counts against it
+                outcomes[nodeid].append(statuses.get(nodeid, ERROR))
+    return outcomes
+
+
+def classify(records: Sequence[ResultRecord], reruns: Optional[int] = None, workers: Optional[int] = None,
+             pytest_args: Sequence[str] = ()) -> List[ResultRecord]:
+    """Rerun the failed records; any that pass a rerun become FLAKY. Returns the records rerun"""
+    reruns = APITestConfig.FLAKY_RERUNS if reruns is None else reruns
+    failed = [record for record in records if record.status in (FAILED, ERROR) and record.nodeid]
+    if not failed or reruns <= 0:
+        return []
+
+    outcomes = rerun([record.nodeid for record in failed], reruns, workers, pytest_args)
+    for record in failed:
+        attempts = outcomes[record.nodeid]
+        passes = attempts.count(PASSED)
+        record.flakiness = {'outcome': FLAKY_OUTCOME if passes else FAIL,
+                            'reruns': len(attempts), 'rerun_passes': passes}
+        if passes:
+            record.status = FLAKY
+    return failed
+
+
+def record_history(records: Iterable[ResultRecord], history: Optional[FlakinessHistory] = None,
+                   update: bool = True) -> FlakinessHistory:
+    """Fold each test's outcome into the history and annotate records with score and quarantine
+
+    With ``update`` False the history is only read, as shards do so that the
+    merge step counts each run once.
+    """
+    history = history or FlakinessHistory()
+    for record in records:
+        if not record.nodeid or record.status not in (PASSED, FLAKY, FAILED, ERROR):
+            continue
+        if record.flakiness is not None:
+            outcome = record.flakiness['outcome']
+        else:
+            outcome = FAIL if record.status in (FAILED, ERROR) else PASS
+        entry = history.record(record.nodeid, outcome) if update else history.entry(record.nodeid)
+        if record.flakiness is not None or entry['quarantined']:
+            record.flakiness = dict(record.flakiness or {'outcome': outcome, 'reruns': 0, 'rerun_passes': 0},
+                                    score=entry['score'], quarantined=entry['quarantined'],
+                                    recent=entry['recent'])
+    if update:
+        history.save()
+    return history
+
+
+def blocking(records: Iterable[ResultRecord]) -> List[ResultRecord]:
+    """Failures that should fail the run: neither flaky nor quarantined"""
+    return [record for record in records
+            if record.status in (FAILED, ERROR, XPASSED) and not (record.flakiness or {}).get('quarantined')]
+
+
+def apply_reruns(result: RunResult, reruns: Optional[int] = None, workers: Optional[int] = None,
+                 update_history: bool = True, pytest_args: Sequence[str] = ()) -> List[ResultRecord]:
+    """Rerun a run's failures, update flakiness history and settle its exit code, in place
+
+    The exit code turns 0 when every failure turned out flaky or is
+    quarantined. Returns the records that were rerun.
+    """
+    rerun_records = classify(result.records, reruns, workers, pytest_args)
+    record_history(result.records, update=update_history)
+    if result.exit_code == 1 and not blocking(result.records):
+        result.exit_code = 0
+    return rerun_records
+
+
+def quarantined(records: Iterable[ResultRecord]) -> List[ResultRecord]:
+    return [record for record in records if (record.flakiness or {}).get('quarantined')]
+
+
+def main(argv=None):
+    """Rerun worker: run the given tests once and write {nodeid: status} as JSON"""
+    parser = argparse.ArgumentParser(description="Run tests once and record each one's status")
+    parser.add_argument('--output', required=True)
+    parser.add_argument('--pytest-arg', action='append', default=[])
+    parser.add_argument('nodeids', nargs='+')
+    args = parser.parse_args(argv)
+
+    result = run_pytest([*args.nodeids, '-q', '-p', 'no:cacheprovider', '--tb=no', *args.pytest_arg])
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({record.nodeid: record.status for record in result.records}, f)
+    return result.exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+import math
+from typing import Dict, List, Optional
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with bounded relative error
+
+    Values are recorded in seconds and stored in buckets whose width grows
+    geometrically, so memory stays small regardless of sample count and two
+    histograms can be merged by adding bucket counts.
+    """
+
+    def __init__(self, precision: float = 0.01):
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _bucket(self, value: float) -> int:
+        micros = value * 1e6
+        if micros <= 1.0:
+            return 0
+        return int(math.log(micros) / self._log_base) + 1
+
+    def _bucket_value(self, bucket: int) -> float:
+        if bucket == 0:
+            return 1e-6
+        return math.exp(bucket * self._log_base) / 1e6
+
+    def record(self, value: float, count: int = 1):
+        """Record a latency in seconds"""
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += count
+        self.total += value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: 'LatencyHistogram'):
+        """Add another histogram's samples into this one"""
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        """Latency in seconds at the given percentile (0-100)"""
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(self.count * percentile / 100.0))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                return min(max(self._bucket_value(bucket), self.min), self.max)
+        return self.max
+
+    def percentiles(self, percentiles: Optional[List[float]] = None) -> Dict[str, float]:
+        """Percentile summary keyed as p50, p90, ..."""
+        percentiles = percentiles or [50, 90, 95, 99]
+        return {f"p{p:g}": self.percentile(p) for p in percentiles}
+
+    def to_dict(self) -> Dict:
+        """Compact, JSON-serialisable form"""
+        return {
+            'precision': self.precision,
+            'counts': {str(bucket): count for bucket, count in self.counts.items()},
+            'count': self.count,
+            'total': self.total,
+            'min': self.min if self.count else 0.0,
+            'max': self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'LatencyHistogram':
+        histogram = cls(data.get('precision', 0.01))
+        histogram.counts = {int(bucket): count for bucket, count in data['counts'].items()}
+        histogram.count = data['count']
+        histogram.total = data['total']
+        histogram.min = data['min'] if data['count'] else math.inf
+        histogram.max = data['max']
+        return histogram
@@ -0,0 +1,320 @@
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from config.test_config import APITestConfig
+from tests.utilities.latency import LatencyHistogram
+from tests.utilities.stats import nearest_rank
+
+# Bucket upper bounds (seconds) exposed for Prometheus histograms
+PROMETHEUS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class EndpointMetrics:
+    """Running counters for one method/endpoint pair"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.histogram = LatencyHistogram()
+        self.buckets = [0] * len(PROMETHEUS_BUCKETS)
+
+
+class MetricsRegistry:
+    """Thread-safe in-memory metrics shared by runners, dashboard and exporter"""
+
+    def __init__(self, window: float = 5.0):
+        self.window = window
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._endpoints: Dict[Tuple[str, str], EndpointMetrics] = {}
+        self._recent: deque = deque()
+
+    def record(self, method: str, endpoint: str, latency: float, ok: bool):
+        """Record one completed request"""
+        now = time.perf_counter()
+        with self._lock:
+            metrics = self._endpoints.get((method, endpoint))
+            if metrics is None:
+                metrics = self._endpoints[(method, endpoint)] = EndpointMetrics()
+            metrics.requests += 1
+            if not ok:
+                metrics.errors += 1
+            metrics.histogram.record(latency)
+            for index, bound in enumerate(PROMETHEUS_BUCKETS):
+                if latency <= bound:
+                    metrics.buckets[index] += 1
+                    break
+            self._recent.append((now, latency, ok))
+
+    def record_sample(self, sample):
+        """on_sample hook accepting a LoadSample"""
+        self.record(sample.method, sample.endpoint, sample.latency, sample.ok)
+
+    def snapshot(self) -> Dict:
+        """Current-window and cumulative figures"""
+        now = time.perf_counter()
+        with self._lock:
+            cutoff = now - self.window
+            while self._recent and self._recent[0][0] < cutoff:
+                self._recent.popleft()
+            recent = list(self._recent)
+            endpoints = {
+                key: (metrics.requests, metrics.errors, metrics.histogram.percentile(95))
+                for key, metrics in self._endpoints.items()
+            }
+
+        window = min(self.window, now - self.started) or self.window
+        latencies = sorted(latency for _, latency, _ in recent)
+        errors = sum(1 for _, _, ok in recent if not ok)
+        return {
+            'elapsed': now - self.started,
+            'rps': len(recent) / window,
+            'p50': latencies[nearest_rank(len(latencies), 50)] if latencies else 0.0,
+            'p95': latencies[nearest_rank(len(latencies), 95)] if latencies else 0.0,
+            'error_rate': errors / len(recent) if recent else 0.0,
+            'window_requests': len(recent),
+            'total_requests': sum(requests for requests, _, _ in endpoints.values()),
+            'endpoints': endpoints,
+        }
+
+    def to_prometheus(self) -> str:
+        """Render counters and histograms in the Prometheus text format"""
+        lines = [
+            "# HELP api_test_requests_total Requests sent by the API test suite",
+            "# TYPE api_test_requests_total counter",
+        ]
+        with self._lock:
+            items = [
+                (method, endpoint, metrics.requests, metrics.errors, list(metrics.buckets),
+                 metrics.histogram.total)
+                for (method, endpoint), metrics in sorted(self._endpoints.items())
+            ]
+
+        for method, endpoint, requests, _, _, _ in items:
+            lines.append(f'api_test_requests_total{{method="{method}",endpoint="{endpoint}"}} {requests}')
+        lines += [
+            "# HELP api_test_errors_total Requests that failed or returned an unexpected status",
+            "# TYPE api_test_errors_total counter",
+        ]
+        for method, endpoint, _, errors, _, _ in items:
+            lines.append(f'api_test_errors_total{{method="{method}",endpoint="{endpoint}"}} {errors}')
+        lines += [
+            "# HELP api_test_request_duration_seconds Request latency",
+            "# TYPE api_test_request_duration_seconds histogram",
+        ]
+        for method, endpoint, requests, _, buckets, total in items:
+            labels = f'method="{method}",endpoint="{endpoint}"'
+            cumulative = 0
+            for bound, count in zip(PROMETHEUS_BUCKETS, buckets):
+                cumulative += count
+                lines.append(f'api_test_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'api_test_request_duration_seconds_bucket{{{labels},le="+Inf"}} {requests}')
+            lines.append(f'api_test_request_duration_seconds_sum{{{labels}}} {total}')
+            lines.append(f'api_test_request_duration_seconds_count{{{labels}}} {requests}')
+        return "\n".join(lines) + "\n"
+
+
+class AbortMonitor:
+    """Watch a registry and set ``stop_event`` once an abort threshold is clearly crossed
+
+    Runs on its own thread, so a run aborts whether or not a dashboard is shown.
+    """
+
+    def __init__(self, registry: MetricsRegistry, interval: float = 1.0,
+                 stop_event: Optional[threading.Event] = None,
+                 abort_error_rate: Optional[float] = None, abort_p95: Optional[float] = None,
+                 min_requests: int = 20, stream=None):
+        self.registry = registry
+        self.interval = interval
+        self.stop_event = stop_event
+        self.abort_error_rate = abort_error_rate
+        self.abort_p95 = abort_p95
+        self.min_requests = min_requests
+        self.stream = stream or sys.stdout
+        self.abort_reason: Optional[str] = None
+        self._finished = threading.Event()
+
+    def check_abort(self, snapshot: Dict) -> Optional[str]:
+        """Return why the run should stop, if a threshold is clearly failing"""
+        if snapshot['window_requests'] < self.min_requests:
+            return None
+        if self.abort_error_rate is not None and snapshot['error_rate'] > self.abort_error_rate:
+            return f"error rate {snapshot['error_rate'] * 100:.1f}% above {self.abort_error_rate * 100:.1f}%"
+        if self.abort_p95 is not None and snapshot['p95'] > self.abort_p95:
+            return f"p95 {snapshot['p95'] * 1000:.0f}ms above {self.abort_p95 * 1000:.0f}ms"
+        return None
+
+    def check(self) -> Optional[str]:
+        if self.abort_reason:
+            return self.abort_reason
+        reason = self.check_abort(self.registry.snapshot())
+        if reason:
+            self.abort_reason = reason
+            self.stream.write(f"🛑 Aborting run: {reason}\n")
+            self.stream.flush()
+            if self.stop_event is not None:
+                self.stop_event.set()
+        return reason
+
+    def _run(self):
+        while not self._finished.wait(self.interval) and not self.abort_reason:
+            self.check()
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._finished.set()
+        self._thread.join()
+
+
+class TerminalDashboard:
+    """Periodically redraw a live RPS/latency/error table on the terminal"""
+
+    def __init__(self, registry: MetricsRegistry, interval: float = 1.0, stream=None):
+        self.registry = registry
+        self.interval = interval
+        self.stream = stream or sys.stdout
+        self._finished = threading.Event()
+        self._lines = 0
+
+    def render(self, snapshot: Dict) -> List[str]:
+        lines = [
+            f"⏱️  {snapshot['elapsed']:7.1f}s  |  {snapshot['rps']:8.1f} req/s  |  "
+            f"p50 {snapshot['p50'] * 1000:7.1f}ms  |  p95 {snapshot['p95'] * 1000:7.1f}ms  |  "
+            f"errors {snapshot['error_rate'] * 100:5.1f}%  |  total {snapshot['total_requests']}",
+            f"{'METHOD':<7} {'ENDPOINT':<32} {'REQUESTS':>9} {'ERRORS':>7} {'P95 MS':>9}",
+        ]
+        for (method, endpoint), (requests, errors, p95) in sorted(snapshot['endpoints'].items()):
+            lines.append(f"{method:<7} {endpoint[:32]:<32} {requests:>9} {errors:>7} {p95 * 1000:>9.1f}")
+        return lines
+
+    def draw(self):
+        snapshot = self.registry.snapshot()
+        lines = self.render(snapshot)
+        if self._lines and self.stream.isatty():
+            # Move the cursor back up and redraw in place
+            self.stream.write(f"\033[{self._lines}F\033[J")
+        self.stream.write("\n".join(lines) + "\n")
+        self.stream.flush()
+        self._lines = len(lines)
+
+    def _run(self):
+        while not self._finished.wait(self.interval):
+            self.draw()
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._finished.set()
+        self._thread.join()
+        self.draw()
+
+
+class PrometheusExporter:
+    """Serve a registry as Prometheus text on http://host:port/metrics"""
+
+    def __init__(self, registry: MetricsRegistry, port: int = 9464, host: str = '127.0.0.1'):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server = None
+
+    def _handler(self):
+        registry = self.registry
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return MetricsHandler
+
+    def start(self) -> 'PrometheusExporter':
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+# Process-wide registry the API client reports into when live metrics are on
+_active_registry: Optional[MetricsRegistry] = None
+
+
+def get_active_registry() -> Optional[MetricsRegistry]:
+    return _active_registry
+
+
+def set_active_registry(registry: Optional[MetricsRegistry]):
+    global _active_registry
+    _active_registry = registry
+
+
+class LiveMetricsSession:
+    """Activate a registry with an optional dashboard, Prometheus endpoint and abort thresholds"""
+
+    def __init__(self, dashboard: bool = True, port: Optional[int] = None,
+                 stop_event: Optional[threading.Event] = None,
+                 abort_error_rate: Optional[float] = None, abort_p95: Optional[float] = None):
+        self.registry = MetricsRegistry(APITestConfig.LIVE_METRICS_WINDOW)
+        self.dashboard = TerminalDashboard(
+            self.registry, APITestConfig.LIVE_METRICS_INTERVAL) if dashboard else None
+        self.exporter = PrometheusExporter(self.registry, port) if port is not None else None
+        self.monitor = AbortMonitor(
+            self.registry, APITestConfig.LIVE_METRICS_INTERVAL, stop_event, abort_error_rate, abort_p95,
+        ) if abort_error_rate is not None or abort_p95 is not None else None
+
+    @property
+    def abort_reason(self) -> Optional[str]:
+        return self.monitor.abort_reason if self.monitor else None
+
+    def __enter__(self) -> 'LiveMetricsSession':
+        set_active_registry(self.registry)
+        if self.exporter:
+            self.exporter.start()
+            print(f"📡 Prometheus metrics: http://{self.exporter.host}:{self.exporter.port}/metrics")
+        if self.dashboard:
+            self.dashboard.__enter__()
+        if self.monitor:
+            self.monitor.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.monitor:
+            self.monitor.__exit__(*exc_info)
+        if self.dashboard:
+            self.dashboard.__exit__(*exc_info)
+        if self.exporter:
+            self.exporter.stop()
+        set_active_registry(None)
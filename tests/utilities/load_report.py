@@ -0,0 +1,112 @@
+import html
+import json
+import os
+from datetime import datetime
+from typing import Tuple
+
+from config.test_config import APITestConfig
+
+
+def write_json_report(result, path: str) -> str:
+    """Write a load result as JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(result.to_dict(), f, indent=2)
+    return path
+
+
+def _corrected_cell(stage, key: str) -> str:
+    corrected = stage.get('corrected_percentiles')
+    return f"{corrected[key] * 1000:.1f}" if corrected else "-"
+
+
+def _stage_rows(data) -> str:
+    knee = data['saturation']
+    rows = []
+    for stage in data['stages']:
+        percentiles = stage['percentiles']
+        css_class = ''
+        if knee and stage['index'] == knee['stage']:
+            css_class = ' class="saturation"'
+        elif knee and stage['index'] == knee['knee_stage']:
+            css_class = ' class="knee"'
+        rows.append(
+            f"<tr{css_class}><td>{stage['index'] + 1}</td><td>{stage['concurrency']}</td>"
+            f"<td>{stage['requests']}</td><td>{stage['throughput']:.1f}</td>"
+            f"<td>{percentiles['p50'] * 1000:.1f}</td><td>{percentiles['p90'] * 1000:.1f}</td>"
+            f"<td>{percentiles['p95'] * 1000:.1f}</td><td>{percentiles['p99'] * 1000:.1f}</td>"
+            f"<td>{_corrected_cell(stage, 'p95')}</td><td>{_corrected_cell(stage, 'p99')}</td>"
+            f"<td>{stage['error_rate'] * 100:.2f}%</td></tr>"
+        )
+    return "\n".join(rows)
+
+
+def write_html_report(result, path: str) -> str:
+    """Write a load result as a standalone HTML page"""
+    data = result.to_dict()
+    knee = data['saturation']
+    if knee:
+        summary = (
+            f"Saturation at <strong>{knee['concurrency']}</strong> concurrent users "
+            f"(<strong>{knee['throughput']:.1f} req/s</strong>, p{knee['percentile']:g} "
+            f"{knee['latency'] * 1000:.1f} ms). At {knee['knee_concurrency']} users latency grew "
+            f"{knee['latency_growth'] * 100:.0f}% for {knee['throughput_gain'] * 100:.0f}% more throughput."
+        )
+    else:
+        summary = "No saturation point detected: latency never grew faster than throughput."
+    settled = data.get('adaptive')
+    if settled:
+        label = f"p{settled.get('percentile', 95):g}"
+        summary += (
+            f"<br>Adaptive concurrency settled at <strong>{settled['concurrency']}</strong> in-flight "
+            f"requests (<strong>{settled['throughput']:.1f} req/s</strong>, {label} "
+            f"{settled[label] * 1000:.1f} ms, {settled['error_rate'] * 100:.2f}% errors). "
+            f"Each stage row is one limiter window."
+        )
+
+    content = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>Load Report - {html.escape(data['scenario'])}</title>
+    <style>
+        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background: #f8fafc; color: #1f2937; padding: 30px; }}
+        h1 {{ color: #667eea; }}
+        .summary {{ background: #ffffff; border-left: 4px solid #3b82f6; padding: 20px; border-radius: 8px; margin-bottom: 25px; }}
+        table {{ border-collapse: collapse; width: 100%; background: #ffffff; }}
+        th, td {{ padding: 10px 14px; border-bottom: 1px solid #e5e7eb; text-align: right; }}
+        th {{ background: #f3f4f6; text-transform: uppercase; font-size: 0.8em; letter-spacing: 1px; }}
+        tr.saturation td {{ background: #dcfce7; }}
+        tr.knee td {{ background: #fef2f2; }}
+    </style>
+</head>
+<body>
+    <h1>Load Report: {html.escape(data['scenario'])}</h1>
+    <p>{html.escape(data['profile'])} profile, started {data['started_at']},
+       {data['total_requests']} requests, {data['total_errors']} errors</p>
+    <div class="summary">{summary}</div>
+    <p>Raw percentiles time each request from when it was actually sent. Corrected percentiles
+       (fixed-rate stages only) time it from when the schedule intended to send it, so stalls
+       that delay later requests count against latency.</p>
+    <table>
+        <tr><th>Stage</th><th>Concurrency</th><th>Requests</th><th>Req/s</th>
+            <th>p50 ms</th><th>p90 ms</th><th>p95 ms</th><th>p99 ms</th>
+            <th>Corrected p95 ms</th><th>Corrected p99 ms</th><th>Errors</th></tr>
+{_stage_rows(data)}
+    </table>
+</body>
+</html>
+"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return path
+
+
+def write_load_reports(result) -> Tuple[str, str]:
+    """Write JSON and HTML load reports into the configured report directories"""
+    APITestConfig.ensure_directories()
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    base_name = f"load_{result.plan.name}_{timestamp}"
+
+    json_path = write_json_report(result, os.path.join(APITestConfig.JSON_REPORTS_DIR, f"{base_name}.json"))
+    html_path = write_html_report(result, os.path.join(APITestConfig.HTML_REPORTS_DIR, f"{base_name}.html"))
+    return json_path, html_path
@@ -0,0 +1,361 @@
+import concurrent.futures
+import datetime
+import itertools
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from config.test_config import APITestConfig
+from tests.utilities.adaptive import AIMDLimiter, settled_point
+from tests.utilities.bandwidth import measure_transfer
+from tests.utilities.latency import LatencyHistogram
+from tests.utilities.scenario import LoadPlan, PlannedRequest, RampProfile, Stage
+
+
+class LoadSample:
+    """Outcome of one planned request"""
+
+    __slots__ = ('name', 'method', 'endpoint', 'status', 'latency', 'ok', 'error', 'started',
+                 'bytes_received')
+
+    def __init__(self, name: str, method: str, endpoint: str, status: int, latency: float,
+                 ok: bool, error: Optional[str], started: float, bytes_received: int = 0):
+        self.name = name
+        self.method = method
+        self.endpoint = endpoint
+        self.status = status
+        self.latency = latency
+        self.ok = ok
+        self.error = error
+        self.started = started
+        self.bytes_received = bytes_received
+
+
+class StageResult:
+    """Throughput and latency measured for one ramp stage"""
+
+    def __init__(self, index: int, concurrency: int, rate: Optional[float] = None):
+        self.index = index
+        self.concurrency = concurrency
+        self.rate = rate
+        self.histogram = LatencyHistogram()
+        # Latency measured from the intended send time; only fixed-rate stages have one
+        self.corrected = LatencyHistogram() if rate else None
+        self.requests = 0
+        self.errors = 0
+        self.elapsed = 0.0
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    def latency_histogram(self) -> LatencyHistogram:
+        """Histogram users actually experienced: corrected when available"""
+        return self.corrected if self.corrected is not None else self.histogram
+
+    def to_dict(self) -> Dict:
+        return {
+            'index': self.index,
+            'concurrency': self.concurrency,
+            'target_rate': self.rate,
+            'requests': self.requests,
+            'errors': self.errors,
+            'error_rate': self.error_rate,
+            'elapsed': self.elapsed,
+            'throughput': self.throughput,
+            'mean': self.histogram.mean,
+            'max': self.histogram.max,
+            'percentiles': self.histogram.percentiles(),
+            'corrected_percentiles': self.corrected.percentiles() if self.corrected else None,
+        }
+
+
+class LoadResult:
+    """Outcome of a full ramp run"""
+
+    def __init__(self, plan: LoadPlan, ramp: RampProfile, stages: List[StageResult]):
+        self.plan = plan
+        self.ramp = ramp
+        self.stages = stages
+        self.started_at = datetime.datetime.now()
+        self.saturation = find_saturation_point(stages)
+        # Where an adaptive run's limiter settled; each stage is one limiter window
+        self.adaptive = settled_point(stages, ramp.adaptive.percentile) if ramp.adaptive is not None else None
+
+    @property
+    def total_requests(self) -> int:
+        return sum(stage.requests for stage in self.stages)
+
+    @property
+    def total_errors(self) -> int:
+        return sum(stage.errors for stage in self.stages)
+
+    def to_dict(self) -> Dict:
+        return {
+            'scenario': self.plan.name,
+            'profile': self.ramp.profile,
+            'started_at': self.started_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'total_requests': self.total_requests,
+            'total_errors': self.total_errors,
+            'stages': [stage.to_dict() for stage in self.stages],
+            'saturation': self.saturation,
+            'adaptive': self.adaptive,
+        }
+
+
+def execute_request(client, planned: PlannedRequest, think: bool = True) -> LoadSample:
+    """Send one planned request and time it"""
+    started = time.perf_counter()
+    try:
+        response = client.request(planned.method, planned.endpoint,
+                                  params=planned.params, data=planned.payload)
+        status = response.status_code
+        error = None
+    except Exception as e:
+        status = 0
+        error = str(e)
+        response = None
+    latency = time.perf_counter() - started
+    bytes_received = measure_transfer(response).response_bytes if response is not None else 0
+
+    if think and planned.think_time:
+        time.sleep(planned.think_time)
+
+    return LoadSample(planned.name, planned.method, planned.endpoint, status, latency,
+                      error is None and status == planned.expect_status, error, started, bytes_received)
+
+
+def run_plan(client, plan: LoadPlan, max_workers: Optional[int] = None) -> List[LoadSample]:
+    """Run every request of a plan, returning samples in plan order"""
+    workers = max_workers or plan.ramp.stages[0].concurrency
+    # Load is meant to reach the API, so identical requests are never coalesced
+    with client.suspend_single_flight():
+        if workers <= 1:
+            return [execute_request(client, planned) for planned in plan]
+
+        execute = lambda planned: execute_request(client, planned)
+        if plan.ramp.adaptive is not None:
+            limiter = AIMDLimiter.from_settings(plan.ramp.adaptive)
+
+            def execute(planned):
+                limiter.acquire()
+                try:
+                    sample = execute_request(client, planned, think=False)
+                finally:
+                    limiter.release()
+                limiter.record(sample.latency, sample.ok)
+                # Think outside the slot: a thinking user has no request in flight
+                if planned.think_time:
+                    time.sleep(planned.think_time)
+                return sample
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(execute, plan))
+
+
+def _stage_worker(client, plan: LoadPlan, cursor, quota, deadline: Optional[float],
+                  stop_event: threading.Event, on_sample: Optional[Callable],
+                  schedule=None, started: float = 0.0, interval: float = 0.0):
+    """Issue requests until the stage deadline or request quota is reached
+
+    With a schedule, request N is due at ``started + N * interval``. Workers
+    sleep until the due time but never skip a slot, so when the API stalls
+    the backlog shows up in the corrected latency instead of disappearing.
+    """
+    histogram = LatencyHistogram()
+    corrected = LatencyHistogram() if schedule is not None else None
+    requests = 0
+    errors = 0
+    plan_size = len(plan.requests)
+
+    while not stop_event.is_set():
+        intended = None
+        if schedule is not None:
+            intended = started + next(schedule) * interval
+            if deadline is not None and intended >= deadline:
+                break
+
+        if deadline is not None:
+            if intended is None and time.perf_counter() >= deadline:
+                break
+        elif next(quota) <= 0:
+            break
+
+        if intended is not None:
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        planned = plan.requests[next(cursor) % plan_size]
+        sample = execute_request(client, planned, think=schedule is None)
+        histogram.record(sample.latency)
+        if corrected is not None:
+            corrected.record(max(sample.started + sample.latency - intended, sample.latency))
+        requests += 1
+        if not sample.ok:
+            errors += 1
+        if on_sample:
+            on_sample(sample)
+
+    return histogram, corrected, requests, errors
+
+
+def run_stage(client, plan: LoadPlan, stage: Stage, index: int = 0, cursor=None,
+              requests: Optional[int] = None, stop_event: Optional[threading.Event] = None,
+              on_sample: Optional[Callable] = None) -> StageResult:
+    """Run one stage at a fixed concurrency
+
+    When the stage has a target ``rate`` the workers follow a fixed-rate
+    schedule (open model) and the result carries a coordinated-omission
+    corrected histogram next to the raw service-time one.
+    """
+    cursor = cursor if cursor is not None else itertools.count()
+    stop_event = stop_event or threading.Event()
+    quota = itertools.count(requests or len(plan), -1)
+    result = StageResult(index, stage.concurrency, stage.rate)
+    schedule = itertools.count() if stage.rate else None
+    interval = 1.0 / stage.rate if stage.rate else 0.0
+
+    started = time.perf_counter()
+    deadline = started + stage.duration if stage.duration else None
+    # Load is meant to reach the API, so identical requests are never coalesced
+    with client.suspend_single_flight(), \
+            concurrent.futures.ThreadPoolExecutor(max_workers=stage.concurrency) as executor:
+        futures = [
+            executor.submit(_stage_worker, client, plan, cursor, quota, deadline, stop_event,
+                            on_sample, schedule, started, interval)
+            for _ in range(stage.concurrency)
+        ]
+        for future in futures:
+            histogram, corrected, worker_requests, worker_errors = future.result()
+            result.histogram.merge(histogram)
+            if corrected is not None:
+                result.corrected.merge(corrected)
+            result.requests += worker_requests
+            result.errors += worker_errors
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def run_adaptive(client, plan: LoadPlan, ramp: Optional[RampProfile] = None,
+                 stop_event: Optional[threading.Event] = None,
+                 on_stage: Optional[Callable] = None, on_sample: Optional[Callable] = None) -> LoadResult:
+    """Run a plan under an AIMD limit on in-flight requests
+
+    Threads are sized for the maximum concurrency and the limiter decides how
+    many may send at once. Every limiter window becomes one StageResult whose
+    concurrency is the limit in force, so knee detection, live views and
+    reports read it like any other ramp.
+    """
+    ramp = ramp or plan.ramp
+    stop_event = stop_event or threading.Event()
+    limiter = AIMDLimiter.from_settings(ramp.adaptive)
+    cursor = itertools.count()
+    quota = itertools.count(len(plan), -1)
+    stage = ramp.stages[0]
+    started = time.perf_counter()
+    deadline = started + stage.duration if stage.duration else None
+    plan_size = len(plan.requests)
+    stages: List[StageResult] = []
+    stages_lock = threading.Lock()
+
+    def close(window):
+        if window is None:
+            return
+        with stages_lock:
+            result = StageResult(len(stages), window['concurrency'])
+            result.histogram = window['histogram']
+            result.requests = window['requests']
+            result.errors = window['errors']
+            result.elapsed = window['elapsed']
+            stages.append(result)
+            if on_stage:
+                on_stage(result)
+
+    def worker():
+        while not stop_event.is_set():
+            limiter.acquire()
+            try:
+                if deadline is not None:
+                    if time.perf_counter() >= deadline:
+                        break
+                elif next(quota) <= 0:
+                    break
+                planned = plan.requests[next(cursor) % plan_size]
+                sample = execute_request(client, planned, think=False)
+            finally:
+                limiter.release()
+            close(limiter.record(sample.latency, sample.ok))
+            if on_sample:
+                on_sample(sample)
+            # Think outside the slot: a thinking user has no request in flight
+            if planned.think_time:
+                time.sleep(planned.think_time)
+
+    with client.suspend_single_flight(), \
+            concurrent.futures.ThreadPoolExecutor(max_workers=stage.concurrency) as executor:
+        for future in [executor.submit(worker) for _ in range(stage.concurrency)]:
+            future.result()
+    close(limiter.flush())
+
+    return LoadResult(plan, ramp, stages)
+
+
+def run_ramp(client, plan: LoadPlan, ramp: Optional[RampProfile] = None,
+             stop_event: Optional[threading.Event] = None,
+             on_stage: Optional[Callable] = None, on_sample: Optional[Callable] = None) -> LoadResult:
+    """Run a plan through every stage of its ramp profile"""
+    ramp = ramp or plan.ramp
+    if ramp.adaptive is not None:
+        return run_adaptive(client, plan, ramp, stop_event, on_stage, on_sample)
+    stop_event = stop_event or threading.Event()
+    cursor = itertools.count()
+    per_stage = math.ceil(len(plan) / len(ramp.stages))
+
+    stages = []
+    for index, stage in enumerate(ramp.stages):
+        if stop_event.is_set():
+            break
+        result = run_stage(client, plan, stage, index, cursor, per_stage, stop_event, on_sample)
+        stages.append(result)
+        if on_stage:
+            on_stage(result)
+
+    return LoadResult(plan, ramp, stages)
+
+
+def find_saturation_point(stages: List[StageResult], percentile: Optional[float] = None,
+                          tolerance: Optional[float] = None) -> Optional[Dict]:
+    """Find the knee where latency starts growing faster than throughput
+
+    Returns the last stage before the knee (the highest load the API absorbed
+    efficiently) or None when latency never outpaced throughput.
+    """
+    percentile = percentile or APITestConfig.LOAD_KNEE_PERCENTILE
+    tolerance = APITestConfig.LOAD_KNEE_TOLERANCE if tolerance is None else tolerance
+
+    for previous, current in zip(stages, stages[1:]):
+        previous_latency = previous.latency_histogram().percentile(percentile)
+        if not previous.throughput or not previous_latency or not current.requests:
+            continue
+
+        throughput_gain = current.throughput / previous.throughput - 1
+        latency_growth = current.latency_histogram().percentile(percentile) / previous_latency - 1
+        if latency_growth > tolerance and latency_growth > throughput_gain:
+            return {
+                'stage': previous.index,
+                'concurrency': previous.concurrency,
+                'throughput': previous.throughput,
+                'latency': previous_latency,
+                'percentile': percentile,
+                'knee_stage': current.index,
+                'knee_concurrency': current.concurrency,
+                'throughput_gain': throughput_gain,
+                'latency_growth': latency_growth,
+            }
+    return None
@@ -0,0 +1,285 @@
+"""Opt-in profiling: per-test phase timers and a sampling profiler
+
+Instrumented code calls ``phase(name)`` or is decorated with ``timed(name)``.
+Both cost one global lookup while no profiler is active. Inside a
+``ProfilingSession`` the time spent in each phase is attributed to the test
+that was running. The optional sampling profiler writes folded stacks that
+flamegraph.pl, speedscope and inferno read directly.
+"""
+import collections
+import contextlib
+import datetime
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+from config.test_config import APITestConfig
+
+# Instrumented phases, in the order they appear in the breakdown table
+PHASES = ('network', 'decode', 'validate', 'report')
+
+# Time spent outside any test (e.g. writing reports) is attributed here
+SESSION = '<session>'
+
+_NULL_PHASE = contextlib.nullcontext()
+
+
+class _Phase:
+    """Times one phase; nested entries into the same phase on a thread count once"""
+
+    __slots__ = ('profiler', 'name', 'test', 'outermost')
+
+    def __init__(self, profiler: 'PhaseProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        active = self.profiler._active_phases()
+        self.outermost = self.name not in active
+        if self.outermost:
+            active.add(self.name)
+            self.test = self.profiler.open(self.name)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.outermost:
+            self.profiler.close(self.test, self.name)
+            self.profiler._active_phases().discard(self.name)
+
+
+class PhaseProfiler:
+    """Wall time per test spent in each instrumented phase
+
+    A phase open on several threads at once (a batch's requests, a load
+    plan's workers) counts the wall time while any of them is open, not the
+    sum, so no phase exceeds the test's duration. ``busy`` is the same union
+    over all phases; whatever is left of the test's duration is 'other'.
+    """
+
+    def __init__(self):
+        self.current = SESSION
+        self.durations: Dict[str, float] = collections.defaultdict(float)
+        self.phases: Dict[str, Dict[str, float]] = collections.defaultdict(
+            lambda: dict.fromkeys(PHASES, 0.0))
+        self.busy: Dict[str, float] = collections.defaultdict(float)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # (test, phase) -> threads inside it and when the first one entered;
+        # phase None stands for any phase
+        self._open: Dict[tuple, int] = collections.Counter()
+        self._opened: Dict[tuple, float] = {}
+
+    def _active_phases(self) -> set:
+        active = getattr(self._local, 'phases', None)
+        if active is None:
+            active = self._local.phases = set()
+        return active
+
+    def phase(self, name: str) -> _Phase:
+        return _Phase(self, name)
+
+    def open(self, name: str) -> str:
+        """Enter a phase of the running test on this thread; returns the test it counts for"""
+        with self._lock:
+            test = self.current
+            now = time.perf_counter()
+            for key in ((test, name), (test, None)):
+                self._open[key] += 1
+                if self._open[key] == 1:
+                    self._opened[key] = now
+            return test
+
+    def close(self, test: str, name: str):
+        """Leave a phase; its time is counted once the last thread inside it leaves"""
+        with self._lock:
+            now = time.perf_counter()
+            for key in ((test, name), (test, None)):
+                self._open[key] -= 1
+                if self._open[key]:
+                    continue
+                del self._open[key]
+                elapsed = now - self._opened.pop(key)
+                if key[1] is None:
+                    self.busy[test] += elapsed
+                else:
+                    self.phases[test][name] += elapsed
+
+    def instrument_response(self, response):
+        """Count the response's ``json()`` decoding as the decode phase"""
+        decode = response.json
+
+        def timed_json(**kwargs):
+            with self.phase('decode'):
+                return decode(**kwargs)
+
+        response.json = timed_json
+        return response
+
+    def pytest_plugin(self):
+        """Plugin that tracks the running test and times pytest's own report writing"""
+        import pytest
+
+        profiler = self
+
+        class PhaseProfilerPlugin:
+            def pytest_runtest_logstart(self, nodeid, location):
+                profiler.current = nodeid
+
+            def pytest_runtest_logreport(self, report):
+                profiler.durations[report.nodeid] += report.duration
+
+            def pytest_runtest_logfinish(self, nodeid, location):
+                profiler.current = SESSION
+
+            # pytest-html, JUnit XML and JSON reports are written at session finish
+            @pytest.hookimpl(hookwrapper=True)
+            def pytest_sessionfinish(self, session, exitstatus):
+                with profiler.phase('report'):
+                    yield
+
+        return PhaseProfilerPlugin()
+
+    def rows(self) -> List[Dict]:
+        """One row per test (and the session), with unattributed time as 'other'"""
+        rows = []
+        for test in list(self.durations) + ([SESSION] if SESSION in self.phases else []):
+            phases = dict(self.phases.get(test) or dict.fromkeys(PHASES, 0.0))
+            busy = self.busy.get(test, 0.0)
+            duration = self.durations.get(test, busy)
+            rows.append(dict(test=test, duration=duration, **phases, other=max(0.0, duration - busy)))
+        return rows
+
+    def format_table(self, limit: int = 20) -> str:
+        rows = self.rows()
+        columns = PHASES + ('other',)
+        lines = [f"{'Test':<60} {'Total':>8} " + " ".join(f"{column:>8}" for column in columns)]
+        for row in sorted(rows, key=lambda row: -row['duration'])[:limit]:
+            name = row['test'] if len(row['test']) <= 60 else "…" + row['test'][-59:]
+            lines.append(f"{name:<60} {row['duration']:8.3f} " +
+                         " ".join(f"{row[column]:8.3f}" for column in columns))
+        totals = {column: sum(row[column] for row in rows) for column in ('duration',) + columns}
+        lines.append(f"{'TOTAL (s)':<60} {totals['duration']:8.3f} " +
+                     " ".join(f"{totals[column]:8.3f}" for column in columns))
+        return "\n".join(lines)
+
+
+class SamplingProfiler:
+    """Background thread that samples every thread's stack into folded-stack counts"""
+
+    def __init__(self, interval: float = None):
+        self.interval = interval or APITestConfig.PROFILE_SAMPLE_INTERVAL
+        self.stacks: Dict[str, int] = collections.Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def start(self) -> 'SamplingProfiler':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write_folded(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+# Profiler instrumented code reports to while a profiling session is active
+_active_profiler: Optional[PhaseProfiler] = None
+
+
+def get_active_profiler() -> Optional[PhaseProfiler]:
+    return _active_profiler
+
+
+def set_active_profiler(profiler: Optional[PhaseProfiler]):
+    global _active_profiler
+    _active_profiler = profiler
+
+
+def phase(name: str):
+    """Context manager timing a phase of the running test; a no-op when not profiling"""
+    profiler = _active_profiler
+    return profiler.phase(name) if profiler is not None else _NULL_PHASE
+
+
+def timed(name: str):
+    """Decorator form of ``phase``"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _active_profiler
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class ProfilingSession:
+    """Activate phase timers (and optionally sampling) and write the results to reports/profile"""
+
+    def __init__(self, name: str = 'run', sample: bool = False, directory: str = None):
+        self.name = name
+        self.profiler = PhaseProfiler()
+        self.sampler = SamplingProfiler() if sample else None
+        self.directory = directory or APITestConfig.PROFILE_DIR
+        self.paths: Dict[str, str] = {}
+
+    def __enter__(self) -> 'ProfilingSession':
+        set_active_profiler(self.profiler)
+        if self.sampler is not None:
+            self.sampler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.sampler is not None:
+            self.sampler.stop()
+        set_active_profiler(None)
+        self.write()
+
+    def write(self):
+        os.makedirs(self.directory, exist_ok=True)
+        stem = os.path.join(self.directory, f"{self.name}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        table = self.profiler.format_table()
+
+        self.paths['phases'] = f"{stem}_phases.json"
+        with open(self.paths['phases'], 'w', encoding='utf-8') as f:
+            json.dump({'phases': list(PHASES), 'tests': self.profiler.rows()}, f, indent=2)
+        self.paths['table'] = f"{stem}_phases.txt"
+        with open(self.paths['table'], 'w', encoding='utf-8') as f:
+            f.write(table + "\n")
+        if self.sampler is not None:
+            self.paths['folded'] = f"{stem}.folded"
+            self.sampler.write_folded(self.paths['folded'])
+
+        print("\n⏱️  Time per phase (s):")
+        print(table)
+        for kind, path in self.paths.items():
+            print(f"📄 Profile {kind}: {path}")
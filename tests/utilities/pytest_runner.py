@@ -0,0 +1,252 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from config.test_config import APITestConfig
+from tests.utilities.bandwidth import BandwidthTracker, EndpointBandwidth, TransferSizes
+from tests.utilities.capture import CaptureStore
+from tests.utilities.profiling import get_active_profiler
+from tests.utilities.results import (
+    ResultRecord, PASSED, FAILED, ERROR, SKIPPED, XFAILED, XPASSED, FLAKY, normalize_endpoint
+)
+
+# pytest's exit code for a run that broke down before reporting results
+INTERNAL_ERROR = 3
+
+
+class RunResult:
+    """Structured outcome of an in-process pytest run"""
+
+    def __init__(self, exit_code: int, records: List[ResultRecord], duration: float,
+                 report_paths: Dict[str, str], started: Optional[float] = None,
+                 bandwidth: Optional[List[EndpointBandwidth]] = None,
+                 cold_starts: Optional[List] = None, coalesced: Optional[Dict[str, Dict]] = None,
+                 captures: Optional[Dict] = None):
+        self.exit_code = exit_code
+        self.records = records
+        self.duration = duration
+        self.report_paths = report_paths
+        self.started = started if started is not None else time.time() - duration
+        self.bandwidth = bandwidth if bandwidth is not None else []
+        self.cold_starts = cold_starts if cold_starts is not None else []
+        self.coalesced = coalesced if coalesced is not None else {}
+        self.captures = captures
+
+    def count(self, *statuses: str) -> int:
+        return sum(1 for record in self.records if record.status in statuses)
+
+    @property
+    def passed(self) -> int:
+        return self.count(PASSED)
+
+    @property
+    def failed(self) -> int:
+        return self.count(FAILED, ERROR, XPASSED)
+
+    @property
+    def skipped(self) -> int:
+        return self.count(SKIPPED, XFAILED)
+
+    @property
+    def flaky(self) -> int:
+        return self.count(FLAKY)
+
+    def statistics(self):
+        """Test and per-endpoint request statistics for this run"""
+        from tests.utilities.stats import summarize_records
+        return summarize_records(self.records, self.duration)
+
+    def to_dict(self) -> Dict:
+        return {
+            'exit_code': self.exit_code,
+            'duration': self.duration,
+            'passed': self.passed,
+            'failed': self.failed,
+            'skipped': self.skipped,
+            'flaky': self.flaky,
+            'report_paths': self.report_paths,
+            'statistics': self.statistics().to_dict(),
+            'bandwidth': [totals.to_dict() for totals in self.bandwidth],
+            'cold_starts': [cold_start.to_dict() for cold_start in self.cold_starts],
+            'coalesced': self.coalesced,
+            'captures': self.captures,
+            'records': [record.to_dict() for record in self.records],
+            'started': self.started,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RunResult':
+        """Rebuild a RunResult written by ``to_dict``, e.g. by a run in another process"""
+        from tests.utilities.api_client import WarmUpResult
+
+        cold_starts = [WarmUpResult(**{name: cold_start[name] for name in WarmUpResult.__slots__})
+                       for cold_start in data.get('cold_starts', [])]
+        return cls(data['exit_code'], [ResultRecord.from_dict(record) for record in data['records']],
+                   data['duration'], data['report_paths'], data.get('started'),
+                   [EndpointBandwidth.from_dict(totals) for totals in data.get('bandwidth', [])],
+                   cold_starts, data.get('coalesced'), data.get('captures'))
+
+
+class ResultCollector:
+    """Pytest plugin that turns every test into a ResultRecord with its API request timings"""
+
+    def __init__(self, capture: Optional[CaptureStore] = None):
+        self.records: List[ResultRecord] = []
+        self.report_paths: Dict[str, str] = {}
+        self.exit_status: Optional[int] = None
+        self.bandwidth = BandwidthTracker()
+        self.cold_starts: List = []
+        self.coalesced: Dict[str, Dict] = {}
+        self.capture = capture if capture is not None else (
+            CaptureStore() if APITestConfig.CAPTURE_REQUESTS else None)
+        self._lock = threading.Lock()
+        self._descriptions: Dict[str, str] = {}
+        self._current: Optional[ResultRecord] = None
+
+    def record_request(self, method: str, endpoint: str, status: int, elapsed: float,
+                       retries: int = 0, error: Optional[str] = None,
+                       sizes: Optional[TransferSizes] = None):
+        """Called by APITestClient for every request made while a test runs"""
+        if sizes is not None:
+            self.bandwidth.record(method, normalize_endpoint(endpoint), sizes)
+        current = self._current
+        if current is None:
+            return
+        # Batched and load-plan requests report from worker threads
+        with self._lock:
+            if sizes is None:
+                current.add_request(method, endpoint, status, elapsed, retries)
+            else:
+                current.add_request(method, endpoint, status, elapsed, retries, sizes.request_bytes,
+                                    sizes.response_bytes, sizes.decoded_bytes)
+
+    def capture_response(self, method: str, url: str, elapsed: float, response=None,
+                         error: Optional[str] = None):
+        """Called by APITestClient with every finished request, for failure diagnostics"""
+        if self.capture is not None:
+            current = self._current
+            self.capture.capture(method, url, elapsed, response, error,
+                                 current.nodeid if current is not None else None)
+
+    def record_cold_start(self, cold_start):
+        """Called by APITestClient.warm_up(); kept apart from the timed requests"""
+        with self._lock:
+            self.cold_starts.append(cold_start)
+
+    def record_coalesced(self, method: str, endpoint: str, waited: float):
+        """Called by APITestClient when a request shared an identical in-flight one"""
+        key = f"{method} {normalize_endpoint(endpoint)}"
+        with self._lock:
+            saved = self.coalesced.setdefault(key, {'saved_calls': 0, 'waited': 0.0})
+            saved['saved_calls'] += 1
+            saved['waited'] += waited
+
+    def pytest_configure(self, config):
+        set_active_collector(self)
+        option = config.option
+        for report_type, attribute in (('html', 'htmlpath'), ('junit_xml', 'xmlpath'),
+                                       ('json', 'json_report_file')):
+            path = getattr(option, attribute, None)
+            if path and (report_type != 'json' or getattr(option, 'json_report', False)):
+                self.report_paths[report_type] = path
+
+    def pytest_unconfigure(self, config):
+        if get_active_collector() is self:
+            set_active_collector(None)
+
+    def pytest_collection_modifyitems(self, items):
+        for item in items:
+            doc = getattr(getattr(item, 'function', None), '__doc__', None) or ""
+            self._descriptions[item.nodeid] = doc.strip().split('\n')[0]
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        self._current = ResultRecord(nodeid.split('::')[-1], self._descriptions.get(nodeid, ""),
+                                     nodeid=nodeid, started=time.time())
+
+    def pytest_runtest_logreport(self, report):
+        current = self._current
+        if current is None or current.nodeid != report.nodeid:
+            return
+        current.duration += report.duration
+
+        if hasattr(report, 'wasxfail'):
+            current.status = XFAILED if report.skipped else XPASSED
+        elif report.failed:
+            current.status = FAILED if report.when == 'call' else ERROR
+            current.error = report.longreprtext
+        elif report.skipped:
+            current.status = SKIPPED
+            current.details = report.longrepr[-1] if isinstance(report.longrepr, tuple) else None
+
+    def pytest_runtest_logfinish(self, nodeid, location):
+        current = self._current
+        if current is not None and current.nodeid == nodeid:
+            if self.capture is not None:
+                current.captures = self.capture.finish_test(nodeid)
+            if current.details is None:
+                current.details = (f"{len(current.timings)} request(s), "
+                                   f"{current.request_time:.3f}s waiting on the API")
+            self.records.append(current)
+            self._current = None
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        self.exit_status = int(exitstatus)
+
+
+# Collector the API client reports requests to while a run is in progress
+_active_collector: Optional[ResultCollector] = None
+
+
+def get_active_collector() -> Optional[ResultCollector]:
+    return _active_collector
+
+
+def set_active_collector(collector: Optional[ResultCollector]):
+    global _active_collector
+    _active_collector = collector
+
+
+def run_pytest_with_coverage(args: Iterable[str]) -> RunResult:
+    """Run pytest with ``--cov`` options in a fresh interpreter and return its results
+
+    pytest-cov starts measuring only once pytest is configured, and by then
+    this process has already imported tests.utilities, so module-level lines
+    would count as uncovered. ``tests.utilities.coverage_runner`` starts
+    coverage before importing anything under tests/ instead.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'result.json')
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+            filter(None, [APITestConfig.PROJECT_ROOT, os.environ.get('PYTHONPATH')])))
+        subprocess.run([sys.executable, '-m', 'tests.utilities.coverage_runner', '--output', output, *args],
+                       env=env)
+        if not os.path.exists(output):
+            # The runner failed before pytest ran, e.g. coverage is not installed
+            return RunResult(INTERNAL_ERROR, [], 0.0, {})
+        with open(output, 'r', encoding='utf-8') as f:
+            return RunResult.from_dict(json.load(f))
+
+
+def run_pytest(args: Iterable[str], plugins: Optional[List] = None) -> RunResult:
+    """Run pytest in this process and return structured per-test results"""
+    import pytest
+
+    collector = ResultCollector()
+    plugins = [collector] + list(plugins or [])
+    profiler = get_active_profiler()
+    if profiler is not None:
+        plugins.append(profiler.pytest_plugin())
+    if collector.capture is not None:
+        plugins.append(collector.capture.pytest_plugin())
+    started = time.perf_counter()
+    started_at = time.time()
+    exit_code = int(pytest.main(list(args), plugins=plugins))
+    return RunResult(exit_code, collector.records, time.perf_counter() - started,
+                     collector.report_paths, started_at, collector.bandwidth.endpoints(),
+                     collector.cold_starts, collector.coalesced,
+                     collector.capture.summary() if collector.capture is not None else None)
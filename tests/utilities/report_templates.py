@@ -0,0 +1,70 @@
+import functools
+import hashlib
+import os
+from string import Template
+from typing import Dict
+
+from config.test_config import APITestConfig
+
+# Static assets shared by every report: name -> (asset file, inline wrapper, link wrapper)
+ASSETS = {
+    'styles': ('report.css', "<style>\n{content}</style>", '<link rel="stylesheet" href="{href}">'),
+    'scripts': ('report.js', "<script>\n{content}</script>", '<script src="{href}"></script>'),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def load_template(name: str) -> Template:
+    """Read and compile an HTML fragment once per process"""
+    with open(os.path.join(APITestConfig.REPORT_TEMPLATES_DIR, name), 'r', encoding='utf-8') as f:
+        return Template(f.read())
+
+
+@functools.lru_cache(maxsize=None)
+def load_asset(name: str) -> str:
+    with open(os.path.join(APITestConfig.REPORT_TEMPLATES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=None)
+def _asset_file_name(name: str) -> str:
+    """Content-hashed file name, so a changed asset never hits a stale browser cache"""
+    digest = hashlib.sha256(load_asset(name).encode('utf-8')).hexdigest()[:12]
+    stem, extension = os.path.splitext(name)
+    return f"{stem}-{digest}{extension}"
+
+
+def _publish_assets(assets_dir: str) -> Dict[str, str]:
+    """Write each hashed asset to ``assets_dir`` unless it is already there"""
+    os.makedirs(assets_dir, exist_ok=True)
+    paths = {}
+    for key, (name, _, _) in ASSETS.items():
+        path = os.path.join(assets_dir, _asset_file_name(name))
+        if not os.path.exists(path):
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(load_asset(name))
+            os.replace(tmp_path, path)
+        paths[key] = path
+    return paths
+
+
+def asset_tags(output_file: str, self_contained: bool = False) -> Dict[str, str]:
+    """``<style>``/``<script>`` markup for a report written to ``output_file``
+
+    Shared mode links the hashed files in ``<report dir>/assets``; self-contained
+    mode inlines them so the report can be moved or mailed on its own.
+    """
+    if self_contained:
+        return {key: inline.format(content=load_asset(name)) for key, (name, inline, _) in ASSETS.items()}
+
+    report_dir = os.path.dirname(os.path.abspath(output_file))
+    paths = _publish_assets(os.path.join(report_dir, APITestConfig.REPORT_ASSETS_SUBDIR))
+    return {
+        key: link.format(href=os.path.relpath(paths[key], report_dir).replace(os.sep, '/'))
+        for key, (_, _, link) in ASSETS.items()
+    }
+
+
+def render(template: str, **values) -> str:
+    return load_template(template).substitute(values)
@@ -0,0 +1,430 @@
+import array
+import bisect
+import importlib.util
+import json
+import math
+import mmap
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from tests.utilities.results import normalize_endpoint
+from tests.utilities.stats import DEFAULT_PERCENTILES, GroupStats, aggregate
+
+HAS_NUMPY = importlib.util.find_spec('numpy') is not None
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+# Column name -> array typecode. Every column is a flat native-endian file that
+# is appended during the run and memory-mapped for analysis.
+SCHEMA = {
+    'started': 'd',         # wall-clock send time, epoch seconds
+    'latency': 'd',         # seconds
+    'status': 'H',          # HTTP status, 0 for transport errors
+    'ok': 'B',              # 1 when the response matched expectations
+    'method': 'B',          # index into the method dictionary
+    'endpoint': 'I',        # index into the endpoint dictionary
+    'bytes_received': 'Q',  # response bytes on the wire
+}
+
+META_FILE = 'meta.json'
+
+
+class ColumnarResultWriter:
+    """Append-only, column-per-file sample writer
+
+    Rows are buffered in typed arrays and appended to the column files every
+    ``flush_every`` rows, so a run can be analysed while it is still going.
+    """
+
+    def __init__(self, path: str, flush_every: int = 10000):
+        self.path = path
+        self.flush_every = flush_every
+        self.rows = 0
+        self._lock = threading.Lock()
+        self._buffers = {name: array.array(typecode) for name, typecode in SCHEMA.items()}
+        self._dictionaries: Dict[str, Dict[str, int]] = {'method': {}, 'endpoint': {}}
+        # LoadSample.started is a perf_counter reading; convert to wall-clock time
+        self._clock_offset = time.time() - time.perf_counter()
+        os.makedirs(path, exist_ok=True)
+
+    def _code(self, column: str, value: str) -> int:
+        codes = self._dictionaries[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+        return code
+
+    def append(self, started: float, latency: float, status: int, ok: bool, method: str,
+               endpoint: str, bytes_received: int = 0):
+        """Append one row; ``started`` is wall-clock epoch seconds"""
+        with self._lock:
+            buffers = self._buffers
+            buffers['started'].append(started)
+            buffers['latency'].append(latency)
+            buffers['status'].append(status)
+            buffers['ok'].append(1 if ok else 0)
+            buffers['method'].append(self._code('method', method))
+            buffers['endpoint'].append(self._code('endpoint', normalize_endpoint(endpoint)))
+            buffers['bytes_received'].append(bytes_received)
+            if len(buffers['latency']) >= self.flush_every:
+                self._flush()
+
+    def append_sample(self, sample):
+        """on_sample hook for load runs"""
+        self.append(sample.started + self._clock_offset, sample.latency, sample.status, sample.ok,
+                    sample.method, sample.endpoint, sample.bytes_received)
+
+    def _flush(self):
+        pending = len(self._buffers['latency'])
+        for name, buffer in self._buffers.items():
+            if pending:
+                with open(os.path.join(self.path, f"{name}.bin"), 'ab') as f:
+                    buffer.tofile(f)
+            self._buffers[name] = array.array(SCHEMA[name])
+        self.rows += pending
+
+        meta = {
+            'schema': SCHEMA,
+            'rows': self.rows,
+            'dictionaries': {
+                column: sorted(codes, key=codes.get) for column, codes in self._dictionaries.items()
+            },
+        }
+        tmp_path = os.path.join(self.path, META_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(self.path, META_FILE))
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ColumnarResultReader:
+    """Memory-mapped, read-only view over one store written by ColumnarResultWriter"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, META_FILE), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.rows = meta['rows']
+        self.dictionaries: Dict[str, List[str]] = meta['dictionaries']
+        self._maps: Dict[str, mmap.mmap] = {}
+        self._columns: Dict[str, memoryview] = {}
+
+    def column(self, name: str) -> Sequence:
+        """Zero-copy view of a column (a NumPy array when NumPy is installed)"""
+        if name not in self._columns:
+            typecode = SCHEMA[name]
+            size = self.rows * array.array(typecode).itemsize
+            if size == 0:
+                view = memoryview(array.array(typecode))
+            else:
+                with open(os.path.join(self.path, f"{name}.bin"), 'rb') as f:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._maps[name] = mapped
+                view = memoryview(mapped)[:size].cast(typecode)
+            self._columns[name] = view
+        view = self._columns[name]
+        if HAS_NUMPY:
+            import numpy
+            return numpy.frombuffer(view, dtype=view.format)
+        return view
+
+    def decode(self, column: str, code: int) -> str:
+        return self.dictionaries[column][code]
+
+    def code(self, column: str, value: str) -> Optional[int]:
+        try:
+            return self.dictionaries[column].index(value)
+        except ValueError:
+            return None
+
+    def close(self):
+        for view in self._columns.values():
+            view.release()
+        for mapped in self._maps.values():
+            mapped.close()
+        self._columns.clear()
+        self._maps.clear()
+
+
+class ResultQuery:
+    """Filtered selection of rows across one or more stores
+
+    Each selection is a boolean mask over the reader's rows when NumPy is
+    installed, and a list of row indices otherwise.
+    """
+
+    def __init__(self, selections: List[Tuple[ColumnarResultReader, Sequence]]):
+        self._selections = selections
+
+    def count(self) -> int:
+        if HAS_NUMPY:
+            import numpy
+            return sum(int(numpy.count_nonzero(mask)) for _, mask in self._selections)
+        return sum(len(indices) for _, indices in self._selections)
+
+    def _selected(self, column: str):
+        """Selected raw values of a column as one NumPy array"""
+        import numpy
+        parts = [reader.column(column)[mask] for reader, mask in self._selections]
+        return numpy.concatenate(parts) if parts else numpy.empty(0, dtype=SCHEMA[column])
+
+    def values(self, column: str) -> List:
+        """Selected values of a column (decoded for dictionary columns)"""
+        values = []
+        for reader, selection in self._selections:
+            data = reader.column(column)
+            if HAS_NUMPY:
+                import numpy
+                if column in reader.dictionaries:
+                    names = numpy.asarray(reader.dictionaries[column], dtype=object)
+                    values.extend(names[data[selection]].tolist())
+                else:
+                    values.extend(data[selection].tolist())
+            elif column in reader.dictionaries:
+                values.extend(reader.decode(column, int(data[i])) for i in selection)
+            else:
+                values.extend(data[i] for i in selection)
+        return values
+
+    def latencies(self) -> List[float]:
+        if HAS_NUMPY:
+            import numpy
+            return numpy.sort(self._selected('latency')).tolist()
+        return sorted(float(value) for value in self.values('latency'))
+
+    def percentile(self, percentile: float) -> float:
+        if HAS_NUMPY:
+            import numpy
+            latencies = self._selected('latency')
+            if not latencies.size:
+                return 0.0
+            rank = max(1, math.ceil(latencies.size * percentile / 100.0))
+            return float(numpy.partition(latencies, rank - 1)[rank - 1])
+        latencies = self.latencies()
+        if not latencies:
+            return 0.0
+        rank = max(1, math.ceil(len(latencies) * percentile / 100.0))
+        return latencies[rank - 1]
+
+    def error_rate(self) -> float:
+        if HAS_NUMPY:
+            ok = self._selected('ok')
+            return float(ok.size - ok.sum()) / ok.size if ok.size else 0.0
+        ok = self.values('ok')
+        return (len(ok) - sum(ok)) / len(ok) if ok else 0.0
+
+    def percentiles_by_window(self, window: float,
+                              percentiles: Sequence[float] = (50, 95, 99)) -> List[Dict]:
+        """Latency percentiles per fixed time window, in time order"""
+        if HAS_NUMPY:
+            return self._numpy_percentiles_by_window(window, percentiles)
+        rows = sorted(zip(self.values('started'), self.values('latency')))
+        if not rows:
+            return []
+        origin = rows[0][0]
+        starts = [started for started, _ in rows]
+        windows = []
+        index = 0
+        while index < len(rows):
+            window_start = origin + len(windows) * window
+            end = bisect.bisect_left(starts, window_start + window, index)
+            latencies = sorted(latency for _, latency in rows[index:end])
+            entry = {'start': window_start, 'count': len(latencies)}
+            for p in percentiles:
+                entry[f"p{p:g}"] = (
+                    latencies[max(1, math.ceil(len(latencies) * p / 100.0)) - 1] if latencies else 0.0
+                )
+            windows.append(entry)
+            index = end
+        return windows
+
+    def _numpy_percentiles_by_window(self, window: float, percentiles: Sequence[float]) -> List[Dict]:
+        import numpy
+
+        started, latency = self._selected('started'), self._selected('latency')
+        if not started.size:
+            return []
+        order = numpy.argsort(started, kind='stable')
+        started, latency = started[order], latency[order]
+        origin = float(started[0])
+        # Same window edges as the Python path, so rows on a boundary land in the same window
+        count = int((started[-1] - origin) // window) + 1
+        while True:
+            window_starts = origin + numpy.arange(count) * window
+            ends = numpy.searchsorted(started, window_starts + window, side='left')
+            if ends[-1] >= started.size:
+                break
+            count += 1
+        begins = numpy.concatenate(([0], ends[:-1]))
+
+        windows = []
+        for window_start, begin, end in zip(window_starts.tolist(), begins.tolist(), ends.tolist()):
+            entry = {'start': window_start, 'count': end - begin}
+            if end > begin:
+                ranks = [max(1, math.ceil((end - begin) * p / 100.0)) - 1 for p in percentiles]
+                values = numpy.partition(latency[begin:end], sorted(set(ranks)))
+                for p, rank in zip(percentiles, ranks):
+                    entry[f"p{p:g}"] = float(values[rank])
+            else:
+                for p in percentiles:
+                    entry[f"p{p:g}"] = 0.0
+            windows.append(entry)
+        return windows
+
+
+class ResultStore:
+    """Query API over a store directory, or a directory of per-worker shards"""
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.exists(os.path.join(path, META_FILE)):
+            shard_paths = [path]
+        else:
+            shard_paths = sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if os.path.exists(os.path.join(path, name, META_FILE))
+            )
+        self.readers = [ColumnarResultReader(shard) for shard in shard_paths]
+
+    @property
+    def rows(self) -> int:
+        return sum(reader.rows for reader in self.readers)
+
+    def _select(self, reader: ColumnarResultReader, method: Optional[str], endpoint: Optional[str],
+                status: Optional[int], ok: Optional[bool], start: Optional[float],
+                end: Optional[float]) -> Sequence:
+        filters = []
+        for column, value in (('method', method), ('endpoint', endpoint)):
+            if value is not None:
+                code = reader.code(column, normalize_endpoint(value) if column == 'endpoint' else value)
+                if code is None:
+                    if HAS_NUMPY:
+                        import numpy
+                        return numpy.zeros(reader.rows, dtype=bool)
+                    return []
+                filters.append((column, '==', code))
+        if status is not None:
+            filters.append(('status', '==', status))
+        if ok is not None:
+            filters.append(('ok', '==', 1 if ok else 0))
+        if start is not None:
+            filters.append(('started', '>=', start))
+        if end is not None:
+            filters.append(('started', '<', end))
+
+        if HAS_NUMPY:
+            import numpy
+            mask = numpy.ones(reader.rows, dtype=bool)
+            for column, op, value in filters:
+                data = reader.column(column)
+                mask &= (data == value) if op == '==' else (data >= value) if op == '>=' else (data < value)
+            return mask
+
+        indices: Iterator[int] = iter(range(reader.rows))
+        for column, op, value in filters:
+            data = reader.column(column)
+            if op == '==':
+                indices = [i for i in indices if data[i] == value]
+            elif op == '>=':
+                indices = [i for i in indices if data[i] >= value]
+            else:
+                indices = [i for i in indices if data[i] < value]
+        return list(indices)
+
+    def query(self, method: Optional[str] = None, endpoint: Optional[str] = None,
+              status: Optional[int] = None, ok: Optional[bool] = None,
+              start: Optional[float] = None, end: Optional[float] = None) -> ResultQuery:
+        """Select rows by method, endpoint, HTTP status, success and time range"""
+        return ResultQuery([
+            (reader, self._select(reader, method, endpoint, status, ok, start, end))
+            for reader in self.readers
+        ])
+
+    def endpoints(self) -> List[str]:
+        return sorted({name for reader in self.readers for name in reader.dictionaries['endpoint']})
+
+    def summary(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> List[GroupStats]:
+        """Per method/endpoint statistics over every shard, straight from the columns"""
+        keys: Dict[Tuple[str, str], int] = {}
+        columns: Dict[str, List] = {'codes': [], 'latency': [], 'ok': [], 'started': []}
+        for reader in self.readers:
+            methods, endpoints = reader.dictionaries['method'], reader.dictionaries['endpoint']
+            # Shards have their own dictionaries; map (method, endpoint) codes to shared ones
+            lookup = [
+                keys.setdefault((method, endpoint), len(keys))
+                for method in methods for endpoint in endpoints
+            ]
+            method_codes, endpoint_codes = reader.column('method'), reader.column('endpoint')
+            if HAS_NUMPY:
+                import numpy
+                codes = numpy.asarray(lookup, dtype=numpy.int64)[
+                    method_codes.astype(numpy.int64) * len(endpoints) + endpoint_codes]
+            else:
+                codes = [lookup[m * len(endpoints) + e] for m, e in zip(method_codes, endpoint_codes)]
+            columns['codes'].append(codes)
+            for name in ('latency', 'ok', 'started'):
+                columns[name].append(reader.column(name))
+
+        if HAS_NUMPY:
+            import numpy
+            merged = {name: numpy.concatenate(parts) if parts else [] for name, parts in columns.items()}
+        else:
+            merged = {name: [value for part in parts for value in part] for name, parts in columns.items()}
+        labels = {code: key for key, code in keys.items()}
+        return aggregate(merged['codes'], merged['latency'], merged['ok'], labels,
+                         started=merged['started'], percentiles=percentiles)
+
+    def to_arrow(self):
+        """Materialise every shard as one pyarrow Table (requires pyarrow)"""
+        if not HAS_PYARROW:
+            raise RuntimeError("pyarrow is required for Arrow/Parquet export")
+        import pyarrow
+
+        tables = []
+        for reader in self.readers:
+            columns = {}
+            for name in SCHEMA:
+                data = reader.column(name)
+                if name in reader.dictionaries:
+                    columns[name] = pyarrow.DictionaryArray.from_arrays(
+                        pyarrow.array(list(data), type=pyarrow.int32()),
+                        pyarrow.array(reader.dictionaries[name]),
+                    )
+                else:
+                    columns[name] = pyarrow.array(list(data) if not HAS_NUMPY else data)
+            tables.append(pyarrow.table(columns))
+        return pyarrow.concat_tables(tables) if tables else pyarrow.table({})
+
+    def export_parquet(self, path: str) -> str:
+        """Write the store as a single Parquet file (requires pyarrow)"""
+        import pyarrow.parquet
+        pyarrow.parquet.write_table(self.to_arrow(), path)
+        return path
+
+    def close(self):
+        for reader in self.readers:
+            reader.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_store(path: str) -> ResultStore:
+    """Open a columnar result store for querying"""
+    return ResultStore(path)
@@ -0,0 +1,112 @@
+import datetime
+import re
+from typing import Dict, List, Optional
+
+PASSED = 'PASSED'
+FAILED = 'FAILED'
+ERROR = 'ERROR'
+SKIPPED = 'SKIPPED'
+XFAILED = 'XFAILED'
+XPASSED = 'XPASSED'
+# Failed, then passed on a rerun
+FLAKY = 'FLAKY'
+
+_NUMERIC_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+
+def normalize_endpoint(path: str) -> str:
+    """Collapse numeric path segments so /posts/17 and /posts/3 group as /posts/{id}"""
+    return _NUMERIC_SEGMENT.sub('/{id}', path.split('?')[0])
+
+
+class ResultRecord:
+    """Compact result of one test, shared by the pytest plugin and the beautiful report"""
+
+    __slots__ = (
+        'name', 'description', 'nodeid', 'status', 'duration', 'started',
+        'method', 'endpoint', 'http_status', 'timings', 'retries',
+        'bytes_sent', 'bytes_received', 'bytes_decoded', 'details', 'error', 'captures',
+        'flakiness', 'calls',
+    )
+
+    def __init__(self, name: str, description: str = "", nodeid: Optional[str] = None,
+                 status: str = PASSED, duration: float = 0.0, started: Optional[float] = None,
+                 method: Optional[str] = None, endpoint: Optional[str] = None,
+                 http_status: Optional[int] = None, timings: Optional[List[float]] = None,
+                 retries: int = 0, bytes_sent: int = 0, bytes_received: int = 0,
+                 bytes_decoded: int = 0, details: Optional[str] = None, error: Optional[str] = None,
+                 captures: Optional[List[Dict]] = None, flakiness: Optional[Dict] = None,
+                 calls: Optional[List] = None):
+        self.name = name
+        self.description = description
+        self.nodeid = nodeid
+        self.status = status
+        self.duration = duration
+        self.started = started if started is not None else datetime.datetime.now().timestamp()
+        self.method = method
+        self.endpoint = endpoint
+        self.http_status = http_status
+        self.timings = timings if timings is not None else []
+        self.retries = retries
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.bytes_decoded = bytes_decoded
+        self.details = details
+        self.error = error
+        # Index entries of request/response captures written for this test
+        self.captures = captures if captures is not None else []
+        # Rerun classification and flakiness score, for failed or quarantined tests
+        self.flakiness = flakiness
+        # [method, endpoint, status] of each request, parallel to ``timings``
+        self.calls = calls if calls is not None else []
+
+    @property
+    def passed(self) -> bool:
+        return self.status in (PASSED, FLAKY)
+
+    @property
+    def failed(self) -> bool:
+        return self.status in (FAILED, ERROR, XPASSED)
+
+    @property
+    def skipped(self) -> bool:
+        """Skipped, or an expected failure that failed as expected; neither passed nor failed"""
+        return self.status in (SKIPPED, XFAILED)
+
+    @property
+    def request_time(self) -> float:
+        """Time spent waiting on HTTP requests"""
+        return sum(self.timings)
+
+    @property
+    def timestamp(self) -> str:
+        return datetime.datetime.fromtimestamp(self.started).strftime('%Y-%m-%d %H:%M:%S')
+
+    def add_request(self, method: str, endpoint: str, status: int, elapsed: float,
+                    retries: int = 0, bytes_sent: int = 0, bytes_received: int = 0,
+                    bytes_decoded: int = 0):
+        """Fold one HTTP request into the record; the first request names the endpoint
+
+        ``bytes_received`` counts what crossed the wire, ``bytes_decoded`` the
+        body after Content-Encoding was removed.
+        """
+        if self.endpoint is None:
+            self.method = method
+            self.endpoint = endpoint
+        self.http_status = status
+        self.timings.append(elapsed)
+        self.calls.append([method, endpoint, status])
+        self.retries += retries
+        self.bytes_sent += bytes_sent
+        self.bytes_received += bytes_received
+        self.bytes_decoded += bytes_decoded
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ResultRecord':
+        return cls(**{name: data[name] for name in cls.__slots__ if name in data})
+
+    def __repr__(self):
+        return f"ResultRecord({self.name!r}, {self.status}, {self.duration:.3f}s)"
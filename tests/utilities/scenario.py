@@ -0,0 +1,333 @@
+import importlib.util
+import itertools
+import json
+import os
+import random
+import re
+from typing import Dict, List, Any, Optional
+
+from config.test_config import APITestConfig
+
+# PyYAML is optional and only imported when a YAML scenario is actually read
+HAS_YAML = importlib.util.find_spec('yaml') is not None
+
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+class ScenarioError(ValueError):
+    """Raised when a scenario definition is invalid"""
+
+
+class PlannedRequest:
+    """A single, fully rendered request in a load plan"""
+
+    __slots__ = ('name', 'method', 'endpoint', 'params', 'payload', 'think_time', 'expect_status')
+
+    def __init__(self, name: str, method: str, endpoint: str, params: Optional[Dict] = None,
+                 payload: Optional[Dict] = None, think_time: float = 0.0, expect_status: int = 200):
+        self.name = name
+        self.method = method
+        self.endpoint = endpoint
+        self.params = params
+        self.payload = payload
+        self.think_time = think_time
+        self.expect_status = expect_status
+
+    def __repr__(self):
+        return f"PlannedRequest({self.method} {self.endpoint})"
+
+
+class Stage:
+    """One stage of a ramp profile"""
+
+    __slots__ = ('concurrency', 'duration', 'rate')
+
+    def __init__(self, concurrency: int, duration: Optional[float] = None, rate: Optional[float] = None):
+        self.concurrency = concurrency
+        self.duration = duration
+        self.rate = rate
+
+    def __repr__(self):
+        return f"Stage(concurrency={self.concurrency}, duration={self.duration}, rate={self.rate})"
+
+
+class AdaptiveSettings:
+    """Bounds and targets for an adaptive (AIMD) concurrency run"""
+
+    __slots__ = ('start', 'minimum', 'maximum', 'target_latency', 'percentile', 'max_error_rate',
+                 'window', 'backoff', 'increase')
+
+    def __init__(self, start: int, minimum: int, maximum: int, target_latency: float,
+                 percentile: float, max_error_rate: float, window: int, backoff: float, increase: int):
+        self.start = start
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.percentile = percentile
+        self.max_error_rate = max_error_rate
+        self.window = window
+        self.backoff = backoff
+        self.increase = increase
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'AdaptiveSettings':
+        settings = cls(
+            start=int(data.get('start', 1)),
+            minimum=int(data.get('min', 1)),
+            maximum=int(data.get('max', APITestConfig.ADAPTIVE_MAX_CONCURRENCY)),
+            target_latency=float(data.get('target_latency', APITestConfig.ADAPTIVE_TARGET_LATENCY)),
+            percentile=float(data.get('percentile', APITestConfig.ADAPTIVE_PERCENTILE)),
+            max_error_rate=float(data.get('max_error_rate', APITestConfig.ADAPTIVE_MAX_ERROR_RATE)),
+            window=int(data.get('window', APITestConfig.ADAPTIVE_WINDOW)),
+            backoff=float(data.get('backoff', APITestConfig.ADAPTIVE_BACKOFF)),
+            increase=int(data.get('increase', 1)),
+        )
+        if not 1 <= settings.minimum <= settings.start <= settings.maximum:
+            raise ScenarioError("Adaptive ramp needs 1 <= min <= start <= max")
+        if settings.target_latency <= 0 or settings.window < 1 or not 0 < settings.backoff < 1:
+            raise ScenarioError("Adaptive ramp needs a positive target_latency and window, "
+                                "and a backoff between 0 and 1")
+        return settings
+
+    def shard(self, index: int, count: int) -> 'AdaptiveSettings':
+        """Per-worker bounds when ``count`` workers adapt side by side"""
+        def share(value: int) -> int:
+            return max(value // count + (1 if index < value % count else 0), 1)
+
+        return AdaptiveSettings(share(self.start), share(self.minimum), share(self.maximum),
+                                self.target_latency, self.percentile, self.max_error_rate,
+                                self.window, self.backoff, self.increase)
+
+
+class RampProfile:
+    """Concurrency ramp described by a scenario
+
+    The ``adaptive`` profile has a single stage sized to its maximum
+    concurrency; an AIMD limiter decides how much of it is used.
+    """
+
+    PROFILES = ('constant', 'step', 'linear', 'adaptive')
+
+    def __init__(self, profile: str, stages: List[Stage], adaptive: Optional[AdaptiveSettings] = None):
+        self.profile = profile
+        self.stages = stages
+        self.adaptive = adaptive
+
+    @property
+    def max_concurrency(self) -> int:
+        return max(stage.concurrency for stage in self.stages)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> 'RampProfile':
+        """Build a ramp profile from its scenario definition"""
+        data = data or {}
+        profile = data.get('profile', 'constant')
+        adaptive = None
+
+        if profile == 'adaptive':
+            adaptive = AdaptiveSettings.from_dict(data)
+            stages = [Stage(adaptive.maximum, data.get('duration'))]
+        elif profile == 'constant':
+            stages = [Stage(int(data.get('concurrency', 1)), data.get('duration'), data.get('rate'))]
+        elif profile == 'step':
+            start = int(data.get('start', 1))
+            step = int(data.get('step', 1))
+            stage_count = int(data.get('stages', 1))
+            rate = data.get('rate')
+            rate_step = data.get('rate_step', 0)
+            stages = [
+                Stage(start + step * i, data.get('stage_duration'),
+                      rate + rate_step * i if rate else None)
+                for i in range(stage_count)
+            ]
+        elif profile == 'linear':
+            start = int(data.get('start', 1))
+            end = int(data.get('end', start))
+            stage_count = max(int(data.get('stages', 2)), 2)
+            total_duration = data.get('duration')
+            stage_duration = total_duration / stage_count if total_duration else None
+            rate = data.get('rate')
+            end_rate = data.get('end_rate', rate)
+            stages = [
+                Stage(round(start + (end - start) * i / (stage_count - 1)), stage_duration,
+                      rate + (end_rate - rate) * i / (stage_count - 1) if rate else None)
+                for i in range(stage_count)
+            ]
+        else:
+            raise ScenarioError(
+                f"Unknown ramp profile '{profile}', expected one of {', '.join(cls.PROFILES)}"
+            )
+
+        if any(stage.concurrency < 1 for stage in stages):
+            raise ScenarioError("Ramp concurrency must be at least 1 in every stage")
+        if any(stage.rate is not None and stage.rate <= 0 for stage in stages):
+            raise ScenarioError("Ramp request rate must be positive in every stage")
+        return cls(profile, stages, adaptive)
+
+
+class LoadPlan:
+    """Pre-generated request sequence compiled from a scenario"""
+
+    def __init__(self, name: str, requests: List[PlannedRequest], ramp: RampProfile,
+                 source: Optional[Dict] = None):
+        self.name = name
+        self.requests = requests
+        self.ramp = ramp
+        self.source = source or {}
+
+    def __len__(self):
+        return len(self.requests)
+
+    def __iter__(self):
+        return iter(self.requests)
+
+    @property
+    def endpoints(self) -> List[str]:
+        """Distinct endpoints in plan order"""
+        return list(dict.fromkeys(request.endpoint for request in self.requests))
+
+    @property
+    def max_shards(self) -> int:
+        """Most workers the plan can be split over, each with requests and concurrency of its own"""
+        shards = min([len(self.requests)] + [stage.concurrency for stage in self.ramp.stages])
+        if self.ramp.adaptive:
+            shards = min(shards, self.ramp.adaptive.minimum)
+        return max(shards, 1)
+
+    def shard(self, index: int, count: int) -> 'LoadPlan':
+        """Slice of the plan (and its load) run by one of ``count`` workers"""
+        if count > self.max_shards:
+            raise ScenarioError(f"Plan '{self.name}' can be split over at most {self.max_shards} "
+                                f"workers, not {count}")
+        stages = []
+        for stage in self.ramp.stages:
+            share = stage.concurrency // count + (1 if index < stage.concurrency % count else 0)
+            stages.append(Stage(share, stage.duration, stage.rate / count if stage.rate else None))
+        adaptive = self.ramp.adaptive.shard(index, count) if self.ramp.adaptive else None
+        return LoadPlan(self.name, self.requests[index::count],
+                        RampProfile(self.ramp.profile, stages, adaptive), self.source)
+
+
+def _variable_sampler(spec: Any, rng: random.Random):
+    """Return a zero-argument callable producing values for a variable spec"""
+    if isinstance(spec, dict):
+        if 'range' in spec:
+            low, high = spec['range']
+            return lambda: rng.randint(low, high)
+        if 'choice' in spec:
+            choices = list(spec['choice'])
+            return lambda: rng.choice(choices)
+        if 'sequence' in spec:
+            values = list(spec['sequence'])
+            counter = itertools.count()
+            return lambda: values[next(counter) % len(values)]
+        raise ScenarioError(f"Unsupported variable spec: {spec}")
+    return lambda: spec
+
+
+def _think_time_sampler(spec: Any, rng: random.Random):
+    """Return a zero-argument callable producing think times in seconds"""
+    if spec is None:
+        return lambda: 0.0
+    if isinstance(spec, (int, float)):
+        return lambda: float(spec)
+    if 'mean' in spec:
+        mean = float(spec['mean'])
+        return lambda: rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+    low = float(spec.get('min', 0.0))
+    high = float(spec.get('max', low))
+    return lambda: rng.uniform(low, high)
+
+
+def _render(template: Any, values: Dict[str, Any]) -> Any:
+    """Render placeholders in strings, lists and dicts"""
+    if isinstance(template, str):
+        whole = _PLACEHOLDER.fullmatch(template)
+        if whole:
+            # Keep the variable's native type for "{user_id}"-style values
+            return values[whole.group(1)]
+        return _PLACEHOLDER.sub(lambda match: str(values[match.group(1)]), template)
+    if isinstance(template, dict):
+        return {key: _render(value, values) for key, value in template.items()}
+    if isinstance(template, list):
+        return [_render(value, values) for value in template]
+    return template
+
+
+def compile_scenario(data: Dict) -> LoadPlan:
+    """Compile a scenario definition into a ready-to-run load plan"""
+    mix = data.get('mix')
+    if not mix:
+        raise ScenarioError("Scenario must define a non-empty 'mix'")
+
+    rng = random.Random(data.get('seed', 0))
+    total = int(data.get('requests', len(mix)))
+    samplers = {
+        name: _variable_sampler(spec, rng)
+        for name, spec in data.get('variables', {}).items()
+    }
+    default_think_time = data.get('think_time')
+
+    entries = []
+    for entry in mix:
+        if 'endpoint' not in entry:
+            raise ScenarioError(f"Mix entry is missing 'endpoint': {entry}")
+        entries.append({
+            'name': entry.get('name', entry['endpoint']),
+            'method': entry.get('method', 'GET').upper(),
+            'endpoint': entry['endpoint'],
+            'params': entry.get('params'),
+            'payload': entry.get('payload'),
+            'expect_status': int(entry.get('expect_status', 200)),
+            'think_time': _think_time_sampler(entry.get('think_time', default_think_time), rng),
+        })
+
+    if data.get('order') == 'sequential':
+        chosen = [entries[i % len(entries)] for i in range(total)]
+    else:
+        weights = [float(entry.get('weight', 1)) for entry in mix]
+        chosen = rng.choices(entries, weights=weights, k=total)
+
+    requests = []
+    for seq, entry in enumerate(chosen):
+        values = {name: sample() for name, sample in samplers.items()}
+        values['seq'] = seq
+        try:
+            requests.append(PlannedRequest(
+                name=entry['name'],
+                method=entry['method'],
+                endpoint=_render(entry['endpoint'], values),
+                params=_render(entry['params'], values),
+                payload=_render(entry['payload'], values),
+                think_time=entry['think_time'](),
+                expect_status=entry['expect_status'],
+            ))
+        except KeyError as e:
+            raise ScenarioError(f"Undefined template variable {e} in '{entry['name']}'")
+
+    return LoadPlan(
+        name=data.get('name', 'unnamed'),
+        requests=requests,
+        ramp=RampProfile.from_dict(data.get('ramp')),
+        source=data,
+    )
+
+
+def read_scenario(path: str) -> Dict:
+    """Read a raw scenario definition from a JSON or YAML file"""
+    if not os.path.isabs(path) and not os.path.exists(path):
+        path = os.path.join(APITestConfig.SCENARIOS_DIR, path)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(('.yaml', '.yml')):
+            if not HAS_YAML:
+                raise ScenarioError(f"PyYAML is required to load {path}")
+            import yaml
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def load_scenario(path: str) -> LoadPlan:
+    """Load and compile a scenario file into a load plan"""
+    return compile_scenario(read_scenario(path))
@@ -0,0 +1,207 @@
+import json
+import os
+import statistics
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from config.test_config import APITestConfig
+from tests.utilities.bandwidth import EndpointBandwidth
+from tests.utilities.pytest_runner import RunResult
+from tests.utilities.results import ResultRecord
+
+# pytest's exit code when a shard selected no tests
+NO_TESTS_COLLECTED = 5
+
+
+def load_durations(path: Optional[str] = None) -> Dict[str, float]:
+    """Historical seconds per test node id; empty when there is no history yet"""
+    path = path or APITestConfig.SHARD_DURATIONS_FILE
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_durations(records: Iterable[ResultRecord], path: Optional[str] = None) -> Dict[str, float]:
+    """Fold the latest duration of every test into the history file"""
+    path = path or APITestConfig.SHARD_DURATIONS_FILE
+    durations = load_durations(path)
+    durations.update({record.nodeid: round(record.duration, 6) for record in records if record.nodeid})
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(durations.items())), f, indent=2)
+    return durations
+
+
+def assign_shards(nodeids: Sequence[str], count: int, durations: Dict[str, float]) -> List[List[str]]:
+    """Split tests into ``count`` shards of similar total duration
+
+    Longest-processing-time first: tests are taken longest first and each
+    goes to the shard with the least time so far. Ties are broken by node id
+    and shard number, so every executor computes the same split from the
+    same test list and history. Tests without history count as the median
+    known duration.
+    """
+    known = [durations[nodeid] for nodeid in nodeids if nodeid in durations]
+    default = statistics.median(known) if known else APITestConfig.SHARD_DEFAULT_DURATION
+    shards: List[List[str]] = [[] for _ in range(count)]
+    totals = [0.0] * count
+    for nodeid in sorted(nodeids, key=lambda nodeid: (-durations.get(nodeid, default), nodeid)):
+        index = min(range(count), key=lambda index: (totals[index], index))
+        shards[index].append(nodeid)
+        totals[index] += durations.get(nodeid, default)
+    return shards
+
+
+class ShardPlugin:
+    """Pytest plugin that keeps only the tests of one shard (0-based ``index``)"""
+
+    def __init__(self, index: int, count: int, durations: Optional[Dict[str, float]] = None):
+        if not 0 <= index < count:
+            raise ValueError(f"Shard {index + 1} is outside 1..{count}")
+        self.index = index
+        self.count = count
+        self.durations = durations if durations is not None else load_durations()
+        self.selected: List[str] = []
+
+    def pytest_collection_modifyitems(self, config, items):
+        shard = set(assign_shards([item.nodeid for item in items], self.count, self.durations)[self.index])
+        selected = [item for item in items if item.nodeid in shard]
+        deselected = [item for item in items if item.nodeid not in shard]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+        self.selected = [item.nodeid for item in selected]
+
+
+def write_partial(result: RunResult, plugin: ShardPlugin, path: str) -> str:
+    """Write one shard's results, with its JUnit XML embedded, for ``load_partials``"""
+    partial = result.to_dict()
+    junit_path = result.report_paths.get('junit_xml')
+    junit = None
+    if junit_path and os.path.exists(junit_path):
+        with open(junit_path, 'r', encoding='utf-8') as f:
+            junit = f.read()
+    partial['shard'] = {'index': plugin.index, 'count': plugin.count, 'started': result.started,
+                        'tests': plugin.selected, 'junit_xml': junit}
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(partial, f, indent=2)
+    return path
+
+
+def load_partials(paths: Iterable[str]) -> List[Dict]:
+    """Read partial result files (directories are searched for ``shard_*.json``), in shard order"""
+    partials = []
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(os.path.join(path, name) for name in os.listdir(path)
+                           if name.startswith('shard_') and name.endswith('.json'))
+        else:
+            files = [path]
+        for file in files:
+            with open(file, 'r', encoding='utf-8') as f:
+                partials.append(json.load(f))
+    if not partials:
+        raise ValueError("No partial results found")
+
+    partials.sort(key=lambda partial: partial['shard']['index'])
+    counts = {partial['shard']['count'] for partial in partials}
+    if len(counts) != 1:
+        raise ValueError(f"Partial results come from different shard counts: {sorted(counts)}")
+    count = counts.pop()
+    indexes = [partial['shard']['index'] for partial in partials]
+    missing = sorted(set(range(count)) - set(indexes))
+    if missing or len(indexes) != len(set(indexes)):
+        raise ValueError(f"Expected shards 1..{count} once each, got {[index + 1 for index in indexes]}")
+    return partials
+
+
+def _merge_bandwidth(partials: List[Dict]) -> List[EndpointBandwidth]:
+    merged: Dict[tuple, EndpointBandwidth] = {}
+    for partial in partials:
+        for data in partial.get('bandwidth', []):
+            key = (data['method'], data['endpoint'])
+            totals = merged.setdefault(key, EndpointBandwidth(*key))
+            for name in ('requests', 'request_bytes', 'response_bytes', 'decoded_bytes', 'compressed'):
+                setattr(totals, name, getattr(totals, name) + data[name])
+            totals.max_response_bytes = max(totals.max_response_bytes, data['max_response_bytes'])
+    return sorted(merged.values(), key=lambda totals: -totals.response_bytes)
+
+
+def _merge_exit_codes(codes: List[int]) -> int:
+    """1 if any shard had failures, else the first other error; an empty shard is not an error"""
+    if 1 in codes:
+        return 1
+    errors = [code for code in codes if code not in (0, NO_TESTS_COLLECTED)]
+    if errors:
+        return errors[0]
+    return NO_TESTS_COLLECTED if all(code == NO_TESTS_COLLECTED for code in codes) else 0
+
+
+def merge_results(partials: List[Dict]) -> RunResult:
+    """One RunResult covering every shard; its duration is the wall clock of the slowest shard"""
+    started = min(partial['shard']['started'] for partial in partials)
+    finished = max(partial['shard']['started'] + partial['duration'] for partial in partials)
+    records = [ResultRecord.from_dict(data) for partial in partials for data in partial['records']]
+    return RunResult(_merge_exit_codes([partial['exit_code'] for partial in partials]), records,
+                     finished - started, {}, started, _merge_bandwidth(partials))
+
+
+def merged_summary(partials: List[Dict], result: RunResult) -> Dict:
+    """The merged RunResult as a dict, plus per-shard timings and the shards' raw extras"""
+    merged = result.to_dict()
+    coalesced: Dict[str, Dict] = {}
+    for partial in partials:
+        for key, saved in (partial.get('coalesced') or {}).items():
+            totals = coalesced.setdefault(key, {'saved_calls': 0, 'waited': 0.0})
+            totals['saved_calls'] += saved['saved_calls']
+            totals['waited'] += saved['waited']
+    merged.update(
+        cold_starts=[cold_start for partial in partials for cold_start in partial.get('cold_starts', [])],
+        coalesced=coalesced,
+        captures=[partial['captures'] for partial in partials if partial.get('captures')],
+        shards=[{'index': partial['shard']['index'], 'tests': len(partial['shard']['tests']),
+                 'duration': partial['duration'], 'exit_code': partial['exit_code']}
+                for partial in partials],
+        shard_time=sum(partial['duration'] for partial in partials),
+    )
+    return merged
+
+
+def merge_junit(partials: List[Dict], output: str, duration: float) -> Optional[str]:
+    """Combine the shards' JUnit XML into one suite with summed counts"""
+    junits = [partial['shard']['junit_xml'] for partial in partials if partial['shard'].get('junit_xml')]
+    if not junits:
+        return None
+    cases = []
+    timestamp = None
+    hostname = None
+    for junit in junits:
+        for suite in ET.fromstring(junit).iter('testsuite'):
+            cases.extend(suite.findall('testcase'))
+            stamp = suite.get('timestamp')
+            timestamp = min(timestamp, stamp) if timestamp and stamp else (timestamp or stamp)
+            hostname = hostname or suite.get('hostname')
+
+    def count(tag):
+        return sum(1 for case in cases if case.find(tag) is not None)
+
+    suite = ET.Element('testsuite', {
+        'name': 'pytest',
+        'errors': str(count('error')),
+        'failures': str(count('failure')),
+        'skipped': str(count('skipped')),
+        'tests': str(len(cases)),
+        'time': f"{duration:.3f}",
+        'timestamp': timestamp or '',
+        'hostname': hostname or '',
+    })
+    properties = ET.SubElement(suite, 'properties')
+    ET.SubElement(properties, 'property', {'name': 'shards', 'value': str(len(partials))})
+    suite.extend(cases)
+    root = ET.Element('testsuites')
+    root.append(suite)
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    ET.ElementTree(root).write(output, encoding='utf-8', xml_declaration=True)
+    return output
@@ -0,0 +1,67 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class _Call:
+    """One in-flight call and the result its waiters will share"""
+
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share its outcome
+
+    Nothing is cached: once the call returns, the next caller with the same
+    key starts a new one. Only use it for idempotent work, since callers that
+    arrive while a call is in flight never run their own.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Return ``func()``'s result (or raise its error), and whether it was shared"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def stats(self) -> Dict:
+        """Calls made, callers served by someone else's call, and the share of calls saved"""
+        requested = self.calls + self.coalesced
+        return {
+            'calls': self.calls,
+            'coalesced': self.coalesced,
+            'saved_ratio': self.coalesced / requested if requested else 0.0,
+        }
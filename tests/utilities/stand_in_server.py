@@ -0,0 +1,375 @@
+"""Local JSONPlaceholder stand-in for offline runs and transport benchmarks
+
+Serves the same resources, relations and status codes as
+jsonplaceholder.typicode.com from a seeded dataset store (see
+tests.utilities.dataset), so collections can be scaled far past
+JSONPlaceholder's sizes. It speaks
+HTTP/1.1 with keep-alive and gzip, and HTTP/2 with prior knowledge (h2c)
+on the same port when the ``h2`` package is installed. The stdlib server
+has no TLS, so HTTP/2 negotiated through ALPN is not available.
+
+    python -m tests.utilities.stand_in_server --port 8000
+    API_BASE_URL=http://127.0.0.1:8000 python -m pytest tests/
+    python -m tests.utilities.stand_in_server --scale 1000
+"""
+import argparse
+import gzip
+import importlib.util
+import json
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from tests.utilities.dataset import PARENTS, DatasetStore, dataset_counts, ensure_dataset
+
+HAS_H2 = importlib.util.find_spec('h2') is not None
+
+H2_PREFACE = b'PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n'
+
+# Nested routes: (parent, child) -> foreign key on the child
+RELATIONS = {(parent, child): key for child, (parent, key) in PARENTS.items()}
+
+# Bodies smaller than this are sent uncompressed, as most CDNs do; bodies
+# larger than GZIP_MAX_BYTES are streamed from the dataset uncompressed
+GZIP_MIN_BYTES = 256
+GZIP_MAX_BYTES = 8 * 1024 * 1024
+
+# json-server's page size when _page is given without _limit
+DEFAULT_PAGE_LIMIT = 10
+
+# Records joined per write when streaming a collection
+STREAM_BATCH = 1000
+
+# A response body: either bytes, or chunks with their total length
+Body = Union[bytes, Tuple[Iterable[bytes], int]]
+
+
+def _json_array(records: Iterable[bytes], count: int, span: int) -> Tuple[Iterable[bytes], int]:
+    """Stream ``count`` JSON records totalling ``span`` bytes as one JSON array"""
+    def chunks():
+        yield b'['
+        batch: List[bytes] = []
+        first = True
+        for record in records:
+            batch.append(record)
+            if len(batch) >= STREAM_BATCH:
+                yield (b'' if first else b',') + b','.join(batch)
+                batch, first = [], False
+        if batch:
+            yield (b'' if first else b',') + b','.join(batch)
+        yield b']'
+
+    return chunks(), 2 + span + max(count - 1, 0)
+
+
+def _matches(record: Dict, filters: List[Tuple[str, str]]) -> bool:
+    return all(str(record.get(key)).lower() == value.lower() for key, value in filters)
+
+
+def _int(query: Dict[str, str], key: str) -> Optional[int]:
+    value = query.get(key, '')
+    return int(value) if value.isdigit() else None
+
+
+def _window(query: Dict[str, str], total: int) -> Optional[Tuple[int, int]]:
+    """0-based [first, end) slice for json-server's _page/_limit and _start/_end/_limit"""
+    page, limit = _int(query, '_page'), _int(query, '_limit')
+    start, end = _int(query, '_start'), _int(query, '_end')
+    if page is not None:
+        limit = DEFAULT_PAGE_LIMIT if limit is None else limit
+        first = max(page - 1, 0) * limit
+        return min(first, total), min(first + limit, total)
+    if start is None and end is None and limit is None:
+        return None
+    first = start or 0
+    if end is None:
+        end = first + limit if limit is not None else total
+    return min(first, total), max(min(end, total), min(first, total))
+
+
+def _page_links(path: str, query: Dict[str, str], total: int) -> str:
+    """RFC 8288 Link header for a _page request, as json-server sends it"""
+    limit = _int(query, '_limit') or DEFAULT_PAGE_LIMIT
+    page = max(_int(query, '_page') or 1, 1)
+    last = max(1, -(-total // limit))
+    targets = [('first', 1)]
+    if page > 1:
+        targets.append(('prev', page - 1))
+    if page < last:
+        targets.append(('next', page + 1))
+    targets.append(('last', last))
+    return ", ".join(f'<{path}?{urlencode(dict(query, _page=target))}>; rel="{rel}"'
+                     for rel, target in targets)
+
+
+class StandInAPI:
+    """Protocol-independent request handling over a dataset store"""
+
+    def __init__(self, store: Optional[DatasetStore] = None):
+        self.store = store or DatasetStore(ensure_dataset())
+
+    def _collection(self, resource: str, start: int, end: int, filters: List[Tuple[str, str]],
+                    path: str, query: Dict[str, str]) -> Tuple[int, Body, List[Tuple[str, str]]]:
+        """Records [start, end) of a resource that match every filter, paginated by ``query``"""
+        parent = PARENTS.get(resource)
+        # Children are stored grouped by parent, so a foreign-key filter is an id range
+        for key, value in list(filters):
+            if parent and key == parent[1] and value.isdigit():
+                first, last = self.store.children(resource, int(value))
+                start, end = max(start, first), min(end, last)
+                filters = [item for item in filters if item != (key, value)]
+        end = max(start, end)
+
+        matched = None
+        if filters:
+            matched = [record for record in self.store.records(resource, start, end)
+                       if _matches(json.loads(record), filters)]
+        total = len(matched) if matched is not None else end - start
+
+        headers = []
+        window = _window(query, total)
+        if window is not None:
+            headers.append(('x-total-count', str(total)))
+            if '_page' in query:
+                headers.append(('link', _page_links(path, query, total)))
+            if matched is not None:
+                matched = matched[window[0]:window[1]]
+            else:
+                start, end = start + window[0], start + window[1]
+
+        if matched is not None:
+            return 200, b'[' + b','.join(matched) + b']', headers
+        if end <= start:
+            return 200, b'[]', headers
+        return 200, _json_array(self.store.records(resource, start, end), end - start,
+                                self.store.span(resource, start, end)), headers
+
+    def route(self, method: str, target: str, body: bytes) -> Tuple[int, Body, List[Tuple[str, str]]]:
+        """Return (status, JSON body, extra headers) the way JSONPlaceholder answers"""
+        split = urlsplit(target)
+        parts = [part for part in split.path.split('/') if part]
+        query = dict(parse_qsl(split.query))
+        filters = [(key, value) for key, value in parse_qsl(split.query) if not key.startswith('_')]
+        if not parts or parts[0] not in self.store:
+            return 404, b'{}', []
+        resource = parts[0]
+
+        if len(parts) == 1:
+            if method == 'GET':
+                return self._collection(resource, 1, self.store.count(resource) + 1, filters,
+                                        split.path, query)
+            if method == 'POST':
+                payload = json.loads(body or b'{}')
+                return 201, json.dumps(dict(payload, id=self.store.count(resource) + 1)).encode(), []
+            return 404, b'{}', []
+
+        if not parts[1].isdigit():
+            return 404, b'{}', []
+        record_id = int(parts[1])
+        record = self.store.record(resource, record_id)
+
+        if len(parts) == 3:
+            child = parts[2]
+            if method != 'GET' or (resource, child) not in RELATIONS:
+                return 404, b'{}', []
+            first, last = self.store.children(child, record_id)
+            return self._collection(child, first, last, filters, split.path, query)
+
+        if method == 'GET':
+            return (200, record, []) if record is not None else (404, b'{}', [])
+        if method == 'PUT':
+            if record is None:
+                return 500, b'{}', []
+            return 200, json.dumps(dict(json.loads(body or b'{}'), id=record_id)).encode(), []
+        if method == 'PATCH':
+            current = json.loads(record) if record is not None else {}
+            return 200, json.dumps(dict(current, **json.loads(body or b'{}'))).encode(), []
+        if method == 'DELETE':
+            return 200, b'{}', []
+        return 404, b'{}', []
+
+    def handle(self, method: str, target: str, headers: Dict[str, str],
+               body: bytes) -> Tuple[int, List[Tuple[str, str]], Body]:
+        status, content, extra_headers = self.route(method, target, body)
+        length = len(content) if isinstance(content, bytes) else content[1]
+        response_headers = [('content-type', 'application/json; charset=utf-8')] + extra_headers
+        if GZIP_MIN_BYTES <= length <= GZIP_MAX_BYTES and 'gzip' in headers.get('accept-encoding', ''):
+            raw = content if isinstance(content, bytes) else b''.join(content[0])
+            content = gzip.compress(raw, compresslevel=6)
+            length = len(content)
+            response_headers.append(('content-encoding', 'gzip'))
+        response_headers.append(('content-length', str(length)))
+        return status, response_headers, content
+
+
+class _H2Connection:
+    """HTTP/2 (prior knowledge) session on one socket; streams are served concurrently"""
+
+    def __init__(self, sock: socket.socket, api: StandInAPI, workers: int = 16):
+        from h2.config import H2Configuration
+        from h2.connection import H2Connection
+
+        self.sock = sock
+        self.api = api
+        self.conn = H2Connection(H2Configuration(client_side=False, header_encoding='utf-8'))
+        self.lock = threading.Lock()
+        self.pending: Dict[int, bytearray] = {}
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+
+    def _flush(self):
+        """Send queued response bodies as far as the flow-control windows allow"""
+        for stream_id in list(self.pending):
+            data = self.pending[stream_id]
+            while data:
+                window = self.conn.local_flow_control_window(stream_id)
+                size = min(window, self.conn.max_outbound_frame_size, len(data))
+                if size <= 0:
+                    break
+                self.conn.send_data(stream_id, bytes(data[:size]))
+                del data[:size]
+            if not data:
+                self.conn.end_stream(stream_id)
+                del self.pending[stream_id]
+        self.sock.sendall(self.conn.data_to_send())
+
+    def _respond(self, stream_id: int, headers: Dict[str, str], body: bytes):
+        status, response_headers, content = self.api.handle(
+            headers.get(':method', 'GET'), headers.get(':path', '/'), headers, body)
+        if not isinstance(content, bytes):
+            content = b''.join(content[0])
+        with self.lock:
+            self.conn.send_headers(stream_id, [(':status', str(status))] + response_headers)
+            self.pending[stream_id] = bytearray(content)
+            self._flush()
+
+    def serve(self):
+        import h2.events
+
+        with self.lock:
+            self.conn.initiate_connection()
+            self.sock.sendall(self.conn.data_to_send())
+        requests: Dict[int, Tuple[Dict[str, str], bytearray]] = {}
+        try:
+            while True:
+                data = self.sock.recv(65535)
+                if not data:
+                    return
+                with self.lock:
+                    for event in self.conn.receive_data(data):
+                        if isinstance(event, h2.events.RequestReceived):
+                            requests[event.stream_id] = (dict(event.headers), bytearray())
+                        elif isinstance(event, h2.events.DataReceived):
+                            requests[event.stream_id][1].extend(event.data)
+                            self.conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                        elif isinstance(event, h2.events.StreamEnded):
+                            headers, body = requests.pop(event.stream_id)
+                            self.executor.submit(self._respond, event.stream_id, headers, bytes(body))
+                        elif isinstance(event, h2.events.StreamReset):
+                            self.pending.pop(event.stream_id, None)
+                        elif isinstance(event, h2.events.ConnectionTerminated):
+                            return
+                    self._flush()
+        except OSError:
+            return
+        finally:
+            self.executor.shutdown(wait=False)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out as separate writes; with Nagle on, the body
+    # waits for the client's delayed ACK (~40ms per response)
+    disable_nagle_algorithm = True
+
+    def handle(self):
+        self.server.count_connection()
+        try:
+            preface = self.connection.recv(len(H2_PREFACE), socket.MSG_PEEK)
+        except OSError:
+            return
+        if preface.startswith(b'PRI * HTTP/2.0'):
+            if HAS_H2:
+                _H2Connection(self.connection, self.server.api).serve()
+            return
+        super().handle()
+
+    def _dispatch(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        headers = {name.lower(): value for name, value in self.headers.items()}
+        status, response_headers, content = self.server.api.handle(self.command, self.path, headers, body)
+        self.send_response(status)
+        for name, value in response_headers:
+            self.send_header(name, value)
+        self.end_headers()
+        if isinstance(content, bytes):
+            self.wfile.write(content)
+        else:
+            for chunk in content[0]:
+                self.wfile.write(chunk)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _dispatch
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded stand-in server; use as a context manager to run it in the background"""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, api: Optional[StandInAPI] = None,
+                 dataset: Optional[str] = None):
+        super().__init__((host, port), _Handler)
+        self.api = api or StandInAPI(DatasetStore(dataset) if dataset else None)
+        self.connections = 0
+        self._count_lock = threading.Lock()
+
+    def count_connection(self):
+        with self._count_lock:
+            self.connections += 1
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> 'StandInServer':
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+    def server_close(self):
+        super().server_close()
+        self.api.store.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a local JSONPlaceholder stand-in")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--dataset', help="Serve this generated dataset store (see tests.utilities.dataset)")
+    parser.add_argument('--scale', type=int, help="Serve a cached dataset at this multiple of JSONPlaceholder's sizes")
+    args = parser.parse_args(argv)
+
+    dataset = args.dataset or (ensure_dataset(dataset_counts(args.scale)) if args.scale else None)
+    server = StandInServer(args.host, args.port, dataset=dataset)
+    counts = ", ".join(f"{count:,} {resource}" for resource, count in server.api.store.counts.items())
+    print(f"🧪 Stand-in API on {server.url} (HTTP/1.1{', h2c' if HAS_H2 else ''}): {counts}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
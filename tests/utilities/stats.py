@@ -0,0 +1,225 @@
+import importlib.util
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+HAS_NUMPY = importlib.util.find_spec('numpy') is not None
+
+DEFAULT_PERCENTILES = (50, 90, 95, 99)
+
+
+class GroupStats:
+    """Latency and error statistics for one method/endpoint group"""
+
+    __slots__ = ('method', 'endpoint', 'count', 'errors', 'mean', 'stddev', 'min', 'max',
+                 'percentiles', 'throughput')
+
+    def __init__(self, method: str, endpoint: str, count: int, errors: int, mean: float,
+                 stddev: float, min: float, max: float, percentiles: Dict[str, float],
+                 throughput: Optional[float] = None):
+        self.method = method
+        self.endpoint = endpoint
+        self.count = count
+        self.errors = errors
+        self.mean = mean
+        self.stddev = stddev
+        self.min = min
+        self.max = max
+        self.percentiles = percentiles
+        self.throughput = throughput
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.count if self.count else 0.0
+
+    @property
+    def total(self) -> float:
+        return self.mean * self.count
+
+    def to_dict(self) -> Dict:
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data['error_rate'] = self.error_rate
+        return data
+
+    @classmethod
+    def empty(cls, method: str = '', endpoint: str = '',
+              percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> 'GroupStats':
+        return cls(method, endpoint, 0, 0, 0.0, 0.0, 0.0, 0.0,
+                   {f"p{p:g}": 0.0 for p in percentiles}, 0.0)
+
+
+def nearest_rank(count: int, percentile: float) -> int:
+    """Zero-based nearest-rank index, matching LatencyHistogram.percentile"""
+    return max(1, math.ceil(count * percentile / 100.0)) - 1
+
+
+def _aggregate_numpy(codes, latencies, ok, started, duration, percentiles):
+    import numpy
+
+    codes = numpy.asarray(codes, dtype=numpy.int64)
+    latencies = numpy.asarray(latencies, dtype=numpy.float64)
+    ok = numpy.asarray(ok, dtype=bool)
+
+    order = numpy.lexsort((latencies, codes))
+    codes = codes[order]
+    latencies = latencies[order]
+    groups, starts, counts = numpy.unique(codes, return_index=True, return_counts=True)
+
+    sums = numpy.add.reduceat(latencies, starts)
+    means = sums / counts
+    deviations = latencies - numpy.repeat(means, counts)
+    stddevs = numpy.sqrt(numpy.add.reduceat(deviations * deviations, starts) / counts)
+    errors = numpy.add.reduceat((~ok[order]).astype(numpy.int64), starts)
+    ranks = {
+        f"p{p:g}": latencies[starts + numpy.maximum(1, numpy.ceil(counts * p / 100.0)).astype(numpy.int64) - 1]
+        for p in percentiles
+    }
+
+    if started is not None:
+        started = numpy.asarray(started, dtype=numpy.float64)[order]
+        spans = numpy.maximum.reduceat(started + latencies, starts) - numpy.minimum.reduceat(started, starts)
+    else:
+        spans = numpy.full(len(groups), duration or 0.0)
+
+    return [
+        (int(groups[i]), int(counts[i]), int(errors[i]), float(means[i]), float(stddevs[i]),
+         float(latencies[starts[i]]), float(latencies[starts[i] + counts[i] - 1]),
+         {key: float(values[i]) for key, values in ranks.items()},
+         float(counts[i] / spans[i]) if spans[i] > 0 else None)
+        for i in range(len(groups))
+    ]
+
+
+def _aggregate_python(codes, latencies, ok, started, duration, percentiles):
+    # code -> [count, mean, m2, errors, first start, last end, latencies]
+    groups: Dict[int, list] = {}
+    for index, (code, latency, success) in enumerate(zip(codes, latencies, ok)):
+        group = groups.get(code)
+        if group is None:
+            group = groups[code] = [0, 0.0, 0.0, 0, math.inf, -math.inf, []]
+        # Welford's update keeps mean and variance in a single pass
+        group[0] += 1
+        delta = latency - group[1]
+        group[1] += delta / group[0]
+        group[2] += delta * (latency - group[1])
+        if not success:
+            group[3] += 1
+        if started is not None:
+            group[4] = min(group[4], started[index])
+            group[5] = max(group[5], started[index] + latency)
+        group[6].append(latency)
+
+    rows = []
+    for code in sorted(groups):
+        count, mean, m2, errors, first, last, values = groups[code]
+        values.sort()
+        span = (last - first) if started is not None else (duration or 0.0)
+        rows.append((
+            code, count, errors, mean, math.sqrt(m2 / count), values[0], values[-1],
+            {f"p{p:g}": values[nearest_rank(count, p)] for p in percentiles},
+            count / span if span > 0 else None,
+        ))
+    return rows
+
+
+def aggregate(codes: Sequence[int], latencies: Sequence[float], ok: Sequence[bool],
+              labels: Dict[int, Tuple[str, str]], started: Optional[Sequence[float]] = None,
+              duration: Optional[float] = None,
+              percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> List[GroupStats]:
+    """Per-group statistics over parallel sample columns
+
+    ``codes`` assigns every sample to a group and ``labels`` maps each code to
+    its (method, endpoint). Throughput is measured over each group's own span
+    when send times are given, otherwise over ``duration``. Uses NumPy
+    when installed and a single pure-Python pass otherwise.
+    """
+    if not len(latencies):
+        return []
+    aggregate_columns = _aggregate_numpy if HAS_NUMPY else _aggregate_python
+    return [
+        GroupStats(*labels[code], count, errors, mean, stddev, low, high, ranks, throughput)
+        for code, count, errors, mean, stddev, low, high, ranks, throughput
+        in aggregate_columns(codes, latencies, ok, started, duration, percentiles)
+    ]
+
+
+def summarize(latencies: Sequence[float], ok: Sequence[bool], method: str = '', endpoint: str = '',
+              started: Optional[Sequence[float]] = None, duration: Optional[float] = None,
+              percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> GroupStats:
+    """Statistics over all samples as one group"""
+    groups = aggregate([0] * len(latencies), latencies, ok, {0: (method, endpoint)},
+                       started, duration, percentiles)
+    return groups[0] if groups else GroupStats.empty(method, endpoint, percentiles)
+
+
+class RunStatistics:
+    """Test-level and per-endpoint request statistics for a set of ResultRecords
+
+    ``tests`` covers the tests that ran to a verdict; skipped and xfailed
+    tests are only counted in ``skipped``, so they do not lower the success rate.
+    """
+
+    def __init__(self, tests: GroupStats, requests: GroupStats, endpoints: List[GroupStats],
+                 skipped: int = 0):
+        self.tests = tests
+        self.requests = requests
+        self.endpoints = endpoints
+        self.skipped = skipped
+
+    @property
+    def total(self) -> int:
+        return self.tests.count + self.skipped
+
+    @property
+    def passed(self) -> int:
+        return self.tests.count - self.tests.errors
+
+    @property
+    def failed(self) -> int:
+        return self.tests.errors
+
+    @property
+    def success_rate(self) -> float:
+        return (1.0 - self.tests.error_rate) * 100 if self.tests.count else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'tests': self.tests.to_dict(),
+            'skipped': self.skipped,
+            'requests': self.requests.to_dict(),
+            'endpoints': [group.to_dict() for group in self.endpoints],
+        }
+
+
+def summarize_records(records, duration: Optional[float] = None) -> RunStatistics:
+    """Aggregate ResultRecords into test and per-endpoint request statistics
+
+    Each HTTP request a test made is a sample of its own method/endpoint,
+    and counts as an error when it raised or got a 5xx. Records from before
+    requests were kept individually fall back to the test's endpoint and outcome.
+    """
+    from tests.utilities.results import normalize_endpoint
+
+    ran = [record for record in records if not record.skipped]
+    tests = summarize([record.duration for record in ran],
+                      [record.passed for record in ran], duration=duration)
+
+    keys: Dict[Tuple[str, str], int] = {}
+    codes: List[int] = []
+    latencies: List[float] = []
+    ok: List[bool] = []
+    for record in records:
+        if len(record.calls) == len(record.timings):
+            calls = [(method, endpoint, 0 < status < 500) for method, endpoint, status in record.calls]
+        else:
+            calls = [(record.method, record.endpoint, record.passed)] * len(record.timings)
+        for (method, endpoint, succeeded), latency in zip(calls, record.timings):
+            key = (method or 'N/A', normalize_endpoint(endpoint or 'N/A'))
+            codes.append(keys.setdefault(key, len(keys)))
+            latencies.append(latency)
+            ok.append(succeeded)
+
+    labels = {code: key for key, code in keys.items()}
+    endpoints = aggregate(codes, latencies, ok, labels, duration=duration)
+    requests = summarize(latencies, ok, duration=duration)
+    return RunStatistics(tests, requests, sorted(endpoints, key=lambda group: (group.endpoint, group.method)),
+                         len(records) - len(ran))
@@ -0,0 +1,115 @@
+"""HTTP transports behind APITestClient
+
+``requests`` speaks HTTP/1.1 and needs one pooled connection per in-flight
+request. The HTTP/2 transport (``pip install 'httpx[http2]'``) multiplexes
+concurrent requests as streams over a single connection: over TLS it is
+negotiated through ALPN, and plain ``http://`` URLs use prior knowledge
+(h2c), which is what the local stand-in server speaks.
+"""
+import asyncio
+import importlib.util
+import threading
+import weakref
+from typing import Dict, Optional
+
+from config.test_config import APITestConfig
+
+HAS_HTTPX = importlib.util.find_spec('httpx') is not None
+HAS_H2 = importlib.util.find_spec('h2') is not None
+
+DEFAULT_HEADERS = {
+    'Content-Type': 'application/json',
+    'User-Agent': 'API-Test-Suite/2.0'
+}
+
+
+class RequestsTransport:
+    """HTTP/1.1 over a pooled ``requests`` session"""
+
+    name = 'requests'
+    http_version = 'HTTP/1.1'
+
+    def __init__(self, base_url: str = None, pool_size: int = None,
+                 headers: Optional[Dict[str, str]] = None):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        pool_size = pool_size or APITestConfig.TRANSPORT_POOL_SIZE
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        self.errors = (requests.exceptions.RequestException,)
+
+    def request(self, method: str, url: str, timeout: float = None, **kwargs):
+        return self.session.request(method, url, timeout=timeout, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+class HTTPXTransport:
+    """HTTP/2 with multiplexed streams over one ``httpx`` connection per host
+
+    An HTTP/2 connection is one h2 state machine, and h2 is not thread-safe,
+    so httpx only shares a connection safely between tasks of one event
+    loop. Requests from any thread are therefore sent by an
+    ``httpx.AsyncClient`` on the transport's own event loop thread, where
+    concurrent requests become concurrent streams of the same connection.
+    """
+
+    name = 'http2'
+    http_version = 'HTTP/2'
+
+    def __init__(self, base_url: str = None, pool_size: int = None,
+                 headers: Optional[Dict[str, str]] = None):
+        if not (HAS_HTTPX and HAS_H2):
+            raise RuntimeError("The http2 transport needs httpx with HTTP/2 support: "
+                               "pip install 'httpx[http2]'")
+        import httpx
+
+        base_url = base_url or APITestConfig.BASE_URL
+        pool_size = pool_size or APITestConfig.TRANSPORT_POOL_SIZE
+        # Without TLS there is no ALPN to negotiate h2, so plain http:// URLs
+        # must start speaking HTTP/2 straight away
+        prior_knowledge = base_url.startswith('http://')
+        self.session = httpx.AsyncClient(
+            http1=not prior_knowledge,
+            http2=True,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            headers=headers or DEFAULT_HEADERS,
+        )
+        self.errors = (httpx.HTTPError,)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='http2-transport', daemon=True)
+        self._thread.start()
+        # Stop the loop thread of a transport that is dropped without close()
+        self._stop = weakref.finalize(self, self._loop.call_soon_threadsafe, self._loop.stop)
+
+    def request(self, method: str, url: str, timeout: float = None, **kwargs):
+        future = asyncio.run_coroutine_threadsafe(
+            self.session.request(method, url, timeout=timeout, **kwargs), self._loop)
+        return future.result()
+
+    def close(self):
+        if not self._stop.alive:
+            return
+        asyncio.run_coroutine_threadsafe(self.session.aclose(), self._loop).result()
+        self._stop()
+        self._thread.join()
+        self._loop.close()
+
+
+TRANSPORTS = {
+    'requests': RequestsTransport,
+    'http2': HTTPXTransport,
+}
+
+
+def create_transport(name: str = None, base_url: str = None, pool_size: int = None):
+    """Build the transport named in ``APITestConfig.TRANSPORT`` (or ``name``)"""
+    name = name or APITestConfig.TRANSPORT
+    if name not in TRANSPORTS:
+        raise ValueError(f"Unknown transport '{name}' (expected one of {', '.join(TRANSPORTS)})")
+    return TRANSPORTS[name](base_url=base_url, pool_size=pool_size)
@@ -1,29 +1,66 @@
-from typing import Dict, List, Any
+from typing import Callable, Dict, Iterable, List, Any, Optional, Union
+
+from tests.utilities.bandwidth import measure_transfer
+from tests.utilities.profiling import timed
 
 class ResponseValidator:
     """Validate API responses"""
     
     @staticmethod
+    @timed('validate')
     def validate_status_code(response, expected_code: int):
         """Validate HTTP status code"""
         assert response.status_code == expected_code, \
             f"Expected status {expected_code}, got {response.status_code}"
     
     @staticmethod
+    @timed('validate')
     def validate_json_structure(data: Dict, required_fields: List[str]):
         """Validate JSON structure has required fields"""
         for field in required_fields:
             assert field in data, f"Missing required field: {field}"
     
     @staticmethod
-    def validate_list_response(data: List, expected_length: int = None):
-        """Validate list response"""
-        assert isinstance(data, list), "Response should be a list"
+    def validate_list_response(data: Union[List, Iterable[Dict]], expected_length: int = None,
+                               item_validator: Optional[Callable[[Dict], None]] = None) -> int:
+        """Validate list response, or every item of a lazy page iterator
+        
+        An iterator such as ``APITestClient.paginate()`` is consumed one item
+        at a time, and its count is checked against the server's reported
+        total when it has one. Returns the number of items.
+        """
+        if isinstance(data, list):
+            ResponseValidator._validate_list(data, expected_length, item_validator)
+            return len(data)
+        assert isinstance(data, Iterable) and not isinstance(data, (dict, str, bytes)), \
+            "Response should be a list"
+        
+        count = 0
+        for item in data:
+            if item_validator is not None:
+                item_validator(item)
+            count += 1
+        total = getattr(data, 'total', None)
+        if total is not None:
+            assert count == total, f"Iterated {count} items, but the server reported {total}"
+        if expected_length:
+            assert count == expected_length, \
+                f"Expected {expected_length} items, got {count}"
+        return count
+    
+    @staticmethod
+    @timed('validate')
+    def _validate_list(data: List, expected_length: Optional[int],
+                       item_validator: Optional[Callable[[Dict], None]]):
         if expected_length:
             assert len(data) == expected_length, \
                 f"Expected {expected_length} items, got {len(data)}"
+        if item_validator is not None:
+            for item in data:
+                item_validator(item)
     
     @staticmethod
+    @timed('validate')
     def validate_post_structure(post: Dict):
         """Validate post object structure"""
         required_fields = ['userId', 'id', 'title', 'body']
@@ -33,6 +70,7 @@ class ResponseValidator:
         assert len(post['title']) > 0, "Post title should not be empty"
     
     @staticmethod
+    @timed('validate')
     def validate_user_structure(user: Dict):
         """Validate user object structure"""
         required_fields = ['id', 'name', 'username', 'email', 'address', 'phone', 'website', 'company']
@@ -40,8 +78,30 @@ class ResponseValidator:
         assert '@' in user['email'], "Invalid email format"
     
     @staticmethod
+    @timed('validate')
     def validate_comment_structure(comment: Dict):
         """Validate comment object structure"""
         required_fields = ['postId', 'id', 'name', 'email', 'body']
         ResponseValidator.validate_json_structure(comment, required_fields)
-        assert '@' in comment['email'], "Invalid email format"
\ No newline at end of file
+        assert '@' in comment['email'], "Invalid email format"
+    
+    @staticmethod
+    @timed('validate')
+    def validate_response_size(response, max_bytes: int, decoded: bool = False):
+        """Validate the response stays under a size budget (wire bytes unless ``decoded``)"""
+        sizes = measure_transfer(response)
+        size = sizes.decoded_bytes if decoded else sizes.response_bytes
+        kind = "decoded" if decoded else "on the wire"
+        assert size <= max_bytes, \
+            f"Response is {size:,} bytes {kind}, over the {max_bytes:,} byte budget"
+    
+    @staticmethod
+    @timed('validate')
+    def validate_compression(response, encodings: Optional[List[str]] = None):
+        """Validate the response body was sent compressed"""
+        sizes = measure_transfer(response)
+        assert sizes.compressed, \
+            f"Response was not compressed (Content-Encoding: {sizes.encoding or 'none'})"
+        if encodings:
+            assert sizes.encoding in encodings, \
+                f"Expected Content-Encoding in {encodings}, got {sizes.encoding}"